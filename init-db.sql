@@ -1,3 +1,6 @@
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+DROP TABLE IF EXISTS table_versions;
 DROP TABLE IF EXISTS maintenance;
 DROP TABLE IF EXISTS leases;
 DROP TABLE IF EXISTS tenants;
@@ -54,7 +57,11 @@ CREATE TABLE leases (
     CONSTRAINT fk_tenant FOREIGN KEY (TenantID) REFERENCES tenants(TenantID) ON DELETE RESTRICT,
     CONSTRAINT fk_property FOREIGN KEY (PropertyID) REFERENCES properties(PropertyID) ON DELETE RESTRICT,
     CONSTRAINT fk_payment_status FOREIGN KEY (PaymentStatusID) REFERENCES payment_statuses(PaymentStatusID) ON DELETE RESTRICT,
-    CONSTRAINT valid_lease_dates CHECK (LeaseTermEnd > LeaseTermStart)
+    CONSTRAINT valid_lease_dates CHECK (LeaseTermEnd > LeaseTermStart),
+    CONSTRAINT leases_no_overlap EXCLUDE USING gist (
+        PropertyID WITH =,
+        daterange(LeaseTermStart, LeaseTermEnd, '[]') WITH &&
+    )
 );
 
 CREATE TABLE maintenance (
@@ -67,6 +74,11 @@ CREATE TABLE maintenance (
     CONSTRAINT fk_property FOREIGN KEY (PropertyID) REFERENCES properties(PropertyID) ON DELETE RESTRICT
 );
 
+CREATE TABLE table_versions (
+    TableName VARCHAR(50) PRIMARY KEY,
+    Version BIGINT NOT NULL DEFAULT 0
+);
+
 ALTER SEQUENCE property_statuses_PropertyStatusID_seq RESTART WITH 1;
 ALTER SEQUENCE maintenance_statuses_MaintenanceStatusID_seq RESTART WITH 1;
 ALTER SEQUENCE payment_statuses_PaymentStatusID_seq RESTART WITH 1;
@@ -110,17 +122,34 @@ INSERT INTO tenants (Name, ContactInfo) VALUES
 INSERT INTO leases (TenantID, PropertyID, LeaseTermStart, LeaseTermEnd, PaymentStatusID) VALUES
 (1, 3, '2022-05-01', '2023-04-30', 1),
 (2, 2, '2023-01-15', '2024-01-14', 2),
-(3, 2, '2022-07-10', '2023-07-09', 1);
+(3, 2, '2022-07-10', '2023-01-14', 1);
 
 INSERT INTO maintenance (Description, MaintenanceStatusID, ScheduledDate, PropertyID) VALUES
 ('Fix leaking roof', 1, '2022-03-15', 1),       -- Completed
 ('Repaint exterior walls', 2, '2023-02-20', 3), -- In Progress
 ('Update security system', 3, '2023-04-05', 2); -- Pending
 
+INSERT INTO table_versions (TableName) VALUES
+('property_statuses'),
+('maintenance_statuses'),
+('payment_statuses'),
+('property_types'),
+('properties'),
+('tenants'),
+('leases'),
+('maintenance');
+
+-- Same indexes as migrations/0001_index_pack.sql and 0003_maintenance_property_schedule.sql
 CREATE INDEX idx_properties_propertytypeid ON properties(PropertyTypeID);
 CREATE INDEX idx_properties_propertystatusid ON properties(PropertyStatusID);
+CREATE INDEX idx_properties_price_id ON properties(Price, PropertyID);
+CREATE INDEX idx_properties_purchasedate_id ON properties(PurchaseDate, PropertyID);
+CREATE INDEX idx_tenants_name_id ON tenants(Name, TenantID);
 CREATE INDEX idx_leases_tenantid ON leases(TenantID);
-CREATE INDEX idx_leases_propertyid ON leases(PropertyID);
+CREATE INDEX idx_leases_property_term ON leases(PropertyID, LeaseTermStart, LeaseTermEnd);
 CREATE INDEX idx_leases_paymentstatusid ON leases(PaymentStatusID);
-CREATE INDEX idx_maintenance_propertyid ON maintenance(PropertyID);
-CREATE INDEX idx_maintenance_maintenancestatusid ON maintenance(MaintenanceStatusID);
\ No newline at end of file
+CREATE INDEX idx_leases_start_id ON leases(LeaseTermStart, LeaseID);
+CREATE INDEX idx_leases_end_id ON leases(LeaseTermEnd, LeaseID);
+CREATE INDEX idx_maintenance_maintenancestatusid ON maintenance(MaintenanceStatusID);
+CREATE INDEX idx_maintenance_scheduleddate_id ON maintenance(ScheduledDate, TaskID);
+CREATE INDEX idx_maintenance_property_scheduled ON maintenance(PropertyID, ScheduledDate, TaskID);
\ No newline at end of file
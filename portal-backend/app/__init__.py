@@ -1,6 +1,12 @@
 from flask import Flask, send_from_directory
+from .cli import generate_data_command, migrate_command
+from .compression import init_compression
 from .db import db
 from .config import Config
+from .instrumentation import init_instrumentation
+from .json_provider import init_json
+from .lookups import init_lookups
+from .replicas import init_replica_routing
 from .blueprints.properties.routes import properties_bp
 from .blueprints.tenants.routes import tenants_bp
 from .blueprints.leases.routes import leases_bp
@@ -9,16 +15,25 @@ from .blueprints.status.property_status import property_status_bp
 from .blueprints.status.payment_status import payment_status_bp
 from .blueprints.status.maintenance_status import maintenance_status_bp
 from .blueprints.status.property_type import property_type_bp
+from .blueprints.imports.routes import imports_bp
+from .blueprints.admin.routes import admin_bp
+from .blueprints.dashboard.routes import dashboard_bp
 from flask_restful import Api, Resource
 from flasgger import Swagger
 from flask_cors import CORS
 import os
 
-def create_app():
+def create_app(config_object=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_object)
 
     db.init_app(app)
+    init_json(app)
+    init_instrumentation(app)
+    init_replica_routing(app)
+    init_lookups(app)
+    # Registered after init_instrumentation so the compression time is part of the request's measured total
+    init_compression(app)
 
     # Enable CORS
     CORS(app)
@@ -31,6 +46,12 @@ def create_app():
     app.register_blueprint(payment_status_bp, url_prefix='/payment-status')
     app.register_blueprint(maintenance_status_bp, url_prefix='/maintenance-status')
     app.register_blueprint(property_type_bp, url_prefix='/property-type')
+    app.register_blueprint(imports_bp, url_prefix='/imports')
+    app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
+
+    app.cli.add_command(generate_data_command)
+    app.cli.add_command(migrate_command)
 
     swagger = Swagger(app)
     api = Api(app)
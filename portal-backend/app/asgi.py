@@ -0,0 +1,264 @@
+import contextlib
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_etags
+from .config import async_database_url, async_engine_options
+from .db import REPLICA_BIND, db
+from .lookups import get_lookup_async, match_ids
+from .models import (Property, PropertyType, PropertyStatus, Tenant, Lease, PaymentStatus,
+                     Maintenance, MaintenanceStatus)
+from .utils import (NDJSON_MIMETYPE, STREAM_BATCH_SIZE, encode_cursor, is_stream_request, keyset_order,
+                    parse_fields, parse_limit, select_statement, serialize_row)
+from .replicas import LAG_STATEMENT, READ_METHODS, cached_lag, is_sticky, record_lag
+from .versions import make_etag, versions_statement
+from .blueprints.properties.routes import PROPERTY_FIELDS, PROPERTY_DETAIL_FIELDS
+from .blueprints.tenants.routes import TENANT_FIELDS
+from .blueprints.leases.routes import LEASE_FIELDS
+from .blueprints.maintenance.routes import MAINTENANCE_FIELDS, MAINTENANCE_DETAIL_FIELDS, maintenance_conditions
+
+# List endpoints served by the async read path, with the same sort keys and filters as the
+# blueprints: ``lookups`` filter a foreign key by lookup description, ``search`` matches text columns
+# and ``conditions`` builds the other filters from the query parameters
+LISTS = {
+    '/properties/': {
+        'model': Property, 'fields': PROPERTY_FIELDS, 'sorts': ('price', 'purchaseDate'),
+        'lookups': {'status': (Property.propertystatusid, PropertyStatus), 'type': (Property.propertytypeid, PropertyType)},
+        'tables': (Property, PropertyType, PropertyStatus)
+    },
+    '/tenants/': {
+        'model': Tenant, 'fields': TENANT_FIELDS, 'sorts': ('name',),
+        'search': {'search': (Tenant.name, Tenant.contactinfo)},
+        'tables': (Tenant,)
+    },
+    '/leases/': {
+        'model': Lease, 'fields': LEASE_FIELDS, 'sorts': ('leaseStart', 'leaseEnd'),
+        'lookups': {'paymentStatus': (Lease.paymentstatusid, PaymentStatus)},
+        'tables': (Lease, Tenant, Property, PaymentStatus)
+    },
+    '/maintenance/': {
+        'model': Maintenance, 'fields': MAINTENANCE_FIELDS, 'sorts': ('scheduledDate',),
+        'lookups': {'status': (Maintenance.maintenancestatusid, MaintenanceStatus)},
+        'conditions': maintenance_conditions,
+        'tables': (Maintenance, MaintenanceStatus, Property)
+    }
+}
+
+# Single-row and nested-list endpoints: the fields returned and the column matched against the path id
+DETAILS = {
+    '/properties/{id:int}': (Property, PROPERTY_DETAIL_FIELDS, Property.propertyid, 'Property not found',
+                             (Property, PropertyType, PropertyStatus)),
+    '/tenants/{id:int}': (Tenant, TENANT_FIELDS, Tenant.tenantid, 'Tenant not found', (Tenant,)),
+    '/leases/{id:int}': (Lease, LEASE_FIELDS, Lease.leaseid, 'Lease not found', (Lease, Tenant, Property, PaymentStatus)),
+    '/maintenance/{id:int}': (Maintenance, MAINTENANCE_DETAIL_FIELDS, Maintenance.taskid, 'Maintenance task not found',
+                              (Maintenance, MaintenanceStatus, Property))
+}
+
+NESTED_LISTS = {
+    '/leases/tenant/{id:int}': (Lease, {f: c for f, c in LEASE_FIELDS.items() if f != 'tenantName'}, Lease.tenantid,
+                                (Lease, Tenant, Property, PaymentStatus)),
+    '/leases/property/{id:int}': (Lease, {f: c for f, c in LEASE_FIELDS.items() if f != 'propertyAddress'},
+                                  Lease.propertyid, (Lease, Tenant, Property, PaymentStatus))
+}
+
+LOOKUPS = {
+    '/property-status': PropertyStatus,
+    '/payment-status': PaymentStatus,
+    '/maintenance-status': MaintenanceStatus,
+    '/property-type': PropertyType
+}
+
+def create_asgi_app(flask_app):
+    """
+    Serve the read endpoints from an asyncio engine and everything else from ``flask_app``.
+
+    GET requests to the properties, tenants, leases, maintenance and lookup
+    endpoints are answered by coroutines on an async SQLAlchemy engine
+    (asyncpg on PostgreSQL), so a worker keeps serving other requests while
+    queries wait on the database. They return the same JSON, ETags and NDJSON
+    streams as the Flask views. Any other request (writes, search, exports,
+    imports, Swagger) falls through to the Flask app, run in a thread pool.
+    """
+    with flask_app.app_context():
+        urls = {key: engine.url.render_as_string(hide_password=False) for key, engine in db.engines.items()}
+    engines = {key: create_async_engine(async_database_url(url), **async_engine_options(url)) for key, url in urls.items()}
+    sessions = async_sessionmaker(engines[None], expire_on_commit=False)
+    replica_sessions = async_sessionmaker(engines[REPLICA_BIND], expire_on_commit=False) if REPLICA_BIND in engines else None
+
+    def dumps(body):
+        return flask_app.json.dumps(body)
+
+    def json_response(body, status_code=200):
+        return Response(dumps(body) + '\n', status_code=status_code, media_type='application/json')
+
+    def error(message, status_code):
+        return json_response({'data': None, 'error': message}, status_code)
+
+    def wants_stream(request):
+        return is_stream_request(request.query_params, parse_accept_header(request.headers.get('accept'), MIMEAccept))
+
+    async def replica_lag():
+        lag = cached_lag(flask_app.config['REPLICA_LAG_CHECK_SECONDS'])
+        if lag is not None:
+            return lag
+        engine = engines[REPLICA_BIND]
+        if engine.dialect.name != 'postgresql':
+            return record_lag(0.0)
+        try:
+            async with engine.connect() as connection:
+                return record_lag(float((await connection.execute(LAG_STATEMENT)).scalar() or 0.0))
+        except Exception:
+            return record_lag(float('inf'))
+
+    async def read_sessions(request):
+        """Session factory for a request, following the same replica rules as ``replicas.init_replica_routing``."""
+        if replica_sessions is None or request.method not in READ_METHODS or is_sticky(request.cookies):
+            return sessions
+        if await replica_lag() > flask_app.config['REPLICA_MAX_LAG_SECONDS']:
+            return sessions
+        return replica_sessions
+
+    async def lookup(model):
+        # Lookup tables are cached process-wide, so they are always loaded from the primary
+        async with sessions() as session:
+            return await get_lookup_async(session, model)
+
+    def conditional(models, view):
+        """Async counterpart of ``versions.conditional``: answer ``304`` while ``models`` are unchanged."""
+        tables = sorted(model.__tablename__ for model in models)
+
+        async def endpoint(request):
+            request.state.sessions = await read_sessions(request)
+            async with request.state.sessions() as session:
+                versions = dict((await session.execute(versions_statement(tables))).all())
+                etag = make_etag(request.url.path, wants_stream(request), tables, versions,
+                                 request.query_params.multi_items())
+                if parse_etags(request.headers.get('if-none-match')).contains_weak(etag):
+                    response = Response(status_code=304)
+                else:
+                    response = await view(request, session)
+                    if response.status_code != 200:
+                        return response
+            response.headers['ETag'] = f'W/"{etag}"'
+            return response
+        return endpoint
+
+    def stream_response(request, statement, fields):
+        async def generate():
+            async with request.state.sessions() as session:
+                result = await session.stream(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+                async for rows in result.partitions():
+                    yield ''.join(dumps(serialize_row(row, fields)) + '\n' for row in rows)
+        return StreamingResponse(generate(), media_type=NDJSON_MIMETYPE)
+
+    def list_view(spec):
+        model, field_map = spec['model'], spec['fields']
+        id_column = field_map['id']
+
+        async def view(request, session):
+            args = request.query_params
+            sort_field = args.get('sort') if args.get('sort') in spec['sorts'] else 'id'
+            order = args.get('order', 'asc')
+            try:
+                fields = parse_fields(args.get('fields'), field_map)
+            except ValueError as e:
+                return error(str(e), 400)
+
+            statement = select_statement(field_map, list(dict.fromkeys(fields + [sort_field, 'id'])), model)
+            for name, (column, lookup_model) in spec.get('lookups', {}).items():
+                if args.get(name):
+                    ids = match_ids(await lookup(lookup_model), args[name])
+                    statement = statement.filter(column.in_(ids))
+            for name, columns in spec.get('search', {}).items():
+                if args.get(name):
+                    statement = statement.filter(or_(*[column.ilike(f'%{args[name]}%') for column in columns]))
+
+            try:
+                if 'conditions' in spec:
+                    statement = statement.filter(*spec['conditions'](args))
+                statement = keyset_order(statement, field_map[sort_field], id_column, order, args.get('cursor'))
+                if wants_stream(request):
+                    return stream_response(request, statement, fields)
+                limit = parse_limit(args.get('limit'))
+            except ValueError as e:
+                return error(str(e), 400)
+
+            # Same keyset pagination as utils.paginate: fetch one extra row to know whether a next page exists
+            if limit is None:
+                rows, next_cursor = (await session.execute(statement)).all(), None
+            else:
+                rows = (await session.execute(statement.limit(limit + 1))).all()
+                next_cursor = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    keys = ['id'] if sort_field == 'id' else [sort_field, 'id']
+                    next_cursor = encode_cursor([getattr(rows[-1], k) for k in keys])
+
+            result = [serialize_row(row, fields) for row in rows]
+            if 'limit' in args:
+                return json_response({'data': result, 'nextCursor': next_cursor})
+            return json_response({'data': result})
+        return view
+
+    def detail_view(model, field_map, id_column, not_found):
+        async def view(request, session):
+            statement = select_statement(field_map, list(field_map), model) \
+                .filter(id_column == request.path_params['id'])
+            row = (await session.execute(statement)).first()
+            if not row:
+                return error(not_found, 404)
+            return json_response({'data': serialize_row(row, field_map)})
+        return view
+
+    def nested_list_view(model, field_map, id_column):
+        async def view(request, session):
+            statement = select_statement(field_map, list(field_map), model) \
+                .filter(id_column == request.path_params['id'])
+            rows = (await session.execute(statement)).all()
+            return json_response({'data': [serialize_row(row, field_map) for row in rows]})
+        return view
+
+    def lookup_list_view(model):
+        id_key = model.__mapper__.primary_key[0].key
+
+        async def view(request, session):
+            entries = await lookup(model)
+            return json_response({'data': [{id_key: id, 'description': d} for id, d in entries.items()]})
+        return view
+
+    def lookup_detail_view(model):
+        id_key = model.__mapper__.primary_key[0].key
+
+        async def view(request, session):
+            id = request.path_params['id']
+            description = (await lookup(model)).get(id)
+            if description is None:
+                return error(f'{model.__name__} not found', 404)
+            return json_response({'data': {id_key: id, 'description': description}})
+        return view
+
+    routes = [Route(path, conditional(spec['tables'], list_view(spec)), methods=['GET']) for path, spec in LISTS.items()]
+    routes += [Route(path, conditional(tables, nested_list_view(model, fields, column)), methods=['GET'])
+               for path, (model, fields, column, tables) in NESTED_LISTS.items()]
+    routes += [Route(path, conditional(tables, detail_view(model, fields, column, not_found)), methods=['GET'])
+               for path, (model, fields, column, not_found, tables) in DETAILS.items()]
+    for prefix, model in LOOKUPS.items():
+        routes.append(Route(f'{prefix}/', conditional((model,), lookup_list_view(model)), methods=['GET']))
+        routes.append(Route(f'{prefix}/{{id:int}}', conditional((model,), lookup_detail_view(model)), methods=['GET']))
+    routes.append(Mount('/', app=WSGIMiddleware(flask_app)))
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        yield
+        for engine in engines.values():
+            await engine.dispose()
+
+    # Same open policy as flask_cors.CORS(app), applied to the async routes as well
+    cors = Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+    return Starlette(routes=routes, middleware=[cors], lifespan=lifespan)
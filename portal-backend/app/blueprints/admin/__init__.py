@@ -0,0 +1 @@
+from .routes import admin_bp
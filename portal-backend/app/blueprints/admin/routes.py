@@ -0,0 +1,216 @@
+import hmac
+from flask import Blueprint, current_app, jsonify, request
+from ...compression import compression_stats, reset_compression_stats
+from ...db import db
+from ...instrumentation import reset_route_summary, route_summary
+from ...pool import pool_stats
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.before_request
+def require_admin_token():
+    """
+    Reject admin requests without ``Authorization: Bearer <ADMIN_TOKEN>``.
+
+    The endpoints are disabled, answering 404, until a token is configured.
+    """
+    token = current_app.config.get('ADMIN_TOKEN')
+    if not token:
+        return jsonify({'data': None, 'error': 'Not found'}), 404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'data': None, 'error': 'Unauthorized'}), 401
+
+@admin_bp.route('/pool', methods=['GET'])
+def get_pool_stats():
+    """
+    Get database connection pool statistics for this worker process
+    ---
+    tags:
+      - Admin
+    responses:
+      200:
+        description: Connection pool statistics
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                poolClass:
+                  type: string
+                size:
+                  type: integer
+                  description: Configured number of persistent connections
+                checkedOut:
+                  type: integer
+                  description: Connections currently in use
+                idle:
+                  type: integer
+                  description: Connections open and waiting in the pool
+                overflow:
+                  type: integer
+                  description: Connections currently open beyond the pool size
+                maxOverflow:
+                  type: integer
+                timeout:
+                  type: number
+                checkouts:
+                  type: integer
+                  description: Connections handed out since the pool was created
+                timeouts:
+                  type: integer
+                  description: Checkouts that gave up after the pool timeout
+                waitSeconds:
+                  type: number
+                  description: Cumulative time spent waiting for a connection
+                maxWaitSeconds:
+                  type: number
+                  description: Longest single wait for a connection
+      401:
+        description: Missing or wrong admin token
+    """
+    return jsonify({'data': pool_stats(db.engine.pool)})
+
+@admin_bp.route('/routes', methods=['GET'])
+def get_route_summary():
+    """
+    Get per-route request, SQL and serialization totals for this worker process
+    ---
+    tags:
+      - Admin
+    responses:
+      200:
+        description: Routes ordered by total time spent, slowest first
+        schema:
+          type: object
+          properties:
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  route:
+                    type: string
+                    example: GET /leases/
+                  requests:
+                    type: integer
+                  totalSeconds:
+                    type: number
+                  avgSeconds:
+                    type: number
+                  maxSeconds:
+                    type: number
+                  sqlSeconds:
+                    type: number
+                  avgSqlSeconds:
+                    type: number
+                  serializeSeconds:
+                    type: number
+                    description: Time spent encoding JSON responses
+                  queries:
+                    type: integer
+                  avgQueries:
+                    type: number
+                  maxQueries:
+                    type: integer
+                    description: Most queries made by a single request
+                  rows:
+                    type: integer
+                    description: Rows returned or changed, as reported by the database driver
+      401:
+        description: Missing or wrong admin token
+    """
+    return jsonify({'data': route_summary()})
+
+@admin_bp.route('/routes', methods=['DELETE'])
+def delete_route_summary():
+    """
+    Reset the per-route summary of this worker process
+    ---
+    tags:
+      - Admin
+    responses:
+      200:
+        description: Summary cleared
+      401:
+        description: Missing or wrong admin token
+    """
+    reset_route_summary()
+    return jsonify({'data': {'message': 'Route summary cleared'}})
+
+@admin_bp.route('/compression', methods=['GET'])
+def get_compression_stats():
+    """
+    Get response compression totals for this worker process
+    ---
+    tags:
+      - Admin
+    responses:
+      200:
+        description: Compression totals per content coding and of the compressed body cache
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                encodings:
+                  type: object
+                  description: Totals keyed by content coding (br, gzip)
+                  additionalProperties:
+                    type: object
+                    properties:
+                      responses:
+                        type: integer
+                      cacheHits:
+                        type: integer
+                        description: Responses whose compressed body came from the cache
+                      bytesIn:
+                        type: integer
+                      bytesOut:
+                        type: integer
+                      ratio:
+                        type: number
+                        description: bytesIn / bytesOut
+                      cpuSeconds:
+                        type: number
+                        description: CPU time spent compressing
+                      avgCpuMs:
+                        type: number
+                uncompressed:
+                  type: object
+                  description: Compressible responses sent as is (below the size threshold or no accepted coding)
+                  properties:
+                    responses:
+                      type: integer
+                    bytes:
+                      type: integer
+                cache:
+                  type: object
+                  properties:
+                    entries:
+                      type: integer
+                    hits:
+                      type: integer
+                    misses:
+                      type: integer
+      401:
+        description: Missing or wrong admin token
+    """
+    return jsonify({'data': compression_stats()})
+
+@admin_bp.route('/compression', methods=['DELETE'])
+def delete_compression_stats():
+    """
+    Reset the compression totals and empty the compressed body cache of this worker process
+    ---
+    tags:
+      - Admin
+    responses:
+      200:
+        description: Totals cleared
+      401:
+        description: Missing or wrong admin token
+    """
+    reset_compression_stats()
+    return jsonify({'data': {'message': 'Compression statistics cleared'}})
@@ -0,0 +1 @@
+from .routes import dashboard_bp
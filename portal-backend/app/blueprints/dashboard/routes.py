@@ -0,0 +1,150 @@
+from flask import Blueprint, current_app, jsonify, request
+from ...occupancy import parse_window, portfolio_occupancy
+from ...summary import portfolio_summary
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('/summary', methods=['GET'])
+def get_summary():
+    """
+    Get the portfolio summary shown on the dashboard
+    ---
+    tags:
+      - Dashboard
+    responses:
+      200:
+        description: Counts and totals over the whole portfolio, computed in a single query
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                asOf:
+                  type: string
+                  format: date
+                  description: Date the active lease count refers to
+                source:
+                  type: string
+                  enum: [live, materializedView]
+                properties:
+                  type: object
+                  properties:
+                    total:
+                      type: integer
+                    totalValue:
+                      type: number
+                      description: Sum of the property prices
+                    byStatus:
+                      type: object
+                      additionalProperties:
+                        type: integer
+                    byType:
+                      type: object
+                      additionalProperties:
+                        type: integer
+                    valueByType:
+                      type: object
+                      additionalProperties:
+                        type: number
+                leases:
+                  type: object
+                  properties:
+                    total:
+                      type: integer
+                    active:
+                      type: integer
+                      description: Leases whose term includes asOf
+                    overdue:
+                      type: integer
+                      description: Leases with the Overdue payment status
+                    activeOverdue:
+                      type: integer
+                    byPaymentStatus:
+                      type: object
+                      additionalProperties:
+                        type: integer
+                maintenance:
+                  type: object
+                  properties:
+                    total:
+                      type: integer
+                    open:
+                      type: integer
+                      description: Tasks not yet Completed
+                    byStatus:
+                      type: object
+                      additionalProperties:
+                        type: integer
+    """
+    return jsonify({'data': portfolio_summary(current_app.config['DASHBOARD_MATERIALIZED_VIEW'],
+                                              current_app.config['DASHBOARD_REFRESH_SECONDS'])})
+
+@dashboard_bp.route('/occupancy', methods=['GET'])
+def get_occupancy():
+    """
+    Get the portfolio occupancy over time
+    ---
+    tags:
+      - Dashboard
+    parameters:
+      - name: from
+        in: query
+        type: string
+        format: date
+        description: First day of the series (default a year before to)
+      - name: to
+        in: query
+        type: string
+        format: date
+        description: Last day of the series (default today)
+      - name: resolution
+        in: query
+        type: string
+        enum: [daily, weekly, monthly]
+        description: One point per day (default), per week starting on Monday, or per month
+      - name: type
+        in: query
+        type: string
+        description: Only count properties of a matching type
+      - name: status
+        in: query
+        type: string
+        description: Only count properties with a matching status
+    responses:
+      200:
+        description: One point per day, week or month of the window
+        schema:
+          type: object
+          properties:
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  date:
+                    type: string
+                    format: date
+                    description: First day of the point within the window
+                  days:
+                    type: integer
+                    description: Days of the window the point covers
+                  occupied:
+                    type: number
+                    description: Average number of properties under lease
+                  properties:
+                    type: number
+                    description: Average number of properties purchased by then
+                  rate:
+                    type: number
+                    description: Occupied property-days over owned property-days, 0 to 1
+      400:
+        description: Invalid window or resolution
+    """
+    try:
+        first, last = parse_window(request.args.get('from'), request.args.get('to'))
+        series = portfolio_occupancy(first, last, request.args.get('resolution', 'daily'),
+                                     request.args.get('type'), request.args.get('status'))
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+    return jsonify({'data': series})
@@ -0,0 +1 @@
+from .routes import imports_bp
@@ -0,0 +1,166 @@
+import io
+import os
+import re
+import tempfile
+import uuid
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context
+from ...models import Property, PropertyType, PropertyStatus, Tenant, Lease, PaymentStatus, Maintenance, MaintenanceStatus
+from ...db import db
+from ...bulk import MAX_BULK_ITEMS
+from ...imports import import_csv, lookup_ids, record_payload, remove_expired_files
+from ...utils import NDJSON_MIMETYPE
+from ..properties.routes import property_values, check_property_batch
+from ..tenants.routes import tenant_values
+from ..leases.routes import lease_values, check_lease_batch
+from ..maintenance.routes import maintenance_values, check_maintenance_batch
+
+imports_bp = Blueprint('imports', __name__)
+
+# Per resource: the model, the single-create validator, the batch check, the
+# id columns, and the description columns resolved to ids through a lookup table
+IMPORTS = {
+    'properties': (Property, property_values, check_property_batch, ['typeId', 'statusId'],
+                   {'typeId': ('type', PropertyType), 'statusId': ('status', PropertyStatus)}),
+    'tenants': (Tenant, tenant_values, None, [], {}),
+    'leases': (Lease, lease_values, check_lease_batch, ['tenantid', 'propertyid', 'paymentstatusid'],
+               {'paymentstatusid': ('paymentstatus', PaymentStatus)}),
+    'maintenance': (Maintenance, maintenance_values, check_maintenance_batch, ['propertyid', 'maintenancestatusid'],
+                    {'maintenancestatusid': ('status', MaintenanceStatus)})
+}
+
+IMPORT_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+REJECTED_SUFFIX = '-rejected.csv'
+
+def rejected_path(import_id):
+    return os.path.join(current_app.config['IMPORT_DIR'], f'{import_id}{REJECTED_SUFFIX}')
+
+def remove_expired_rejected():
+    os.makedirs(current_app.config['IMPORT_DIR'], exist_ok=True)
+    remove_expired_files(current_app.config['IMPORT_DIR'], REJECTED_SUFFIX, current_app.config['IMPORT_REJECTED_SECONDS'])
+
+def parse_batch_size(batch_size):
+    if batch_size is None:
+        return current_app.config['IMPORT_BATCH_SIZE']
+    try:
+        batch_size = int(batch_size)
+    except (ValueError, TypeError):
+        raise ValueError('Batch size must be a positive integer')
+    if batch_size < 1:
+        raise ValueError('Batch size must be a positive integer')
+    return min(batch_size, MAX_BULK_ITEMS)
+
+@imports_bp.route('/<resource>', methods=['POST'])
+def import_resource(resource):
+    """
+    Import properties, tenants, leases or maintenance tasks from a CSV file
+    ---
+    tags:
+      - Imports
+    consumes:
+      - multipart/form-data
+      - text/csv
+    parameters:
+      - name: resource
+        in: path
+        type: string
+        required: true
+        enum: [properties, tenants, leases, maintenance]
+      - name: file
+        in: formData
+        type: file
+        required: false
+        description: >
+          CSV with a header row using the single-create field names. Lookup ids may be given
+          by description instead (type/status for properties, paymentstatus for leases,
+          status for maintenance). The body may also be sent as raw text/csv.
+      - name: batchSize
+        in: query
+        type: integer
+        required: false
+        description: Rows validated and committed per transaction (default 1000, max 10000)
+    responses:
+      200:
+        description: >
+          Newline-delimited JSON progress, one line with the running processed/imported/rejected
+          totals per committed batch, then a final line with done=true and the rejected-rows
+          file URL (null when every row was imported)
+      400:
+        description: Invalid batch size or missing CSV
+      404:
+        description: Unknown resource
+    """
+    if resource not in IMPORTS:
+        return jsonify({'data': None, 'error': 'Unknown resource'}), 404
+    model, validate, check_batch, id_keys, lookup_columns = IMPORTS[resource]
+
+    try:
+        batch_size = parse_batch_size(request.args.get('batchSize'))
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+    remove_expired_rejected()
+
+    # Uploaded files are closed with the request context, before the response is streamed,
+    # so they are copied to a temporary file first; a raw text/csv body is read straight off the socket
+    if 'file' in request.files:
+        stream = tempfile.TemporaryFile(dir=current_app.config['IMPORT_DIR'])
+        request.files['file'].save(stream)
+        stream.seek(0)
+    elif request.mimetype == 'text/csv':
+        stream = request.stream
+    else:
+        return jsonify({'data': None, 'error': 'No CSV file provided'}), 400
+    lines = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    # Lookup descriptions are resolved to ids once for the whole file
+    lookups = {key: (column, lookup_ids(lookup)) for key, (column, lookup) in lookup_columns.items()}
+
+    def validate_record(record):
+        return validate(record_payload(record, id_keys, lookups))
+
+    import_id = uuid.uuid4().hex
+    path = rejected_path(import_id)
+
+    def generate():
+        totals = {'processed': 0, 'imported': 0, 'rejected': 0}
+        with lines, open(path, 'w', newline='') as rejected_file:
+            try:
+                for totals in import_csv(lines, model, validate_record, batch_size, rejected_file, check_batch):
+                    yield current_app.json.dumps(totals) + '\n'
+            except Exception as e:
+                db.session.rollback()
+                yield current_app.json.dumps(dict(totals, error=f'Import stopped: {str(e)}')) + '\n'
+        if totals['rejected']:
+            rejected_url = f'{request.script_root}/imports/{import_id}/rejected'
+        else:
+            os.remove(path)
+            rejected_url = None
+        yield current_app.json.dumps(dict(totals, done=True, rejectedFile=rejected_url)) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+@imports_bp.route('/<import_id>/rejected', methods=['GET'])
+def get_rejected_rows(import_id):
+    """
+    Download the rejected rows of an import
+    ---
+    tags:
+      - Imports
+    parameters:
+      - name: import_id
+        in: path
+        type: string
+        required: true
+    produces:
+      - text/csv
+    responses:
+      200:
+        description: CSV with the line number and error of each rejected row, followed by its original columns
+      404:
+        description: Unknown or expired import, or no rejected rows
+    """
+    remove_expired_rejected()
+    if not IMPORT_ID_PATTERN.match(import_id) or not os.path.exists(rejected_path(import_id)):
+        return jsonify({'data': None, 'error': 'Rejected rows not found'}), 404
+    return send_file(rejected_path(import_id), mimetype='text/csv', as_attachment=True,
+                     download_name=f'rejected-{import_id}.csv')
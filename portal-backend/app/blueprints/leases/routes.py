@@ -1,24 +1,146 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy.exc import IntegrityError
 from ...models import Lease, Tenant, Property, PaymentStatus
+from ...models.lease import LEASE_OVERLAP_CONSTRAINT
 from ...db import db
-from datetime import datetime
+from ...exports import export_rows
+from ...bulk import bulk_create, check_references
+from ...intervals import find_overlaps
+from ...versions import bump_version, conditional
+from ...lookups import match_lookup_ids
+from ...cache import TTLCache
+from ...utils import keyset_order, paginate, parse_fields, select_fields, serialize_row, stream_rows, wants_stream
+from datetime import date, datetime, timedelta
 from sqlalchemy import and_, or_
 
 leases_bp = Blueprint('leases', __name__)
 
-def check_lease_overlap(property_id, start_date, end_date, exclude_lease_id=None):
-    query = Lease.query.filter(
-        Lease.propertyid == property_id,
-        Lease.leasetermstart <= end_date,
-        Lease.leasetermend >= start_date
-    )
+def is_lease_overlap(error):
+    """Whether an IntegrityError was raised by the constraint rejecting overlapping lease terms."""
+    return LEASE_OVERLAP_CONSTRAINT in str(error.orig)
 
-    if exclude_lease_id:
-        query = query.filter(Lease.leaseid != exclude_lease_id)
+def lease_values(data):
+    """Validate a lease payload and return its column values. Raises ``ValueError`` on invalid input."""
+    required_fields = ['tenantid', 'propertyid', 'leasetermstart', 'leasetermend', 'paymentstatusid']
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
+
+    try:
+        start_date = datetime.strptime(str(data['leasetermstart']), '%Y-%m-%d').date()
+        end_date = datetime.strptime(str(data['leasetermend']), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Lease dates must be in YYYY-MM-DD format')
+
+    if end_date <= start_date:
+        raise ValueError('Lease end date must be after start date')
+
+    return {
+        'tenantid': data['tenantid'],
+        'propertyid': data['propertyid'],
+        'leasetermstart': start_date,
+        'leasetermend': end_date,
+        'paymentstatusid': data['paymentstatusid']
+    }
+
+def filter_leases(query):
+    """Apply the ``paymentStatus`` filter of the request to a lease query."""
+    payment_status = request.args.get('paymentStatus')
+    if payment_status:
+        query = query.filter(Lease.paymentstatusid.in_(match_lookup_ids(PaymentStatus, payment_status)))
+    return query
+
+def check_lease_batch(rows):
+    """
+    Return ``{index: error}`` for batch leases with unknown references or overlapping terms.
+
+    The leases already stored for the batch's properties within its overall
+    date span are read in one query on ``idx_leases_property_term``; the batch
+    is then checked against them and against itself in a single sorted sweep.
+    """
+    errors = check_references(rows, {
+        'tenantid': (Tenant, 'Tenant'),
+        'propertyid': (Property, 'Property'),
+        'paymentstatusid': (PaymentStatus, 'Payment status')
+    })
+    valid = {index: row for index, row in rows.items() if index not in errors}
+    if not valid:
+        return errors
+
+    existing = db.session.query(Lease.propertyid, Lease.leasetermstart, Lease.leasetermend).filter(
+        Lease.propertyid.in_({row['propertyid'] for row in valid.values()}),
+        Lease.leasetermstart <= max(row['leasetermend'] for row in valid.values()),
+        Lease.leasetermend >= min(row['leasetermstart'] for row in valid.values())
+    ).all()
+
+    indexes = list(valid)
+    candidates = [(row['propertyid'], row['leasetermstart'], row['leasetermend']) for row in valid.values()]
+    for position in find_overlaps(existing, candidates):
+        errors[indexes[position]] = 'Property has overlapping lease for the specified dates'
+    return errors
+
+LEASE_FIELDS = {
+    'id': Lease.leaseid,
+    'tenantId': Lease.tenantid,
+    'tenantName': Tenant.name,
+    'propertyId': Lease.propertyid,
+    'propertyAddress': Property.address,
+    'leaseStart': Lease.leasetermstart,
+    'leaseEnd': Lease.leasetermend,
+    'paymentStatus': PaymentStatus.description,
+    'paymentStatusId': Lease.paymentstatusid
+}
 
-    return query.first() is not None
+def lease_query(fields):
+    """Select ``fields`` from leases, joining the tenant, property and payment status as needed."""
+    return select_fields(LEASE_FIELDS, fields, Lease)
+
+MAX_EXPIRING_DAYS = 366
+# Renewal views ask for these windows over and over; their pages are cached for EXPIRING_CACHE_SECONDS
+CACHED_EXPIRING_DAYS = (30, 60, 90)
+expiring_cache = TTLCache()
+
+def parse_expiring_window(days, start):
+    """Inclusive ``(first, last)`` end dates of the next ``days`` days from ``start`` (default today)."""
+    try:
+        days = int(days)
+    except (ValueError, TypeError):
+        raise ValueError(f'days must be an integer between 1 and {MAX_EXPIRING_DAYS}')
+    if not 1 <= days <= MAX_EXPIRING_DAYS:
+        raise ValueError(f'days must be an integer between 1 and {MAX_EXPIRING_DAYS}')
+    try:
+        first = date.fromisoformat(start) if start else date.today()
+    except ValueError:
+        raise ValueError('from must be in YYYY-MM-DD format')
+    return first, first + timedelta(days=days - 1)
+
+def group_by_week(leases):
+    """Group serialized leases ordered by end date into ``{'week', 'leases'}`` buckets of weeks starting on Monday."""
+    weeks = []
+    for lease in leases:
+        end = lease['leaseEnd']
+        week = (end - timedelta(days=end.weekday())).isoformat()
+        if not weeks or weeks[-1]['week'] != week:
+            weeks.append({'week': week, 'leases': []})
+        weeks[-1]['leases'].append(lease)
+    return weeks
+
+def expiring_leases(first, last, limit, cursor):
+    """
+    Leases ending between ``first`` and ``last`` grouped by week, and the cursor of the next page.
+
+    The leases are read in end date order from a range of
+    ``idx_leases_end_id``, with the tenant, property and payment status joined
+    in the same query, and paged on ``(leaseEnd, id)``.
+    """
+    fields = list(LEASE_FIELDS)
+    query = lease_query(fields).filter(Lease.leasetermend.between(first, last))
+    leases, next_cursor = paginate(query, Lease.leasetermend, Lease.leaseid, 'asc', limit, cursor,
+                                   row_keys=['leaseEnd', 'id'])
+    return group_by_week([serialize_row(l, fields) for l in leases]), next_cursor
 
 @leases_bp.route('/', methods=['GET'])
+@conditional(Lease, Tenant, Property, PaymentStatus)
 def get_leases():
     """
     Get a list of leases
@@ -38,12 +160,31 @@ def get_leases():
         in: query
         type: string
         description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of fields to return (id, tenantId, tenantName, propertyId, propertyAddress, leaseStart, leaseEnd, paymentStatus, paymentStatusId)
+      - name: stream
+        in: query
+        type: boolean
+        description: Stream every matching row as NDJSON (application/x-ndjson); also selected by the Accept header
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of leases to return (enables cursor pagination)
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor returned as nextCursor by the previous page
     responses:
       200:
         description: A list of leases
         schema:
           type: object
           properties:
+            nextCursor:
+              type: string
+              description: Cursor for the next page, null on the last page (only present when limit is set)
             data:
               type: array
               items:
@@ -68,39 +209,86 @@ def get_leases():
                   paymentStatus:
                     type: string
     """
-    query = Lease.query.join(Tenant).join(Property).join(PaymentStatus)
-
-    payment_status = request.args.get('paymentStatus')
-    if payment_status:
-        query = query.filter(PaymentStatus.description.ilike(f'%{payment_status}%'))
-
     sort_by = request.args.get('sort', 'leaseid')
     order = request.args.get('order', 'asc')
+    sort_field = sort_by if sort_by in ('leaseStart', 'leaseEnd') else 'id'
 
-    if sort_by == 'leaseStart':
-        query = query.order_by(Lease.leasetermstart.asc() if order == 'asc' else Lease.leasetermstart.desc())
-    elif sort_by == 'leaseEnd':
-        query = query.order_by(Lease.leasetermend.asc() if order == 'asc' else Lease.leasetermend.desc())
-    else:
-        query = query.order_by(Lease.leaseid.asc() if order == 'asc' else Lease.leaseid.desc())
-
-    leases = query.all()
-    result = [
-        {
-            'id': l.leaseid,
-            'tenantId': l.tenantid,
-            'tenantName': l.tenant.name,
-            'propertyId': l.propertyid,
-            'propertyAddress': l.property.address,
-            'leaseStart': l.leasetermstart.isoformat(),
-            'leaseEnd': l.leasetermend.isoformat(),
-            'paymentStatus': l.payment_status.description,
-            'paymentStatusId': l.paymentstatusid
-        } for l in leases
-    ]
+    try:
+        fields = parse_fields(request.args.get('fields'), LEASE_FIELDS)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+    query = lease_query(list(dict.fromkeys(fields + [sort_field, 'id'])))
+
+    query = filter_leases(query)
+
+    try:
+        if wants_stream():
+            query = keyset_order(query, LEASE_FIELDS[sort_field], Lease.leaseid, order, request.args.get('cursor'))
+            return stream_rows(query, fields)
+        leases, next_cursor = paginate(query, LEASE_FIELDS[sort_field], Lease.leaseid, order,
+                                       request.args.get('limit'), request.args.get('cursor'),
+                                       row_keys=[sort_field, 'id'])
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+    result = [serialize_row(l, fields) for l in leases]
+    if 'limit' in request.args:
+        return jsonify({'data': result, 'nextCursor': next_cursor})
     return jsonify({'data': result})
 
+@leases_bp.route('/export', methods=['GET'])
+@conditional(Lease, Tenant, Property, PaymentStatus)
+def export_leases():
+    """
+    Export leases as a CSV or XLSX file
+    ---
+    tags:
+      - Leases
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, xlsx]
+        description: File format (default csv)
+      - name: paymentStatus
+        in: query
+        type: string
+        description: Filter by payment status
+      - name: sort
+        in: query
+        type: string
+        description: Sort by field (leaseStart, leaseEnd)
+      - name: order
+        in: query
+        type: string
+        description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of columns to export, all list fields by default
+    produces:
+      - text/csv
+      - application/vnd.openxmlformats-officedocument.spreadsheetml.sheet
+    responses:
+      200:
+        description: A file attachment with a header row of field names
+      400:
+        description: Invalid format or fields
+    """
+    sort_by = request.args.get('sort')
+    order = request.args.get('order', 'asc')
+    sort_column = LEASE_FIELDS[sort_by] if sort_by in ('leaseStart', 'leaseEnd') else Lease.leaseid
+
+    try:
+        fields = parse_fields(request.args.get('fields'), LEASE_FIELDS)
+        query = keyset_order(filter_leases(lease_query(fields)), sort_column, Lease.leaseid, order)
+        return export_rows(query, fields, request.args.get('format', 'csv'), 'leases')
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
 @leases_bp.route('/<int:id>', methods=['GET'])
+@conditional(Lease, Tenant, Property, PaymentStatus)
 def get_lease_by_id(id):
     """
     Get a lease by its ID
@@ -119,23 +307,13 @@ def get_lease_by_id(id):
       404:
         description: Lease not found
     """
-    lease = Lease.query.join(Tenant).join(Property).join(PaymentStatus).filter(Lease.leaseid == id).first()
+    lease = lease_query(list(LEASE_FIELDS)).filter(Lease.leaseid == id).first()
     if not lease:
         return jsonify({'data': None, 'error': 'Lease not found'}), 404
-    result = {
-        'id': lease.leaseid,
-        'tenantId': lease.tenantid,
-        'tenantName': lease.tenant.name,
-        'propertyId': lease.propertyid,
-        'propertyAddress': lease.property.address,
-        'leaseStart': lease.leasetermstart.isoformat(),
-        'leaseEnd': lease.leasetermend.isoformat(),
-        'paymentStatus': lease.payment_status.description,
-        'paymentStatusId': lease.paymentstatusid
-    }
-    return jsonify({'data': result})
+    return jsonify({'data': serialize_row(lease, LEASE_FIELDS)})
 
 @leases_bp.route('/tenant/<int:tenant_id>', methods=['GET'])
+@conditional(Lease, Tenant, Property, PaymentStatus)
 def get_leases_by_tenant(tenant_id):
     """
     Get leases by tenant ID
@@ -152,22 +330,13 @@ def get_leases_by_tenant(tenant_id):
       200:
         description: A list of leases for the tenant
     """
-    leases = Lease.query.join(Property).join(PaymentStatus).filter(Lease.tenantid == tenant_id).all()
-    result = [
-        {
-            'id': l.leaseid,
-            'tenantId': l.tenantid,
-            'propertyId': l.propertyid,
-            'propertyAddress': l.property.address,
-            'leaseStart': l.leasetermstart.isoformat(),
-            'leaseEnd': l.leasetermend.isoformat(),
-            'paymentStatus': l.payment_status.description,
-            'paymentStatusId': l.paymentstatusid
-        } for l in leases
-    ]
+    fields = [f for f in LEASE_FIELDS if f != 'tenantName']
+    leases = lease_query(fields).filter(Lease.tenantid == tenant_id).all()
+    result = [serialize_row(l, fields) for l in leases]
     return jsonify({'data': result})
 
 @leases_bp.route('/property/<int:property_id>', methods=['GET'])
+@conditional(Lease, Tenant, Property, PaymentStatus)
 def get_leases_by_property(property_id):
     """
     Get leases by property ID
@@ -184,21 +353,85 @@ def get_leases_by_property(property_id):
       200:
         description: A list of leases for the property
     """
-    leases = Lease.query.join(Tenant).join(PaymentStatus).filter(Lease.propertyid == property_id).all()
-    result = [
-        {
-            'id': l.leaseid,
-            'tenantId': l.tenantid,
-            'tenantName': l.tenant.name,
-            'propertyId': l.propertyid,
-            'leaseStart': l.leasetermstart.isoformat(),
-            'leaseEnd': l.leasetermend.isoformat(),
-            'paymentStatus': l.payment_status.description,
-            'paymentStatusId': l.paymentstatusid
-        } for l in leases
-    ]
+    fields = [f for f in LEASE_FIELDS if f != 'propertyAddress']
+    leases = lease_query(fields).filter(Lease.propertyid == property_id).all()
+    result = [serialize_row(l, fields) for l in leases]
     return jsonify({'data': result})
 
+@leases_bp.route('/expiring', methods=['GET'])
+def get_expiring_leases():
+    """
+    Get the leases ending soon, grouped by week
+    ---
+    tags:
+      - Leases
+    parameters:
+      - name: days
+        in: query
+        type: integer
+        description: Length of the window in days, 1 to 366 (default 30)
+      - name: from
+        in: query
+        type: string
+        format: date
+        description: First day of the window (default today)
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of leases to return (enables cursor pagination)
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor returned as nextCursor by the previous page
+    responses:
+      200:
+        description: The leases ending in the window by end date, in weeks starting on Monday
+        schema:
+          type: object
+          properties:
+            from:
+              type: string
+              format: date
+            to:
+              type: string
+              format: date
+            nextCursor:
+              type: string
+              description: Cursor for the next page, null on the last page (only present when limit is set)
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  week:
+                    type: string
+                    format: date
+                    description: Monday of the week; a week can continue on the next page
+                  leases:
+                    type: array
+                    items:
+                      type: object
+      400:
+        description: Invalid window, limit or cursor
+    """
+    try:
+        first, last = parse_expiring_window(request.args.get('days', 30), request.args.get('from'))
+        key = (first, last, request.args.get('limit'), request.args.get('cursor'))
+        cached = (last - first).days + 1 in CACHED_EXPIRING_DAYS
+        page = expiring_cache.get(key) if cached else None
+        if page is None:
+            page = expiring_leases(first, last, request.args.get('limit'), request.args.get('cursor'))
+            if cached:
+                expiring_cache.set(key, page, current_app.config['EXPIRING_CACHE_SECONDS'])
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+    weeks, next_cursor = page
+    response = {'data': weeks, 'from': first.isoformat(), 'to': last.isoformat()}
+    if 'limit' in request.args:
+        response['nextCursor'] = next_cursor
+    return jsonify(response)
+
 @leases_bp.route('/', methods=['POST'])
 def create_lease():
     """
@@ -247,41 +480,80 @@ def create_lease():
     if not data:
         return jsonify({'data': None, 'error': 'No data provided'}), 400
 
-    required_fields = ['tenantid', 'propertyid', 'leasetermstart', 'leasetermend', 'paymentstatusid']
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return jsonify({'data': None, 'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
-
     try:
-        start_date = datetime.strptime(str(data['leasetermstart']), '%Y-%m-%d')
-        end_date = datetime.strptime(str(data['leasetermend']), '%Y-%m-%d')
-    except ValueError:
-        return jsonify({'data': None, 'error': 'Lease dates must be in YYYY-MM-DD format'}), 400
-
-    if end_date <= start_date:
-        return jsonify({'data': None, 'error': 'Lease end date must be after start date'}), 400
-
-    if check_lease_overlap(data['propertyid'], data['leasetermstart'], data['leasetermend']):
-        return jsonify({
-            'data': None,
-            'error': 'Cannot create lease: property has overlapping lease for the specified dates'
-        }), 409
+        values = lease_values(data)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
+    # Overlapping terms are rejected by the database constraint, atomically with the insert
     try:
-        new_lease = Lease(
-            tenantid=data['tenantid'],
-            propertyid=data['propertyid'],
-            leasetermstart=data['leasetermstart'],
-            leasetermend=data['leasetermend'],
-            paymentstatusid=data['paymentstatusid']
-        )
+        new_lease = Lease(**values)
         db.session.add(new_lease)
+        bump_version(Lease)
         db.session.commit()
         return jsonify({'data': {'id': new_lease.leaseid, 'message': 'Lease created successfully'}}), 201
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_lease_overlap(e):
+            return jsonify({
+                'data': None,
+                'error': 'Cannot create lease: property has overlapping lease for the specified dates'
+            }), 409
+        return jsonify({'data': None, 'error': f'Failed to create lease: {str(e)}'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'data': None, 'error': f'Failed to create lease: {str(e)}'}), 400
 
+@leases_bp.route('/bulk', methods=['POST'])
+def create_leases_bulk():
+    """
+    Create leases in bulk
+    ---
+    tags:
+      - Leases
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            description: Up to 10000 leases, each with the same fields as a single create
+            items:
+              type: object
+    responses:
+      201:
+        description: All leases created
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                created:
+                  type: integer
+                failed:
+                  type: integer
+                results:
+                  type: array
+                  description: One entry per item in request order, with either the new id or the validation error
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                      id:
+                        type: integer
+                      error:
+                        type: string
+      207:
+        description: Some leases created, the others rejected
+      400:
+        description: Invalid input, nothing created
+      409:
+        description: A concurrent write created an overlapping lease, nothing created
+    """
+    return bulk_create(Lease, lease_values, 'leases', check_batch=check_lease_batch, is_conflict=is_lease_overlap)
+
 @leases_bp.route('/<int:id>', methods=['PUT'])
 def update_lease(id):
     """
@@ -326,13 +598,10 @@ def update_lease(id):
         return jsonify({'data': None, 'error': 'Lease not found'}), 404
 
     new_property_id = data.get('propertyid', lease.propertyid)
-    new_start = data.get('leasetermstart', lease.leasetermstart)
-    new_end = data.get('leasetermend', lease.leasetermend)
 
     if 'leasetermstart' in data:
         try:
-            start_date = datetime.strptime(str(data['leasetermstart']), '%Y-%m-%d')
-            new_start = data['leasetermstart']
+            new_start = datetime.strptime(str(data['leasetermstart']), '%Y-%m-%d').date()
         except ValueError:
             return jsonify({'data': None, 'error': 'Lease start date must be in YYYY-MM-DD format'}), 400
     else:
@@ -340,38 +609,31 @@ def update_lease(id):
 
     if 'leasetermend' in data:
         try:
-            end_date = datetime.strptime(str(data['leasetermend']), '%Y-%m-%d')
-            new_end = data['leasetermend']
+            new_end = datetime.strptime(str(data['leasetermend']), '%Y-%m-%d').date()
         except ValueError:
             return jsonify({'data': None, 'error': 'Lease end date must be in YYYY-MM-DD format'}), 400
     else:
         new_end = lease.leasetermend
 
-    if isinstance(new_start, str):
-        start_date = datetime.strptime(new_start, '%Y-%m-%d')
-    else:
-        start_date = datetime.combine(new_start, datetime.min.time())
-
-    if isinstance(new_end, str):
-        end_date = datetime.strptime(new_end, '%Y-%m-%d')
-    else:
-        end_date = datetime.combine(new_end, datetime.min.time())
-
-    if end_date <= start_date:
+    if new_end <= new_start:
         return jsonify({'data': None, 'error': 'Lease end date must be after start date'}), 400
 
-    if check_lease_overlap(new_property_id, new_start, new_end, exclude_lease_id=id):
-        return jsonify({
-            'data': None,
-            'error': 'Cannot update lease: property has overlapping lease for the specified dates'
-        }), 409
-
     lease.tenantid = data.get('tenantid', lease.tenantid)
     lease.propertyid = new_property_id
     lease.leasetermstart = new_start
     lease.leasetermend = new_end
     lease.paymentstatusid = data.get('paymentstatusid', lease.paymentstatusid)
-    db.session.commit()
+    try:
+        bump_version(Lease)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_lease_overlap(e):
+            return jsonify({
+                'data': None,
+                'error': 'Cannot update lease: property has overlapping lease for the specified dates'
+            }), 409
+        return jsonify({'data': None, 'error': f'Failed to update lease: {str(e)}'}), 400
     return jsonify({'data': {'message': 'Lease updated successfully'}})
 
 @leases_bp.route('/<int:id>', methods=['DELETE'])
@@ -397,5 +659,6 @@ def delete_lease(id):
     if not lease:
         return jsonify({'data': None, 'error': 'Lease not found'}), 404
     db.session.delete(lease)
+    bump_version(Lease)
     db.session.commit()
     return jsonify({'data': {'message': 'Lease deleted successfully'}})
@@ -1,11 +1,124 @@
 from flask import Blueprint, jsonify, request
+from sqlalchemy import func
 from ...models import Maintenance, MaintenanceStatus, Property
 from ...db import db
-from datetime import datetime
+from ...exports import export_rows
+from ...bulk import bulk_create, check_references
+from ...versions import bump_version, conditional
+from ...lookups import get_lookup, match_lookup_ids
+from ...utils import keyset_order, paginate, parse_fields, select_fields, serialize_row, stream_rows, wants_stream
+from datetime import date, datetime
 
 maintenance_bp = Blueprint('maintenance', __name__)
 
+MAINTENANCE_FIELDS = {
+    'id': Maintenance.taskid,
+    'description': Maintenance.description,
+    'status': MaintenanceStatus.description,
+    'scheduledDate': Maintenance.scheduleddate,
+    'propertyId': Maintenance.propertyid,
+    'propertyAddress': Property.address
+}
+
+MAINTENANCE_DETAIL_FIELDS = dict(MAINTENANCE_FIELDS, statusId=Maintenance.maintenancestatusid)
+
+def maintenance_values(data):
+    """Validate a maintenance task payload and return its column values. Raises ``ValueError`` on invalid input."""
+    required_fields = ['description', 'maintenancestatusid', 'scheduleddate', 'propertyid']
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
+
+    if not isinstance(data.get('description'), str) or len(data['description'].strip()) == 0:
+        raise ValueError('Description must be a non-empty string')
+
+    try:
+        scheduled_date = datetime.strptime(str(data['scheduleddate']), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Scheduled date must be in YYYY-MM-DD format')
+
+    return {
+        'description': data['description'],
+        'maintenancestatusid': data['maintenancestatusid'],
+        'scheduleddate': scheduled_date,
+        'propertyid': data['propertyid']
+    }
+
+def date_arg(args, name):
+    """The ``name`` query parameter as a date, ``None`` when absent. Raises ``ValueError`` on invalid input."""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be in YYYY-MM-DD format')
+
+def int_arg(args, name):
+    """The ``name`` query parameter as an integer, ``None`` when absent. Raises ``ValueError`` on invalid input."""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+def maintenance_conditions(args):
+    """
+    Conditions for the ``statusId``, ``propertyId`` and ``from``/``to`` filters in the query parameters ``args``.
+
+    ``from`` and ``to`` bound the scheduled date, both included; with
+    ``propertyId`` they select one range of
+    ``idx_maintenance_property_scheduled``. Raises ``ValueError`` on invalid
+    values.
+    """
+    conditions = []
+    status_id, property_id = int_arg(args, 'statusId'), int_arg(args, 'propertyId')
+    if status_id is not None:
+        conditions.append(Maintenance.maintenancestatusid == status_id)
+    if property_id is not None:
+        conditions.append(Maintenance.propertyid == property_id)
+
+    start, end = date_arg(args, 'from'), date_arg(args, 'to')
+    if start and end and start > end:
+        raise ValueError('from must not be after to')
+    if start:
+        conditions.append(Maintenance.scheduleddate >= start)
+    if end:
+        conditions.append(Maintenance.scheduleddate <= end)
+    return conditions
+
+def filter_maintenance(query):
+    """Apply the ``status`` filter and the ``maintenance_conditions`` of the request to a maintenance task query."""
+    status_filter = request.args.get('status')
+    if status_filter:
+        query = query.filter(Maintenance.maintenancestatusid.in_(match_lookup_ids(MaintenanceStatus, status_filter)))
+    return query.filter(*maintenance_conditions(request.args))
+
+MAX_CALENDAR_DAYS = 366
+
+def calendar_counts(query):
+    """Per-day task counts of a filtered ``(scheduleddate, maintenancestatusid, count)`` query, by status description."""
+    statuses = get_lookup(MaintenanceStatus)
+    days = []
+    for scheduled, status_id, count in query.group_by(Maintenance.scheduleddate, Maintenance.maintenancestatusid) \
+            .order_by(Maintenance.scheduleddate, Maintenance.maintenancestatusid):
+        if not days or days[-1]['date'] != scheduled.isoformat():
+            days.append({'date': scheduled.isoformat(), 'count': 0, 'byStatus': {}})
+        days[-1]['count'] += count
+        days[-1]['byStatus'][statuses.get(status_id, str(status_id))] = count
+    return days
+
+def check_maintenance_batch(rows):
+    """Return ``{index: error}`` for batch maintenance tasks referencing ids that do not exist."""
+    return check_references(rows, {
+        'propertyid': (Property, 'Property'),
+        'maintenancestatusid': (MaintenanceStatus, 'Maintenance status')
+    })
+
 @maintenance_bp.route('/', methods=['GET'])
+@conditional(Maintenance, MaintenanceStatus, Property)
 def get_maintenance():
     """
     Get a list of maintenance tasks
@@ -17,6 +130,24 @@ def get_maintenance():
         in: query
         type: string
         description: Filter by maintenance status
+      - name: statusId
+        in: query
+        type: integer
+        description: Filter by maintenance status ID
+      - name: propertyId
+        in: query
+        type: integer
+        description: Filter by property ID
+      - name: from
+        in: query
+        type: string
+        format: date
+        description: Earliest scheduled date, included
+      - name: to
+        in: query
+        type: string
+        format: date
+        description: Latest scheduled date, included
       - name: sort
         in: query
         type: string
@@ -25,12 +156,31 @@ def get_maintenance():
         in: query
         type: string
         description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of fields to return (id, description, status, scheduledDate, propertyId, propertyAddress)
+      - name: stream
+        in: query
+        type: boolean
+        description: Stream every matching row as NDJSON (application/x-ndjson); also selected by the Accept header
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of tasks to return (enables cursor pagination)
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor returned as nextCursor by the previous page
     responses:
       200:
         description: A list of maintenance tasks
         schema:
           type: object
           properties:
+            nextCursor:
+              type: string
+              description: Cursor for the next page, null on the last page (only present when limit is set)
             data:
               type: array
               items:
@@ -48,34 +198,171 @@ def get_maintenance():
                   propertyId:
                     type: integer
     """
-    query = Maintenance.query.join(MaintenanceStatus).join(Property)
-
-    status_filter = request.args.get('status')
-    if status_filter:
-        query = query.filter(MaintenanceStatus.description.ilike(f'%{status_filter}%'))
-
     sort_by = request.args.get('sort', 'taskid')
     order = request.args.get('order', 'asc')
+    sort_field = 'scheduledDate' if sort_by == 'scheduledDate' else 'id'
+
+    try:
+        fields = parse_fields(request.args.get('fields'), MAINTENANCE_FIELDS)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
-    if sort_by == 'scheduledDate':
-        query = query.order_by(Maintenance.scheduleddate.asc() if order == 'asc' else Maintenance.scheduleddate.desc())
-    else:
-        query = query.order_by(Maintenance.taskid.asc() if order == 'asc' else Maintenance.taskid.desc())
-
-    maintenance_tasks = query.all()
-    result = [
-        {
-            'id': m.taskid,
-            'description': m.description,
-            'status': m.maintenance_status.description,
-            'scheduledDate': m.scheduleddate.isoformat(),
-            'propertyId': m.propertyid,
-            'propertyAddress': m.property.address
-        } for m in maintenance_tasks
-    ]
+    query = select_fields(MAINTENANCE_FIELDS, list(dict.fromkeys(fields + [sort_field, 'id'])), Maintenance)
+
+    try:
+        query = filter_maintenance(query)
+        if wants_stream():
+            query = keyset_order(query, MAINTENANCE_FIELDS[sort_field], Maintenance.taskid, order, request.args.get('cursor'))
+            return stream_rows(query, fields)
+        maintenance_tasks, next_cursor = paginate(query, MAINTENANCE_FIELDS[sort_field], Maintenance.taskid, order,
+                                                  request.args.get('limit'), request.args.get('cursor'),
+                                                  row_keys=[sort_field, 'id'])
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+    result = [serialize_row(m, fields) for m in maintenance_tasks]
+    if 'limit' in request.args:
+        return jsonify({'data': result, 'nextCursor': next_cursor})
     return jsonify({'data': result})
 
+@maintenance_bp.route('/export', methods=['GET'])
+@conditional(Maintenance, MaintenanceStatus, Property)
+def export_maintenance():
+    """
+    Export maintenance tasks as a CSV or XLSX file
+    ---
+    tags:
+      - Maintenance
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, xlsx]
+        description: File format (default csv)
+      - name: status
+        in: query
+        type: string
+        description: Filter by maintenance status
+      - name: statusId
+        in: query
+        type: integer
+        description: Filter by maintenance status ID
+      - name: propertyId
+        in: query
+        type: integer
+        description: Filter by property ID
+      - name: from
+        in: query
+        type: string
+        format: date
+        description: Earliest scheduled date, included
+      - name: to
+        in: query
+        type: string
+        format: date
+        description: Latest scheduled date, included
+      - name: sort
+        in: query
+        type: string
+        description: Sort by field (scheduledDate)
+      - name: order
+        in: query
+        type: string
+        description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of columns to export, all list fields by default
+    produces:
+      - text/csv
+      - application/vnd.openxmlformats-officedocument.spreadsheetml.sheet
+    responses:
+      200:
+        description: A file attachment with a header row of field names
+      400:
+        description: Invalid format or fields
+    """
+    sort_by = request.args.get('sort')
+    order = request.args.get('order', 'asc')
+    sort_column = MAINTENANCE_FIELDS[sort_by] if sort_by in ('scheduledDate',) else Maintenance.taskid
+
+    try:
+        fields = parse_fields(request.args.get('fields'), MAINTENANCE_FIELDS)
+        query = keyset_order(filter_maintenance(select_fields(MAINTENANCE_FIELDS, fields, Maintenance)), sort_column, Maintenance.taskid, order)
+        return export_rows(query, fields, request.args.get('format', 'csv'), 'maintenance')
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+@maintenance_bp.route('/calendar', methods=['GET'])
+@conditional(Maintenance, MaintenanceStatus)
+def get_maintenance_calendar():
+    """
+    Get the number of maintenance tasks scheduled per day, for calendar views
+    ---
+    tags:
+      - Maintenance
+    parameters:
+      - name: from
+        in: query
+        type: string
+        format: date
+        required: true
+        description: First day, included
+      - name: to
+        in: query
+        type: string
+        format: date
+        required: true
+        description: Last day, included; at most 366 days after from
+      - name: status
+        in: query
+        type: string
+        description: Filter by maintenance status
+      - name: statusId
+        in: query
+        type: integer
+        description: Filter by maintenance status ID
+      - name: propertyId
+        in: query
+        type: integer
+        description: Filter by property ID
+    responses:
+      200:
+        description: One entry per day with at least one task, in date order
+        schema:
+          type: object
+          properties:
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  date:
+                    type: string
+                    format: date
+                  count:
+                    type: integer
+                  byStatus:
+                    type: object
+                    additionalProperties:
+                      type: integer
+      400:
+        description: Missing or invalid window or filters
+    """
+    try:
+        start, end = date_arg(request.args, 'from'), date_arg(request.args, 'to')
+        if not start or not end:
+            raise ValueError('from and to are required')
+        if (end - start).days >= MAX_CALENDAR_DAYS:
+            raise ValueError(f'The window cannot exceed {MAX_CALENDAR_DAYS} days')
+        query = filter_maintenance(db.session.query(Maintenance.scheduleddate, Maintenance.maintenancestatusid,
+                                                    func.count()))
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+    return jsonify({'data': calendar_counts(query)})
+
 @maintenance_bp.route('/<int:id>', methods=['GET'])
+@conditional(Maintenance, MaintenanceStatus, Property)
 def get_maintenance_by_id(id):
     """
     Get a maintenance task by its ID
@@ -94,19 +381,11 @@ def get_maintenance_by_id(id):
       404:
         description: Maintenance task not found
     """
-    maintenance = Maintenance.query.join(MaintenanceStatus).join(Property).filter(Maintenance.taskid == id).first()
+    maintenance = select_fields(MAINTENANCE_DETAIL_FIELDS, list(MAINTENANCE_DETAIL_FIELDS), Maintenance) \
+        .filter(Maintenance.taskid == id).first()
     if not maintenance:
         return jsonify({'data': None, 'error': 'Maintenance task not found'}), 404
-    result = {
-        'id': maintenance.taskid,
-        'description': maintenance.description,
-        'status': maintenance.maintenance_status.description,
-        'statusId': maintenance.maintenancestatusid,
-        'scheduledDate': maintenance.scheduleddate.isoformat(),
-        'propertyId': maintenance.propertyid,
-        'propertyAddress': maintenance.property.address
-    }
-    return jsonify({'data': result})
+    return jsonify({'data': serialize_row(maintenance, MAINTENANCE_DETAIL_FIELDS)})
 
 @maintenance_bp.route('/', methods=['POST'])
 def create_maintenance():
@@ -151,33 +430,69 @@ def create_maintenance():
     if not data:
         return jsonify({'data': None, 'error': 'No data provided'}), 400
 
-    required_fields = ['description', 'maintenancestatusid', 'scheduleddate', 'propertyid']
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return jsonify({'data': None, 'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
-
-    if not isinstance(data.get('description'), str) or len(data['description'].strip()) == 0:
-        return jsonify({'data': None, 'error': 'Description must be a non-empty string'}), 400
-
     try:
-        datetime.strptime(str(data['scheduleddate']), '%Y-%m-%d')
-    except ValueError:
-        return jsonify({'data': None, 'error': 'Scheduled date must be in YYYY-MM-DD format'}), 400
+        values = maintenance_values(data)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
     try:
-        new_maintenance = Maintenance(
-            description=data['description'],
-            maintenancestatusid=data['maintenancestatusid'],
-            scheduleddate=data['scheduleddate'],
-            propertyid=data['propertyid']
-        )
+        new_maintenance = Maintenance(**values)
         db.session.add(new_maintenance)
+        bump_version(Maintenance)
         db.session.commit()
         return jsonify({'data': {'id': new_maintenance.taskid, 'message': 'Maintenance task created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'data': None, 'error': f'Failed to create maintenance task: {str(e)}'}), 400
 
+@maintenance_bp.route('/bulk', methods=['POST'])
+def create_maintenance_bulk():
+    """
+    Create maintenance tasks in bulk
+    ---
+    tags:
+      - Maintenance
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            description: Up to 10000 maintenance tasks, each with the same fields as a single create
+            items:
+              type: object
+    responses:
+      201:
+        description: All maintenance tasks created
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                created:
+                  type: integer
+                failed:
+                  type: integer
+                results:
+                  type: array
+                  description: One entry per item in request order, with either the new id or the validation error
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                      id:
+                        type: integer
+                      error:
+                        type: string
+      207:
+        description: Some maintenance tasks created, the others rejected
+      400:
+        description: Invalid input, nothing created
+    """
+    return bulk_create(Maintenance, maintenance_values, 'maintenance tasks', check_batch=check_maintenance_batch)
+
 @maintenance_bp.route('/<int:id>', methods=['PUT'])
 def update_maintenance(id):
     """
@@ -221,6 +536,7 @@ def update_maintenance(id):
     maintenance.maintenancestatusid = data.get('maintenancestatusid', maintenance.maintenancestatusid)
     maintenance.scheduleddate = data.get('scheduleddate', maintenance.scheduleddate)
     maintenance.propertyid = data.get('propertyid', maintenance.propertyid)
+    bump_version(Maintenance)
     db.session.commit()
     return jsonify({'data': {'message': 'Maintenance task updated successfully'}})
 
@@ -247,5 +563,6 @@ def delete_maintenance(id):
     if not maintenance:
         return jsonify({'data': None, 'error': 'Maintenance task not found'}), 404
     db.session.delete(maintenance)
+    bump_version(Maintenance)
     db.session.commit()
     return jsonify({'data': {'message': 'Maintenance task deleted successfully'}})
\ No newline at end of file
@@ -2,11 +2,76 @@ from flask import Blueprint, jsonify, request
 from sqlalchemy.exc import IntegrityError
 from ...models import Property, PropertyType, PropertyStatus
 from ...db import db
+from ...exports import export_rows
+from ...bulk import bulk_create, check_references
+from ...versions import bump_version, conditional
+from ...lookups import match_lookup_ids
+from ...utils import keyset_order, paginate, parse_fields, select_fields, serialize_row, stream_rows, wants_stream
 from datetime import datetime
 
 properties_bp = Blueprint('properties', __name__)
 
+PROPERTY_FIELDS = {
+    'id': Property.propertyid,
+    'address': Property.address,
+    'type': PropertyType.description,
+    'status': PropertyStatus.description,
+    'purchaseDate': Property.purchasedate,
+    'price': Property.price
+}
+
+PROPERTY_DETAIL_FIELDS = dict(PROPERTY_FIELDS, typeId=Property.propertytypeid, statusId=Property.propertystatusid)
+
+def property_values(data):
+    """Validate a property payload and return its column values. Raises ``ValueError`` on invalid input."""
+    required_fields = ['address', 'typeId', 'statusId', 'purchaseDate', 'price']
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
+
+    if not isinstance(data.get('address'), str) or len(data['address'].strip()) == 0:
+        raise ValueError('Address must be a non-empty string')
+
+    try:
+        price = float(data['price'])
+    except (ValueError, TypeError):
+        raise ValueError('Price must be a valid number')
+    if price < 0:
+        raise ValueError('Price cannot be negative')
+
+    try:
+        purchase_date = datetime.strptime(str(data['purchaseDate']), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Purchase date must be in YYYY-MM-DD format')
+
+    return {
+        'address': data['address'],
+        'propertytypeid': data['typeId'],
+        'propertystatusid': data['statusId'],
+        'purchasedate': purchase_date,
+        'price': price
+    }
+
+def filter_properties(query):
+    """Apply the ``status`` and ``type`` filters of the request to a property query."""
+    status_filter = request.args.get('status')
+    if status_filter:
+        query = query.filter(Property.propertystatusid.in_(match_lookup_ids(PropertyStatus, status_filter)))
+
+    type_filter = request.args.get('type')
+    if type_filter:
+        query = query.filter(Property.propertytypeid.in_(match_lookup_ids(PropertyType, type_filter)))
+    return query
+
+def check_property_batch(rows):
+    """Return ``{index: error}`` for batch properties referencing ids that do not exist."""
+    return check_references(rows, {
+        'propertytypeid': (PropertyType, 'Property type'),
+        'propertystatusid': (PropertyStatus, 'Property status')
+    })
+
 @properties_bp.route('/', methods=['GET'])
+@conditional(Property, PropertyType, PropertyStatus)
 def get_properties():
     """
     Get a list of properties
@@ -30,12 +95,31 @@ def get_properties():
         in: query
         type: string
         description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of fields to return (id, address, type, status, purchaseDate, price)
+      - name: stream
+        in: query
+        type: boolean
+        description: Stream every matching row as NDJSON (application/x-ndjson); also selected by the Accept header
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of properties to return (enables cursor pagination)
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor returned as nextCursor by the previous page
     responses:
       200:
         description: A list of properties
         schema:
           type: object
           properties:
+            nextCursor:
+              type: string
+              description: Cursor for the next page, null on the last page (only present when limit is set)
             data:
               type: array
               items:
@@ -56,39 +140,90 @@ def get_properties():
                     type: number
                     format: float
     """
-    query = Property.query.join(PropertyType).join(PropertyStatus)
+    sort_by = request.args.get('sort', 'propertyid')
+    order = request.args.get('order', 'asc')
+    sort_field = sort_by if sort_by in ('price', 'purchaseDate') else 'id'
 
-    status_filter = request.args.get('status')
-    if status_filter:
-        query = query.filter(PropertyStatus.description.ilike(f'%{status_filter}%'))
+    try:
+        fields = parse_fields(request.args.get('fields'), PROPERTY_FIELDS)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
-    type_filter = request.args.get('type')
-    if type_filter:
-        query = query.filter(PropertyType.description.ilike(f'%{type_filter}%'))
+    # The sort key and id are always selected so that the page cursor can be built
+    selected = list(dict.fromkeys(fields + [sort_field, 'id']))
+    query = select_fields(PROPERTY_FIELDS, selected, Property)
 
-    sort_by = request.args.get('sort', 'propertyid')
-    order = request.args.get('order', 'asc')
+    query = filter_properties(query)
 
-    if sort_by == 'price':
-        query = query.order_by(Property.price.asc() if order == 'asc' else Property.price.desc())
-    elif sort_by == 'purchaseDate':
-        query = query.order_by(Property.purchasedate.asc() if order == 'asc' else Property.purchasedate.desc())
-    else:
-        query = query.order_by(Property.propertyid.asc() if order == 'asc' else Property.propertyid.desc())
+    try:
+        if wants_stream():
+            query = keyset_order(query, PROPERTY_FIELDS[sort_field], Property.propertyid, order, request.args.get('cursor'))
+            return stream_rows(query, fields)
+        properties, next_cursor = paginate(query, PROPERTY_FIELDS[sort_field], Property.propertyid, order,
+                                           request.args.get('limit'), request.args.get('cursor'),
+                                           row_keys=[sort_field, 'id'])
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
-    properties = query.all()
-    result = [
-        {
-            'id': p.propertyid,
-            'address': p.address,
-            'type': p.property_type.description,
-            'status': p.property_status.description,
-            'purchaseDate': p.purchasedate.isoformat(),
-            'price': float(p.price)
-        } for p in properties
-    ]
+    result = [serialize_row(p, fields) for p in properties]
+    if 'limit' in request.args:
+        return jsonify({'data': result, 'nextCursor': next_cursor})
     return jsonify({'data': result})
 
+@properties_bp.route('/export', methods=['GET'])
+@conditional(Property, PropertyType, PropertyStatus)
+def export_properties():
+    """
+    Export properties as a CSV or XLSX file
+    ---
+    tags:
+      - Properties
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, xlsx]
+        description: File format (default csv)
+      - name: status
+        in: query
+        type: string
+        description: Filter by property status
+      - name: type
+        in: query
+        type: string
+        description: Filter by property type
+      - name: sort
+        in: query
+        type: string
+        description: Sort by field (price, purchaseDate)
+      - name: order
+        in: query
+        type: string
+        description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of columns to export, all list fields by default
+    produces:
+      - text/csv
+      - application/vnd.openxmlformats-officedocument.spreadsheetml.sheet
+    responses:
+      200:
+        description: A file attachment with a header row of field names
+      400:
+        description: Invalid format or fields
+    """
+    sort_by = request.args.get('sort')
+    order = request.args.get('order', 'asc')
+    sort_column = PROPERTY_FIELDS[sort_by] if sort_by in ('price', 'purchaseDate') else Property.propertyid
+
+    try:
+        fields = parse_fields(request.args.get('fields'), PROPERTY_FIELDS)
+        query = keyset_order(filter_properties(select_fields(PROPERTY_FIELDS, fields, Property)), sort_column, Property.propertyid, order)
+        return export_rows(query, fields, request.args.get('format', 'csv'), 'properties')
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
 @properties_bp.route('/', methods=['POST'])
 def create_property():
     """
@@ -147,42 +282,71 @@ def create_property():
     if not data:
         return jsonify({'data': None, 'error': 'No data provided'}), 400
 
-    required_fields = ['address', 'typeId', 'statusId', 'purchaseDate', 'price']
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return jsonify({'data': None, 'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
-
-    if not isinstance(data.get('address'), str) or len(data['address'].strip()) == 0:
-        return jsonify({'data': None, 'error': 'Address must be a non-empty string'}), 400
-
     try:
-        price = float(data['price'])
-        if price < 0:
-            return jsonify({'data': None, 'error': 'Price cannot be negative'}), 400
-    except (ValueError, TypeError):
-        return jsonify({'data': None, 'error': 'Price must be a valid number'}), 400
+        values = property_values(data)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
     try:
-        datetime.strptime(str(data['purchaseDate']), '%Y-%m-%d')
-    except ValueError:
-        return jsonify({'data': None, 'error': 'Purchase date must be in YYYY-MM-DD format'}), 400
-
-    try:
-        new_property = Property(
-            address=data['address'],
-            propertytypeid=data['typeId'],
-            propertystatusid=data['statusId'],
-            purchasedate=data['purchaseDate'],
-            price=data['price']
-        )
+        new_property = Property(**values)
         db.session.add(new_property)
+        bump_version(Property)
         db.session.commit()
         return jsonify({'data': {'id': new_property.propertyid, 'message': 'Property created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'data': None, 'error': f'Failed to create property: {str(e)}'}), 400
 
+@properties_bp.route('/bulk', methods=['POST'])
+def create_properties_bulk():
+    """
+    Create properties in bulk
+    ---
+    tags:
+      - Properties
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            description: Up to 10000 properties, each with the same fields as a single create
+            items:
+              type: object
+    responses:
+      201:
+        description: All properties created
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                created:
+                  type: integer
+                failed:
+                  type: integer
+                results:
+                  type: array
+                  description: One entry per item in request order, with either the new id or the validation error
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                      id:
+                        type: integer
+                      error:
+                        type: string
+      207:
+        description: Some properties created, the others rejected
+      400:
+        description: Invalid input, nothing created
+    """
+    return bulk_create(Property, property_values, 'properties', check_batch=check_property_batch)
+
 @properties_bp.route('/<int:id>', methods=['GET'])
+@conditional(Property, PropertyType, PropertyStatus)
 def get_property_by_id(id):
     """
     Get a property by its ID
@@ -225,20 +389,11 @@ def get_property_by_id(id):
       404:
         description: Property not found
     """
-    property = Property.query.join(PropertyType).join(PropertyStatus).filter(Property.propertyid == id).first()
+    property = select_fields(PROPERTY_DETAIL_FIELDS, list(PROPERTY_DETAIL_FIELDS), Property) \
+        .filter(Property.propertyid == id).first()
     if not property:
         return jsonify({'data': None, 'error': 'Property not found'}), 404
-    result = {
-        'id': property.propertyid,
-        'address': property.address,
-        'type': property.property_type.description,
-        'status': property.property_status.description,
-        'typeId': property.propertytypeid,
-        'statusId': property.propertystatusid,
-        'purchaseDate': property.purchasedate.isoformat(),
-        'price': float(property.price)
-    }
-    return jsonify({'data': result})
+    return jsonify({'data': serialize_row(property, PROPERTY_DETAIL_FIELDS)})
 
 @properties_bp.route('/<int:id>', methods=['PUT'])
 def update_property(id):
@@ -287,6 +442,7 @@ def update_property(id):
     property_.propertystatusid = data.get('statusId', property_.propertystatusid)
     property_.purchasedate = data.get('purchaseDate', property_.purchasedate)
     property_.price = data.get('price', property_.price)
+    bump_version(Property)
     db.session.commit()
     return jsonify({'data': {'message': 'Property updated successfully'}})
 
@@ -317,6 +473,7 @@ def delete_property(id):
 
     try:
         db.session.delete(property_)
+        bump_version(Property)
         db.session.commit()
         return jsonify({'data': {'message': 'Property deleted successfully'}})
     except IntegrityError:
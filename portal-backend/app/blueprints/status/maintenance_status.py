@@ -1,21 +1,24 @@
 from flask import Blueprint, jsonify, request
 from ...models import MaintenanceStatus
 from ...db import db
+from ...versions import bump_version, conditional
+from ...lookups import get_lookup, invalidate_lookup
 
 maintenance_status_bp = Blueprint('maintenance_status', __name__)
 
 @maintenance_status_bp.route('/', methods=['GET'])
+@conditional(MaintenanceStatus)
 def get_maintenance_statuses():
-    statuses = MaintenanceStatus.query.all()
-    result = [{'maintenancestatusid': s.maintenancestatusid, 'description': s.description} for s in statuses]
+    result = [{'maintenancestatusid': id, 'description': description} for id, description in get_lookup(MaintenanceStatus).items()]
     return jsonify({'data': result})
 
 @maintenance_status_bp.route('/<int:id>', methods=['GET'])
+@conditional(MaintenanceStatus)
 def get_maintenance_status(id):
-    status = MaintenanceStatus.query.get(id)
-    if not status:
+    description = get_lookup(MaintenanceStatus).get(id)
+    if description is None:
         return jsonify({'data': None, 'error': 'MaintenanceStatus not found'}), 404
-    return jsonify({'data': {'maintenancestatusid': status.maintenancestatusid, 'description': status.description}})
+    return jsonify({'data': {'maintenancestatusid': id, 'description': description}})
 
 @maintenance_status_bp.route('/', methods=['POST'])
 def create_maintenance_status():
@@ -25,7 +28,9 @@ def create_maintenance_status():
     try:
         new_status = MaintenanceStatus(description=data['description'])
         db.session.add(new_status)
+        bump_version(MaintenanceStatus)
         db.session.commit()
+        invalidate_lookup(MaintenanceStatus)
         return jsonify({'data': {'id': new_status.maintenancestatusid, 'message': 'MaintenanceStatus created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
@@ -41,7 +46,9 @@ def update_maintenance_status(id):
         return jsonify({'data': None, 'error': 'Missing required field: description'}), 400
     try:
         status.description = data['description']
+        bump_version(MaintenanceStatus)
         db.session.commit()
+        invalidate_lookup(MaintenanceStatus)
         return jsonify({'data': {'message': 'MaintenanceStatus updated successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -54,7 +61,9 @@ def delete_maintenance_status(id):
         return jsonify({'data': None, 'error': 'MaintenanceStatus not found'}), 404
     try:
         db.session.delete(status)
+        bump_version(MaintenanceStatus)
         db.session.commit()
+        invalidate_lookup(MaintenanceStatus)
         return jsonify({'data': {'message': 'MaintenanceStatus deleted successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -1,21 +1,24 @@
 from flask import Blueprint, jsonify, request
 from ...models import PaymentStatus
 from ...db import db
+from ...versions import bump_version, conditional
+from ...lookups import get_lookup, invalidate_lookup
 
 payment_status_bp = Blueprint('payment_status', __name__)
 
 @payment_status_bp.route('/', methods=['GET'])
+@conditional(PaymentStatus)
 def get_payment_statuses():
-    statuses = PaymentStatus.query.all()
-    result = [{'paymentstatusid': s.paymentstatusid, 'description': s.description} for s in statuses]
+    result = [{'paymentstatusid': id, 'description': description} for id, description in get_lookup(PaymentStatus).items()]
     return jsonify({'data': result})
 
 @payment_status_bp.route('/<int:id>', methods=['GET'])
+@conditional(PaymentStatus)
 def get_payment_status(id):
-    status = PaymentStatus.query.get(id)
-    if not status:
+    description = get_lookup(PaymentStatus).get(id)
+    if description is None:
         return jsonify({'data': None, 'error': 'PaymentStatus not found'}), 404
-    return jsonify({'data': {'paymentstatusid': status.paymentstatusid, 'description': status.description}})
+    return jsonify({'data': {'paymentstatusid': id, 'description': description}})
 
 @payment_status_bp.route('/', methods=['POST'])
 def create_payment_status():
@@ -25,7 +28,9 @@ def create_payment_status():
     try:
         new_status = PaymentStatus(description=data['description'])
         db.session.add(new_status)
+        bump_version(PaymentStatus)
         db.session.commit()
+        invalidate_lookup(PaymentStatus)
         return jsonify({'data': {'id': new_status.paymentstatusid, 'message': 'PaymentStatus created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
@@ -41,7 +46,9 @@ def update_payment_status(id):
         return jsonify({'data': None, 'error': 'Missing required field: description'}), 400
     try:
         status.description = data['description']
+        bump_version(PaymentStatus)
         db.session.commit()
+        invalidate_lookup(PaymentStatus)
         return jsonify({'data': {'message': 'PaymentStatus updated successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -54,7 +61,9 @@ def delete_payment_status(id):
         return jsonify({'data': None, 'error': 'PaymentStatus not found'}), 404
     try:
         db.session.delete(status)
+        bump_version(PaymentStatus)
         db.session.commit()
+        invalidate_lookup(PaymentStatus)
         return jsonify({'data': {'message': 'PaymentStatus deleted successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -1,10 +1,13 @@
 from flask import Blueprint, jsonify, request
 from ...models import PropertyStatus
 from ...db import db
+from ...versions import bump_version, conditional
+from ...lookups import get_lookup, invalidate_lookup
 
 property_status_bp = Blueprint('property_status', __name__)
 
 @property_status_bp.route('/', methods=['GET'])
+@conditional(PropertyStatus)
 def get_property_statuses():
     """
     Get all property statuses
@@ -29,11 +32,11 @@ def get_property_statuses():
                     type: string
                     example: 'Available'
     """
-    statuses = PropertyStatus.query.all()
-    result = [{'propertystatusid': s.propertystatusid, 'description': s.description} for s in statuses]
+    result = [{'propertystatusid': id, 'description': description} for id, description in get_lookup(PropertyStatus).items()]
     return jsonify({'data': result})
 
 @property_status_bp.route('/<int:id>', methods=['GET'])
+@conditional(PropertyStatus)
 def get_property_status(id):
     """
     Get a single property status by ID
@@ -61,10 +64,10 @@ def get_property_status(id):
       404:
         description: PropertyStatus not found
     """
-    status = PropertyStatus.query.get(id)
-    if not status:
+    description = get_lookup(PropertyStatus).get(id)
+    if description is None:
         return jsonify({'data': None, 'error': 'PropertyStatus not found'}), 404
-    return jsonify({'data': {'propertystatusid': status.propertystatusid, 'description': status.description}})
+    return jsonify({'data': {'propertystatusid': id, 'description': description}})
 
 @property_status_bp.route('/', methods=['POST'])
 def create_property_status():
@@ -95,7 +98,9 @@ def create_property_status():
     try:
         new_status = PropertyStatus(description=data['description'])
         db.session.add(new_status)
+        bump_version(PropertyStatus)
         db.session.commit()
+        invalidate_lookup(PropertyStatus)
         return jsonify({'data': {'id': new_status.propertystatusid, 'message': 'PropertyStatus created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
@@ -139,7 +144,9 @@ def update_property_status(id):
         return jsonify({'data': None, 'error': 'Missing required field: description'}), 400
     try:
         status.description = data['description']
+        bump_version(PropertyStatus)
         db.session.commit()
+        invalidate_lookup(PropertyStatus)
         return jsonify({'data': {'message': 'PropertyStatus updated successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -169,7 +176,9 @@ def delete_property_status(id):
         return jsonify({'data': None, 'error': 'PropertyStatus not found'}), 404
     try:
         db.session.delete(status)
+        bump_version(PropertyStatus)
         db.session.commit()
+        invalidate_lookup(PropertyStatus)
         return jsonify({'data': {'message': 'PropertyStatus deleted successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -1,10 +1,13 @@
 from flask import Blueprint, jsonify, request
 from ...models import PropertyType
 from ...db import db
+from ...versions import bump_version, conditional
+from ...lookups import get_lookup, invalidate_lookup
 
 property_type_bp = Blueprint('property_type', __name__)
 
 @property_type_bp.route('/', methods=['GET'])
+@conditional(PropertyType)
 def get_property_types():
     """
     Get all property types
@@ -29,11 +32,11 @@ def get_property_types():
                     type: string
                     example: Apartment
     """
-    types = PropertyType.query.all()
-    result = [{'propertytypeid': t.propertytypeid, 'description': t.description} for t in types]
+    result = [{'propertytypeid': id, 'description': description} for id, description in get_lookup(PropertyType).items()]
     return jsonify({'data': result})
 
 @property_type_bp.route('/<int:id>', methods=['GET'])
+@conditional(PropertyType)
 def get_property_type(id):
     """
     Get a single property type by ID
@@ -52,10 +55,10 @@ def get_property_type(id):
       404:
         description: PropertyType not found
     """
-    type_ = PropertyType.query.get(id)
-    if not type_:
+    description = get_lookup(PropertyType).get(id)
+    if description is None:
         return jsonify({'data': None, 'error': 'PropertyType not found'}), 404
-    return jsonify({'data': {'propertytypeid': type_.propertytypeid, 'description': type_.description}})
+    return jsonify({'data': {'propertytypeid': id, 'description': description}})
 
 @property_type_bp.route('/', methods=['POST'])
 def create_property_type():
@@ -86,7 +89,9 @@ def create_property_type():
     try:
         new_type = PropertyType(description=data['description'])
         db.session.add(new_type)
+        bump_version(PropertyType)
         db.session.commit()
+        invalidate_lookup(PropertyType)
         return jsonify({'data': {'id': new_type.propertytypeid, 'message': 'PropertyType created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
@@ -130,7 +135,9 @@ def update_property_type(id):
         return jsonify({'data': None, 'error': 'Missing required field: description'}), 400
     try:
         type_.description = data['description']
+        bump_version(PropertyType)
         db.session.commit()
+        invalidate_lookup(PropertyType)
         return jsonify({'data': {'message': 'PropertyType updated successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -160,7 +167,9 @@ def delete_property_type(id):
         return jsonify({'data': None, 'error': 'PropertyType not found'}), 404
     try:
         db.session.delete(type_)
+        bump_version(PropertyType)
         db.session.commit()
+        invalidate_lookup(PropertyType)
         return jsonify({'data': {'message': 'PropertyType deleted successfully'}})
     except Exception as e:
         db.session.rollback()
@@ -2,10 +2,20 @@ from flask import Blueprint, jsonify, request
 from sqlalchemy.exc import IntegrityError
 from ...models import Tenant, Lease
 from ...db import db
+from ...bulk import bulk_create
+from ...versions import bump_version, conditional
+from ...search import MAX_SEARCH_LIMIT, search_tenants
+from ...utils import keyset_order, paginate, parse_fields, select_fields, serialize_row, stream_rows, wants_stream
 import re
 
 tenants_bp = Blueprint('tenants', __name__)
 
+TENANT_FIELDS = {
+    'id': Tenant.tenantid,
+    'name': Tenant.name,
+    'contactInfo': Tenant.contactinfo
+}
+
 def validate_contact_info(contact_info):
     email_pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
     phone_pattern = r'^\+?[\d\s\-\(\)]{10,}$'
@@ -14,7 +24,23 @@ def validate_contact_info(contact_info):
         return True
     return False
 
+def tenant_values(data):
+    """Validate a tenant payload and return its column values. Raises ``ValueError`` on invalid input."""
+    required_fields = ['name', 'contactinfo']
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
+
+    if not isinstance(data.get('name'), str) or len(data['name'].strip()) == 0:
+        raise ValueError('Name must be a non-empty string')
+
+    if not isinstance(data['contactinfo'], str) or not validate_contact_info(data['contactinfo']):
+        raise ValueError('Contact info must be a valid email or phone number')
+
+    return {'name': data['name'], 'contactinfo': data['contactinfo']}
+
 @tenants_bp.route('/', methods=['GET'])
+@conditional(Tenant)
 def get_tenants():
     """
     Get a list of tenants
@@ -34,12 +60,31 @@ def get_tenants():
         in: query
         type: string
         description: Sort order (asc, desc)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated list of fields to return (id, name, contactInfo)
+      - name: stream
+        in: query
+        type: boolean
+        description: Stream every matching row as NDJSON (application/x-ndjson); also selected by the Accept header
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of tenants to return (enables cursor pagination)
+      - name: cursor
+        in: query
+        type: string
+        description: Opaque cursor returned as nextCursor by the previous page
     responses:
       200:
         description: A list of tenants
         schema:
           type: object
           properties:
+            nextCursor:
+              type: string
+              description: Cursor for the next page, null on the last page (only present when limit is set)
             data:
               type: array
               items:
@@ -52,7 +97,16 @@ def get_tenants():
                   contactInfo:
                     type: string
     """
-    query = Tenant.query
+    sort_by = request.args.get('sort', 'tenantid')
+    order = request.args.get('order', 'asc')
+    sort_field = 'name' if sort_by == 'name' else 'id'
+
+    try:
+        fields = parse_fields(request.args.get('fields'), TENANT_FIELDS)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
+
+    query = select_fields(TENANT_FIELDS, list(dict.fromkeys(fields + [sort_field, 'id'])), Tenant)
 
     search = request.args.get('search')
     if search:
@@ -61,25 +115,85 @@ def get_tenants():
             (Tenant.contactinfo.ilike(f'%{search}%'))
         )
 
-    sort_by = request.args.get('sort', 'tenantid')
-    order = request.args.get('order', 'asc')
+    try:
+        if wants_stream():
+            query = keyset_order(query, TENANT_FIELDS[sort_field], Tenant.tenantid, order, request.args.get('cursor'))
+            return stream_rows(query, fields)
+        tenants, next_cursor = paginate(query, TENANT_FIELDS[sort_field], Tenant.tenantid, order,
+                                        request.args.get('limit'), request.args.get('cursor'),
+                                        row_keys=[sort_field, 'id'])
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
-    if sort_by == 'name':
-        query = query.order_by(Tenant.name.asc() if order == 'asc' else Tenant.name.desc())
-    else:
-        query = query.order_by(Tenant.tenantid.asc() if order == 'asc' else Tenant.tenantid.desc())
+    result = [serialize_row(t, fields) for t in tenants]
+    if 'limit' in request.args:
+        return jsonify({'data': result, 'nextCursor': next_cursor})
+    return jsonify({'data': result})
+
+@tenants_bp.route('/search', methods=['GET'])
+@conditional(Tenant)
+def search_tenants_ranked():
+    """
+    Search tenants by name or contact info, ranked by similarity
+    ---
+    tags:
+      - Tenants
+    parameters:
+      - name: q
+        in: query
+        type: string
+        required: true
+        description: Search text (at least 3 characters); misspellings are tolerated
+      - name: limit
+        in: query
+        type: integer
+        description: Maximum number of results (default 20, max 100)
+    responses:
+      200:
+        description: Matching tenants, best match first
+        schema:
+          type: object
+          properties:
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  name:
+                    type: string
+                  contactInfo:
+                    type: string
+                  score:
+                    type: number
+                    format: float
+      400:
+        description: Invalid query or limit
+    """
+    query = request.args.get('q', '').strip()
+    if len(query) < 3:
+        return jsonify({'data': None, 'error': 'Search query must be at least 3 characters'}), 400
+
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'data': None, 'error': 'Limit must be a positive integer'}), 400
+    if limit < 1:
+        return jsonify({'data': None, 'error': 'Limit must be a positive integer'}), 400
 
-    tenants = query.all()
     result = [
         {
-            'id': t.tenantid,
-            'name': t.name,
-            'contactInfo': t.contactinfo
-        } for t in tenants
+            'id': tenant_id,
+            'name': name,
+            'contactInfo': contact_info,
+            'score': round(float(score), 3)
+        } for tenant_id, name, contact_info, score in search_tenants(query, min(limit, MAX_SEARCH_LIMIT))
     ]
     return jsonify({'data': result})
 
 @tenants_bp.route('/<int:id>', methods=['GET'])
+@conditional(Tenant)
 def get_tenant_by_id(id):
     """
     Get a tenant by its ID
@@ -142,29 +256,69 @@ def create_tenant():
     if not data:
         return jsonify({'data': None, 'error': 'No data provided'}), 400
 
-    required_fields = ['name', 'contactinfo']
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return jsonify({'data': None, 'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
-
-    if not isinstance(data.get('name'), str) or len(data['name'].strip()) == 0:
-        return jsonify({'data': None, 'error': 'Name must be a non-empty string'}), 400
-
-    if not validate_contact_info(data['contactinfo']):
-        return jsonify({'data': None, 'error': 'Contact info must be a valid email or phone number'}), 400
+    try:
+        values = tenant_values(data)
+    except ValueError as e:
+        return jsonify({'data': None, 'error': str(e)}), 400
 
     try:
-        new_tenant = Tenant(
-            name=data['name'],
-            contactinfo=data['contactinfo']
-        )
+        new_tenant = Tenant(**values)
         db.session.add(new_tenant)
+        bump_version(Tenant)
         db.session.commit()
         return jsonify({'data': {'id': new_tenant.tenantid, 'message': 'Tenant created successfully'}}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'data': None, 'error': f'Failed to create tenant: {str(e)}'}), 400
 
+@tenants_bp.route('/bulk', methods=['POST'])
+def create_tenants_bulk():
+    """
+    Create tenants in bulk
+    ---
+    tags:
+      - Tenants
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: array
+            description: Up to 10000 tenants, each with the same fields as a single create
+            items:
+              type: object
+    responses:
+      201:
+        description: All tenants created
+        schema:
+          type: object
+          properties:
+            data:
+              type: object
+              properties:
+                created:
+                  type: integer
+                failed:
+                  type: integer
+                results:
+                  type: array
+                  description: One entry per item in request order, with either the new id or the validation error
+                  items:
+                    type: object
+                    properties:
+                      index:
+                        type: integer
+                      id:
+                        type: integer
+                      error:
+                        type: string
+      207:
+        description: Some tenants created, the others rejected
+      400:
+        description: Invalid input, nothing created
+    """
+    return bulk_create(Tenant, tenant_values, 'tenants')
+
 @tenants_bp.route('/<int:id>', methods=['PUT'])
 def update_tenant(id):
     """
@@ -201,6 +355,7 @@ def update_tenant(id):
         return jsonify({'data': None, 'error': 'Tenant not found'}), 404
     tenant.name = data.get('name', tenant.name)
     tenant.contactinfo = data.get('contactinfo', tenant.contactinfo)
+    bump_version(Tenant)
     db.session.commit()
     return jsonify({'data': {'message': 'Tenant updated successfully'}})
 
@@ -238,6 +393,7 @@ def delete_tenant(id):
 
     try:
         db.session.delete(tenant)
+        bump_version(Tenant)
         db.session.commit()
         return jsonify({'data': {'message': 'Tenant deleted successfully'}})
     except IntegrityError:
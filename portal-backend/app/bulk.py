@@ -0,0 +1,135 @@
+import csv
+import io
+from flask import jsonify, request
+from sqlalchemy import insert, text
+from sqlalchemy.exc import IntegrityError
+from .db import db
+from .versions import bump_version
+
+MAX_BULK_ITEMS = 10000
+
+def bulk_insert(model, rows):
+    """
+    Insert ``rows`` (dicts of column values) into ``model``'s table and return their primary keys in order.
+
+    On PostgreSQL the keys are reserved from the table's sequence in one
+    statement and the rows streamed with ``COPY``. Elsewhere they are sent as
+    multi-row ``INSERT ... RETURNING`` statements.
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    id_column = model.__mapper__.primary_key[0]
+
+    if db.engine.dialect.name != 'postgresql':
+        result = db.session.execute(insert(table).returning(id_column, sort_by_parameter_order=True), rows)
+        return list(result.scalars())
+
+    ids = list(db.session.execute(
+        text('SELECT nextval(pg_get_serial_sequence(:table, :column)) FROM generate_series(1, :count)'),
+        {'table': table.name, 'column': id_column.name, 'count': len(rows)}
+    ).scalars())
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for id, row in zip(ids, rows):
+        writer.writerow([id] + [row[column] for column in columns])
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY {table.name} ({", ".join([id_column.name] + columns)}) FROM STDIN WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+    return ids
+
+def check_references(rows, references):
+    """
+    Return ``{index: error}`` for the ``rows`` naming an id that does not exist.
+
+    ``references`` maps a column key to ``(model, label)``. Each referenced
+    table is queried once for all the distinct ids of the batch.
+    """
+    errors = {}
+    for key, (model, label) in references.items():
+        id_column = model.__mapper__.primary_key[0]
+        wanted = {row[key] for index, row in rows.items() if _is_id(row[key]) and index not in errors}
+        found = set(db.session.execute(db.select(id_column).where(id_column.in_(wanted))).scalars()) if wanted else set()
+        for index, row in rows.items():
+            if index in errors:
+                continue
+            if not _is_id(row[key]):
+                errors[index] = f'{label} id must be an integer'
+            elif row[key] not in found:
+                errors[index] = f'{label} {row[key]} does not exist'
+    return errors
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def validate_items(items, validate, check_batch=None):
+    """
+    Validate ``(key, item)`` pairs and return ``(rows, errors)``, both keyed like ``items``.
+
+    ``validate`` is the single-item validator, which returns column values or
+    raises ``ValueError``; ``check_batch`` then reports ``{key: error}`` for
+    rules that need the whole batch at once.
+    """
+    rows, errors = {}, {}
+    for key, item in items:
+        if not isinstance(item, dict) or not item:
+            errors[key] = 'No data provided'
+            continue
+        try:
+            rows[key] = validate(item)
+        except ValueError as e:
+            errors[key] = str(e)
+
+    if rows and check_batch:
+        errors.update(check_batch(rows))
+        rows = {key: row for key, row in rows.items() if key not in errors}
+    return rows, errors
+
+def bulk_create(model, validate, label, check_batch=None, is_conflict=None):
+    """
+    Create ``model`` rows from the JSON array in the request body.
+
+    Items are checked with ``validate_items``. Valid items are inserted
+    together in one transaction and invalid ones reported, so the response
+    lists one result per item in request order.
+    Responds ``201`` when every item was created, ``207`` when only some were
+    and ``400`` when none were. An ``IntegrityError`` fails the whole batch,
+    with ``409`` if ``is_conflict`` recognises it.
+    """
+    items = request.get_json(silent=True)
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'data': None, 'error': 'Request body must be a non-empty array'}), 400
+
+    if len(items) > MAX_BULK_ITEMS:
+        return jsonify({'data': None, 'error': f'At most {MAX_BULK_ITEMS} items can be created at once'}), 400
+
+    rows, errors = validate_items(enumerate(items), validate, check_batch)
+
+    created = {}
+    if rows:
+        try:
+            ids = bulk_insert(model, list(rows.values()))
+            bump_version(model)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            code = 409 if is_conflict and is_conflict(e) else 400
+            return jsonify({'data': None, 'error': f'Failed to create {label}: {str(e)}'}), code
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'data': None, 'error': f'Failed to create {label}: {str(e)}'}), 400
+        created = dict(zip(rows, ids))
+
+    results = [
+        {'index': index, 'id': created[index]} if index in created else {'index': index, 'error': errors[index]}
+        for index in range(len(items))
+    ]
+    code = 400 if not created else 201 if not errors else 207
+    return jsonify({'data': {'created': len(created), 'failed': len(errors), 'results': results}}), code
@@ -0,0 +1,37 @@
+import time
+import click
+from flask.cli import with_appcontext
+from .db import wait_for_db
+from .migrations import migrate
+from .synthetic import generate_data, portfolio_sizes
+
+@click.command('generate-data')
+@click.option('--leases', default=100000, show_default=True, help='Leases to generate.')
+@click.option('--properties', type=int, help='Properties to generate  [default: leases / 4]')
+@click.option('--tenants', type=int, help='Tenants to generate  [default: leases / 2]')
+@click.option('--maintenance', type=int, help='Maintenance tasks to generate  [default: leases / 2]')
+@click.option('--seed', type=int, help='Random seed, for a reproducible portfolio.')
+@click.option('--batch-size', default=100000, show_default=True, help='Rows sent per COPY or INSERT batch.')
+@with_appcontext
+def generate_data_command(leases, properties, tenants, maintenance, seed, batch_size):
+    """Fill the database with a synthetic portfolio for capacity planning and benchmarks."""
+    sizes = portfolio_sizes(leases, properties, tenants, maintenance)
+    started = time.perf_counter()
+
+    def progress(table, count):
+        click.echo(f'{table}: {count} rows ({time.perf_counter() - started:.1f}s)')
+
+    generate_data(sizes, seed, batch_size, progress)
+    click.echo(f'Generated {sum(sizes.values())} rows in {time.perf_counter() - started:.1f}s')
+
+@click.command('migrate')
+@click.option('--wait', is_flag=True, help='Wait for the database to accept connections first.')
+@with_appcontext
+def migrate_command(wait):
+    """Apply the pending database migrations from migrations/."""
+    if wait:
+        wait_for_db()
+    applied = migrate()
+    for version, name in applied:
+        click.echo(f'Applied {version:04d}_{name}')
+    click.echo(f'{len(applied)} migration(s) applied')
@@ -0,0 +1,123 @@
+import gzip
+import threading
+import time
+from flask import current_app, g, request
+from .cache import TTLCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/html', 'text/plain')
+
+_lock = threading.Lock()
+_stats = {}
+_uncompressed = {'responses': 0, 'bytes': 0}
+compressed_bodies = TTLCache(max_entries=128)
+
+def available_encodings():
+    """Content codings this process can produce, preferred first: brotli when the module is installed, then gzip."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(data, compresslevel=config['COMPRESSION_GZIP_LEVEL'], mtime=0)
+
+def record_compression(encoding, size, compressed_size, cpu_seconds, cached):
+    with _lock:
+        stats = _stats.setdefault(encoding, {
+            'responses': 0, 'cacheHits': 0, 'bytesIn': 0, 'bytesOut': 0, 'cpuSeconds': 0.0
+        })
+        stats['responses'] += 1
+        stats['cacheHits'] += cached
+        stats['bytesIn'] += size
+        stats['bytesOut'] += compressed_size
+        stats['cpuSeconds'] += cpu_seconds
+
+def record_uncompressed(size):
+    with _lock:
+        _uncompressed['responses'] += 1
+        _uncompressed['bytes'] += size
+
+def compression_stats():
+    """
+    Compression totals of this process per content coding.
+
+    ``ratio`` is the uncompressed size over the compressed size and
+    ``cpuSeconds`` the CPU time spent compressing; bodies served from the
+    cache of compressed bodies cost none. ``uncompressed`` counts the eligible
+    responses sent as is, because they were below the size threshold or the
+    client accepted no supported coding.
+    """
+    with _lock:
+        encodings = {encoding: dict(stats) for encoding, stats in _stats.items()}
+        uncompressed = dict(_uncompressed)
+    for stats in encodings.values():
+        stats['ratio'] = stats['bytesIn'] / stats['bytesOut'] if stats['bytesOut'] else None
+        stats['avgCpuMs'] = stats['cpuSeconds'] * 1000 / stats['responses']
+    return {
+        'encodings': encodings,
+        'uncompressed': uncompressed,
+        'cache': {'entries': len(compressed_bodies), 'hits': compressed_bodies.hits,
+                  'misses': compressed_bodies.misses}
+    }
+
+def reset_compression_stats():
+    with _lock:
+        _stats.clear()
+        _uncompressed['responses'] = 0
+        _uncompressed['bytes'] = 0
+    compressed_bodies.clear()
+
+def compress_response(response):
+    """
+    Compress ``response`` with the best content coding the client accepts, in place.
+
+    Only complete, successful bodies of a compressible type are considered:
+    streamed responses (NDJSON, exports, imports) are sent as produced.
+    Bodies smaller than ``COMPRESSION_MIN_BYTES`` are not worth the CPU. A
+    response with an ETag is fully determined by it (see
+    ``versions.conditional``), so its compressed body is cached under the
+    ETag and coding and reused until the data changes.
+    """
+    config = current_app.config
+    if (not 200 <= response.status_code < 300 or response.status_code == 204 or response.is_streamed
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if len(data) < config['COMPRESSION_MIN_BYTES'] or encoding is None:
+        record_uncompressed(len(data))
+        return response
+
+    etag = response.headers.get('ETag')
+    key = (etag, encoding)
+    body = compressed_bodies.get(key) if etag else None
+    started, cached = time.thread_time(), body is not None
+    if body is None:
+        body = compress(data, encoding, config)
+        if etag:
+            compressed_bodies.set(key, body, config['COMPRESSION_CACHE_SECONDS'])
+    cpu_seconds = time.thread_time() - started
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    record_compression(encoding, len(data), len(body), cpu_seconds, cached)
+    stats = g.get('sql_stats')
+    if stats is not None:
+        stats['compress'] = cpu_seconds
+    return response
+
+def init_compression(app):
+    """Compress responses as ``compress_response`` describes, unless ``COMPRESSION`` is off."""
+    @app.after_request
+    def compress_after_request(response):
+        if not current_app.config['COMPRESSION']:
+            return response
+        return compress_response(response)
@@ -1,8 +1,76 @@
 import os
+import tempfile
+from .db import REPLICA_BIND
+from .pool import InstrumentedQueuePool
+
+def pool_options():
+    """Pool settings read from the ``DB_POOL_*`` variables."""
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    }
+
+def engine_options(database_url):
+    """
+    SQLAlchemy engine options for ``database_url``, read from the ``DB_POOL_*`` and ``DB_STATEMENT_TIMEOUT_MS`` variables.
+
+    SQLite keeps Flask-SQLAlchemy's own pool defaults, since its pools do not
+    take these settings.
+    """
+    if database_url.startswith('sqlite'):
+        return {}
+
+    options = dict(pool_options(), poolclass=InstrumentedQueuePool)
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))
+    if statement_timeout and database_url.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+def async_database_url(database_url):
+    """Point ``database_url`` at the asyncio driver of its database: asyncpg for PostgreSQL, aiosqlite for SQLite."""
+    scheme, rest = database_url.split('://', 1)
+    driver = {'postgresql': 'postgresql+asyncpg', 'postgres': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+    return f"{driver.get(scheme.split('+')[0], scheme)}://{rest}"
+
+def async_engine_options(database_url):
+    """Engine options for the async read path, with the same pool settings and statement timeout as ``engine_options``."""
+    if database_url.startswith('sqlite'):
+        return {}
+
+    options = pool_options()
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))
+    if statement_timeout and database_url.startswith('postgresql'):
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(statement_timeout)}}
+    return options
 
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv(
         'DATABASE_URL',
         'postgresql://user:password@db:5432/property_management'
     )
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {
+        REPLICA_BIND: dict(engine_options(DATABASE_REPLICA_URL), url=DATABASE_REPLICA_URL)
+    } if DATABASE_REPLICA_URL else {}
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '5'))
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '2'))
+    REPLICA_LAG_CHECK_SECONDS = float(os.getenv('REPLICA_LAG_CHECK_SECONDS', '1'))
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '1000'))
+    IMPORT_DIR = os.getenv('IMPORT_DIR', os.path.join(tempfile.gettempdir(), 'portal-imports'))
+    IMPORT_REJECTED_SECONDS = float(os.getenv('IMPORT_REJECTED_SECONDS', '86400'))
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'true').lower() == 'true'
+    DASHBOARD_MATERIALIZED_VIEW = os.getenv('DASHBOARD_MATERIALIZED_VIEW', 'false').lower() == 'true'
+    DASHBOARD_REFRESH_SECONDS = float(os.getenv('DASHBOARD_REFRESH_SECONDS', '60'))
+    EXPIRING_CACHE_SECONDS = float(os.getenv('EXPIRING_CACHE_SECONDS', '30'))
+    COMPRESSION = os.getenv('COMPRESSION', 'true').lower() == 'true'
+    COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+    COMPRESSION_CACHE_SECONDS = float(os.getenv('COMPRESSION_CACHE_SECONDS', '600'))
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
@@ -1,3 +1,58 @@
+from contextlib import contextmanager
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+import tenacity
+import psycopg2
+import os
 
-db = SQLAlchemy()
\ No newline at end of file
+REPLICA_BIND = 'replica'
+
+class RoutingSession(Session):
+    """
+    Session sending the reads of a request to the read replica when the request allows it.
+
+    ``g.read_replica`` is set per request by ``replicas.init_replica_routing``;
+    flushes and DML statements always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and has_app_context() and g.get('read_replica') and not self._flushing
+                and not (clause is not None and getattr(clause, 'is_dml', False))):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+@contextmanager
+def use_primary():
+    """Send the reads made inside the block to the primary, e.g. to fill process-wide caches."""
+    read_replica = g.get('read_replica', False)
+    g.read_replica = False
+    try:
+        yield
+    finally:
+        g.read_replica = read_replica
+
+@tenacity.retry(stop=tenacity.stop_after_attempt(20), wait=tenacity.wait_fixed(5))
+def wait_for_db():
+    conn = psycopg2.connect(
+        dbname=os.getenv('DB_NAME', 'property_management'),
+        user=os.getenv('DB_USER', 'user'),
+        password=os.getenv('DB_PASSWORD', 'password'),
+        host=os.getenv('DB_HOST', 'db'),
+        port=os.getenv('DB_PORT', '5432')
+    )
+    conn.close()
+
+def dispose_engines(app):
+    """
+    Drop the pooled connections inherited from a parent process without closing them.
+
+    Called in each worker after fork so that connections opened before the
+    fork (e.g. while preloading the app) are never shared between processes;
+    ``close=False`` leaves the parent's sockets alone.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
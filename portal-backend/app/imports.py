@@ -0,0 +1,89 @@
+import csv
+import os
+import time
+from itertools import islice
+from sqlalchemy.exc import DBAPIError
+from .db import db
+from .bulk import bulk_insert, validate_items
+from .lookups import get_lookup
+from .versions import bump_version
+
+def lookup_ids(model):
+    """Map each casefolded description of a lookup ``model`` to its id."""
+    return {description.casefold(): id for id, description in get_lookup(model).items()}
+
+def record_payload(record, id_keys=(), lookups=None):
+    """
+    Turn a CSV record into the JSON payload the single-create validators expect.
+
+    Empty cells are dropped so they are reported as missing fields, numeric
+    ``id_keys`` are converted to integers, and ``lookups`` maps an id key to
+    ``(column, ids)``: when the id is absent, the description in ``column`` is
+    resolved through ``ids`` (see ``lookup_ids``). Raises ``ValueError`` on an
+    unknown description.
+    """
+    payload = {key: value for key, value in record.items() if key is not None and value not in (None, '')}
+    for key in id_keys:
+        if isinstance(payload.get(key), str) and payload[key].strip().isdigit():
+            payload[key] = int(payload[key])
+    for key, (column, ids) in (lookups or {}).items():
+        if key in payload or column not in payload:
+            continue
+        description = payload.pop(column)
+        if description.strip().casefold() not in ids:
+            raise ValueError(f'Unknown {column}: {description}')
+        payload[key] = ids[description.strip().casefold()]
+    return payload
+
+def import_csv(lines, model, validate, batch_size, rejected_file, check_batch=None):
+    """
+    Import the CSV rows read from ``lines`` into ``model``, committing every ``batch_size`` rows.
+
+    Only one batch is held in memory at a time. Each batch is validated with
+    ``validate_items`` and its valid rows inserted with ``bulk_insert`` in
+    their own transaction, so a failure never undoes earlier batches: a batch the
+    database refuses is rolled back and all its rows are rejected. Rejected
+    rows are written to ``rejected_file`` with their line number and error,
+    followed by the original columns. Yields running totals after every batch.
+    """
+    reader = csv.DictReader(lines)
+    writer = csv.writer(rejected_file)
+    writer.writerow(['line', 'error'] + (reader.fieldnames or []))
+    totals = {'processed': 0, 'imported': 0, 'rejected': 0}
+
+    while True:
+        batch = {}
+        for record in islice(reader, batch_size):
+            batch[reader.line_num] = record
+        if not batch:
+            return
+
+        rows, errors = validate_items(batch.items(), validate, check_batch)
+        if rows:
+            try:
+                bulk_insert(model, list(rows.values()))
+                bump_version(model)
+                db.session.commit()
+            except DBAPIError as e:
+                db.session.rollback()
+                errors.update({line: f'Failed to import: {str(e.orig)}' for line in rows})
+                rows = {}
+
+        for line in sorted(errors):
+            writer.writerow([line, errors[line]] + [batch[line].get(name, '') for name in reader.fieldnames])
+
+        totals['processed'] += len(batch)
+        totals['imported'] += len(rows)
+        totals['rejected'] += len(errors)
+        yield dict(totals)
+
+def remove_expired_files(directory, suffix, max_age):
+    """Delete the files in ``directory`` ending with ``suffix`` last modified more than ``max_age`` seconds ago."""
+    cutoff = time.time() - max_age
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffix) and entry.is_file() and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                # Another worker removed it first
+                pass
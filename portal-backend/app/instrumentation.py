@@ -0,0 +1,137 @@
+import threading
+import time
+from flask import current_app, g, has_request_context, request
+from flask.json.provider import JSONProvider
+from sqlalchemy import event
+from .db import db
+
+_lock = threading.Lock()
+_routes = {}
+
+class TimedJSONProvider(JSONProvider):
+    """Wraps the app's JSON provider to add the time spent encoding responses to the request's statistics."""
+
+    def __init__(self, app, provider):
+        super().__init__(app)
+        self.provider = provider
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats = _request_stats()
+            if stats is not None:
+                stats['serialize'] += time.perf_counter() - start
+
+    def dumps(self, obj, **kwargs):
+        return self._timed(self.provider.dumps, obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return self.provider.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        return self._timed(self.provider.response, *args, **kwargs)
+
+def _request_stats():
+    return g.get('sql_stats') if has_request_context() else None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    stats = _request_stats()
+    if stats is not None:
+        stats['queries'] += 1
+        stats['sql'] += elapsed
+        # Drivers report the rows a SELECT returned (psycopg2) or a write changed; -1 when unknown (SQLite SELECTs)
+        stats['rows'] += max(cursor.rowcount, 0)
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute: drop its start time so the next statement
+    # on this connection is not measured from it, and count the time it took before failing
+    starts = context.connection.info.get('query_start') if context.connection is not None else None
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _request_stats()
+    if stats is not None:
+        stats['queries'] += 1
+        stats['sql'] += elapsed
+
+def record_route(route, stats, total):
+    with _lock:
+        summary = _routes.setdefault(route, {
+            'requests': 0, 'totalSeconds': 0.0, 'maxSeconds': 0.0, 'sqlSeconds': 0.0,
+            'serializeSeconds': 0.0, 'queries': 0, 'maxQueries': 0, 'rows': 0
+        })
+        summary['requests'] += 1
+        summary['totalSeconds'] += total
+        summary['maxSeconds'] = max(summary['maxSeconds'], total)
+        summary['sqlSeconds'] += stats['sql']
+        summary['serializeSeconds'] += stats['serialize']
+        summary['queries'] += stats['queries']
+        summary['maxQueries'] = max(summary['maxQueries'], stats['queries'])
+        summary['rows'] += stats['rows']
+
+def route_summary():
+    """
+    Per-route totals for this process, slowest routes first.
+
+    Each entry adds the averages per request, so a route whose
+    ``avgQueries`` grows with the page size stands out as an N+1.
+    """
+    with _lock:
+        routes = [dict(summary, route=route) for route, summary in _routes.items()]
+    for summary in routes:
+        requests = summary['requests']
+        summary['avgSeconds'] = summary['totalSeconds'] / requests
+        summary['avgSqlSeconds'] = summary['sqlSeconds'] / requests
+        summary['avgQueries'] = summary['queries'] / requests
+    return sorted(routes, key=lambda summary: summary['totalSeconds'], reverse=True)
+
+def reset_route_summary():
+    with _lock:
+        _routes.clear()
+
+def server_timing(stats, total):
+    """``Server-Timing`` header value; durations are in milliseconds, ``compress`` only appears for compressed bodies."""
+    metrics = [f'db;dur={stats["sql"] * 1000:.2f};desc="{stats["queries"]} queries, {stats["rows"]} rows"',
+               f'serialize;dur={stats["serialize"] * 1000:.2f}']
+    if 'compress' in stats:
+        metrics.append(f'compress;dur={stats["compress"] * 1000:.2f}')
+    return ', '.join(metrics + [f'total;dur={total * 1000:.2f}'])
+
+def init_instrumentation(app):
+    """
+    Measure the SQL and JSON encoding time of every request.
+
+    Engine events count the queries, their time and the rows they returned
+    while a request is active. The totals are sent in a ``Server-Timing``
+    header (unless ``SERVER_TIMING`` is off) and added to the per-route
+    summary served by ``/admin/routes``. Streamed bodies are produced after
+    the response is started, so only the work done before it is counted.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _handle_error)
+    app.json = TimedJSONProvider(app, app.json)
+
+    @app.before_request
+    def start_request_stats():
+        g.sql_stats = {'queries': 0, 'sql': 0.0, 'serialize': 0.0, 'rows': 0, 'start': time.perf_counter()}
+
+    @app.after_request
+    def finish_request_stats(response):
+        stats = g.pop('sql_stats', None)
+        if stats is None:
+            return response
+        total = time.perf_counter() - stats['start']
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        record_route(f'{request.method} {route}', stats, total)
+        if current_app.config['SERVER_TIMING']:
+            response.headers['Server-Timing'] = server_timing(stats, total)
+        return response
@@ -0,0 +1,38 @@
+from bisect import bisect_right
+from collections import defaultdict
+
+def find_overlaps(existing, candidates):
+    """
+    Return the indexes of ``candidates`` that overlap another interval.
+
+    Both arguments are iterables of ``(key, start, end)`` tuples with inclusive
+    bounds; ``candidates`` is indexed by position. Intervals only conflict
+    within the same key. A candidate conflicts when it overlaps an interval in
+    ``existing`` (which must not overlap each other), or a candidate that
+    starts earlier and was itself accepted. Each key is sorted once, so the
+    whole check is ``O(n log n)``.
+    """
+    stored = defaultdict(list)
+    for key, start, end in existing:
+        stored[key].append((start, end))
+
+    pending = defaultdict(list)
+    for index, (key, start, end) in enumerate(candidates):
+        pending[key].append((start, end, index))
+
+    conflicts = set()
+    for key, intervals in pending.items():
+        # Stored intervals are disjoint, so sorted by start their ends are increasing
+        # too and the last one starting before a candidate ends is the only one to test
+        taken = sorted(stored.get(key, ()))
+        starts = [start for start, _ in taken]
+        latest_end = None
+        for start, end, index in sorted(intervals):
+            position = bisect_right(starts, end)
+            if position and taken[position - 1][1] >= start:
+                conflicts.add(index)
+            elif latest_end is not None and start <= latest_end:
+                conflicts.add(index)
+            else:
+                latest_end = end if latest_end is None else max(latest_end, end)
+    return conflicts
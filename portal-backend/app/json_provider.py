@@ -0,0 +1,69 @@
+from datetime import date
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value):
+    """Encode the column types the models return: ``Decimal`` as a number, ``date`` and ``datetime`` in ISO 8601."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Flask's provider, encoding dates in ISO 8601 and ``Decimal`` as numbers like ``OrjsonProvider``.
+
+    Rows can therefore be passed to ``jsonify`` as they come from the
+    database, whichever provider is active.
+    """
+    default = staticmethod(_default)
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson.
+
+    orjson encodes dicts, lists, strings, numbers, dates and datetimes in C,
+    writing dates in ISO 8601 itself; only ``Decimal`` goes through
+    ``_default``. Keys are sorted like Flask's provider, so both produce the
+    same documents. Responses are built from the encoded bytes directly.
+    """
+    sort_keys = True
+    mimetype = 'application/json'
+
+    def _options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self._options(kwargs.get('indent'))).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options(self._app.debug) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json(app):
+    """
+    Install the JSON provider named by ``JSON_PROVIDER``.
+
+    ``orjson`` (the default) needs the orjson package and falls back to
+    ``StdlibJSONProvider`` when it is not installed; ``stdlib`` always uses the
+    latter. Must run before ``init_instrumentation``, which wraps the provider.
+    """
+    if app.config['JSON_PROVIDER'] == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = StdlibJSONProvider(app)
@@ -0,0 +1,102 @@
+import threading
+from flask import g, has_request_context
+from sqlalchemy import select
+from .db import db, use_primary
+from .models import MaintenanceStatus, PaymentStatus, PropertyStatus, PropertyType
+from .versions import versions_statement
+
+LOOKUP_TABLES = sorted(model.__tablename__ for model in (PropertyStatus, PropertyType, PaymentStatus, MaintenanceStatus))
+
+# Process-local cache of the lookup tables (PropertyStatus, PropertyType,
+# PaymentStatus, MaintenanceStatus), keyed by model. Each entry maps id to
+# description and is stored with the table's ``table_versions`` version when
+# it was loaded. Every worker compares that version with the current one, at
+# most once per request, and reloads the entry when another process bumped
+# it; the status blueprints also invalidate the entry after each committed
+# write.
+_lock = threading.Lock()
+_entries = {}
+_generations = {}
+
+def get_lookup(model):
+    """Return ``{id: description}`` for a lookup ``model``, ordered by id."""
+    # Read from the primary: a lagging replica could otherwise pin stale rows until the next write
+    with use_primary():
+        version = _current_versions().get(model.__tablename__, 0)
+        cached = _entries.get(model)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        generation = _generation(model)
+        entries = dict(db.session.execute(_lookup_statement(model)).all())
+    return _publish(model, generation, version, entries)
+
+async def get_lookup_async(session, model):
+    """``get_lookup`` for the async read path, loading through an ``AsyncSession`` and sharing the same cache."""
+    versions = dict((await session.execute(versions_statement([model.__tablename__]))).all())
+    version = versions.get(model.__tablename__, 0)
+    cached = _entries.get(model)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    generation = _generation(model)
+    entries = dict((await session.execute(_lookup_statement(model))).all())
+    return _publish(model, generation, version, entries)
+
+def _current_versions():
+    """
+    ``{table: version}`` of the lookup tables, read in one query.
+
+    Within a request the versions are read once and kept on ``g``, so the
+    lookups a view resolves row by row cost a single primary-key lookup.
+    The version is read before the rows it is stored with, so a concurrent
+    write can only make an entry look older than it is.
+    """
+    if has_request_context() and 'lookup_versions' in g:
+        return g.lookup_versions
+    versions = dict(db.session.execute(versions_statement(LOOKUP_TABLES)).all())
+    if has_request_context():
+        g.lookup_versions = versions
+    return versions
+
+def _lookup_statement(model):
+    id_column = model.__mapper__.primary_key[0]
+    return select(id_column, model.description).order_by(id_column)
+
+def _generation(model):
+    with _lock:
+        return _generations.get(model, 0)
+
+def init_lookups(app):
+    """Forget the lookup versions read by the previous request, even when the app context outlives it."""
+    @app.before_request
+    def reset_lookup_versions():
+        g.pop('lookup_versions', None)
+
+def _publish(model, generation, version, entries):
+    # Only publish the entry if no write invalidated the table while it was loading
+    with _lock:
+        if _generations.get(model, 0) == generation:
+            _entries[model] = (version, entries)
+    return entries
+
+def invalidate_lookup(model):
+    with _lock:
+        _entries.pop(model, None)
+        _generations[model] = _generations.get(model, 0) + 1
+    if has_request_context():
+        g.pop('lookup_versions', None)
+
+def clear_lookups():
+    with _lock:
+        for model in list(_entries):
+            _generations[model] = _generations.get(model, 0) + 1
+        _entries.clear()
+
+def match_lookup_ids(model, search):
+    """Return the ids whose description contains ``search``, ignoring case."""
+    return match_ids(get_lookup(model), search)
+
+def match_ids(entries, search):
+    search = search.casefold()
+    return [id for id, description in entries.items() if search in description.casefold()]
@@ -0,0 +1,94 @@
+import os
+import re
+from sqlalchemy import text
+from .db import db
+from .models.lease import LEASE_OVERLAP_TRIGGERS
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# An interrupted CREATE INDEX CONCURRENTLY leaves an invalid index behind, which IF NOT EXISTS would keep
+CONCURRENT_INDEX = re.compile(r'^CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)', re.IGNORECASE)
+INVALID_INDEX = text('SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)')
+
+CREATE_MIGRATIONS_TABLE = text(
+    'CREATE TABLE IF NOT EXISTS schema_migrations ('
+    'Version INTEGER PRIMARY KEY, Name VARCHAR(100) NOT NULL, AppliedAt TIMESTAMPTZ NOT NULL DEFAULT now())'
+)
+
+def migration_files(directory=MIGRATIONS_DIR):
+    """``(version, name, path)`` of the ``NNNN_name.sql`` files in ``directory``, oldest first."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return sorted(migrations)
+
+def split_statements(sql):
+    """
+    The statements of a migration file, without ``--`` comments; statements end with ``;``.
+
+    Semicolons inside ``$$``-quoted bodies, such as ``DO`` blocks, do not end
+    the statement.
+    """
+    lines = [line.split('--', 1)[0] for line in sql.splitlines()]
+    statements, current = [], ''
+    for i, part in enumerate('\n'.join(lines).split('$$')):
+        if i % 2:
+            current += f'$${part}$$'
+            continue
+        first, *rest = part.split(';')
+        current += first
+        for piece in rest:
+            statements.append(current)
+            current = piece
+    statements.append(current)
+    return [statement.strip() for statement in statements if statement.strip()]
+
+def concurrent_index(statement):
+    """Name of the index a ``CREATE INDEX CONCURRENTLY IF NOT EXISTS`` statement builds, else ``None``."""
+    match = CONCURRENT_INDEX.match(statement)
+    return match.group(1) if match else None
+
+def migrate(directory=MIGRATIONS_DIR):
+    """
+    Apply the pending PostgreSQL migrations of ``directory`` and return their ``(version, name)``.
+
+    init-db.sql is the baseline schema; each file in ``migrations/`` is
+    applied once, in version order, and recorded in ``schema_migrations``.
+    Statements run in autocommit mode so ``CREATE INDEX CONCURRENTLY`` can
+    be used, and the version is recorded only after the whole file succeeded,
+    so migrations must be idempotent. A concurrent index build left invalid
+    by an interrupted run is dropped before the index is created again. Other databases get their schema from
+    the models, so there the missing model tables, indexes and lease overlap
+    triggers are created instead.
+    """
+    engine = db.engine
+    if engine.dialect.name != 'postgresql':
+        db.metadata.create_all(engine)
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            for trigger in LEASE_OVERLAP_TRIGGERS:
+                connection.execute(trigger)
+        return []
+
+    applied = []
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.execute(CREATE_MIGRATIONS_TABLE)
+        done = set(connection.execute(text('SELECT Version FROM schema_migrations')).scalars())
+        for version, name, path in migration_files(directory):
+            if version in done:
+                continue
+            with open(path) as f:
+                for statement in split_statements(f.read()):
+                    index = concurrent_index(statement)
+                    if index and connection.execute(INVALID_INDEX, {'name': index}).scalar():
+                        connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index}'))
+                    connection.execute(text(statement))
+            connection.execute(text('INSERT INTO schema_migrations (Version, Name) VALUES (:version, :name)'),
+                               {'version': version, 'name': name})
+            applied.append((version, name))
+    return applied
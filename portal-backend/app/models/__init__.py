@@ -5,4 +5,5 @@ from .payment_status import PaymentStatus
 from .property import Property
 from .tenant import Tenant
 from .lease import Lease
-from .maintenance import Maintenance
\ No newline at end of file
+from .maintenance import Maintenance
+from .table_version import TableVersion
\ No newline at end of file
@@ -1,8 +1,21 @@
+from sqlalchemy import DDL, event
 from ..db import db
 from datetime import date
 
+# Name of the constraint rejecting overlapping lease terms on the same property:
+# a daterange exclusion constraint on PostgreSQL (init-db.sql, and
+# migrations/0006_leases_no_overlap.sql for older databases), triggers on SQLite.
+LEASE_OVERLAP_CONSTRAINT = 'leases_no_overlap'
+
 class Lease(db.Model):
     __tablename__ = 'leases'
+    __table_args__ = (
+        db.Index('idx_leases_property_term', 'propertyid', 'leasetermstart', 'leasetermend'),
+        db.Index('idx_leases_tenantid', 'tenantid'),
+        db.Index('idx_leases_paymentstatusid', 'paymentstatusid'),
+        db.Index('idx_leases_start_id', 'leasetermstart', 'leaseid'),
+        db.Index('idx_leases_end_id', 'leasetermend', 'leaseid'),
+    )
 
     leaseid = db.Column(db.Integer, primary_key=True)
     tenantid = db.Column(db.Integer, db.ForeignKey('tenants.tenantid'), nullable=False)
@@ -13,3 +26,21 @@ class Lease(db.Model):
 
     def __repr__(self):
         return f"<Lease {self.leaseid}>"
+
+_overlapping = (
+    "EXISTS (SELECT 1 FROM leases WHERE propertyid = NEW.propertyid "
+    "AND leasetermstart <= NEW.leasetermend AND leasetermend >= NEW.leasetermstart{exclude})"
+)
+
+# Also run by migrations.migrate on existing SQLite databases, hence IF NOT EXISTS
+LEASE_OVERLAP_TRIGGERS = [
+    DDL(
+        f"CREATE TRIGGER IF NOT EXISTS {LEASE_OVERLAP_CONSTRAINT}_{event_name.lower()} BEFORE {event_name} ON leases "
+        f"WHEN {_overlapping.format(exclude=exclude)} "
+        f"BEGIN SELECT RAISE(ABORT, '{LEASE_OVERLAP_CONSTRAINT}'); END"
+    ).execute_if(dialect='sqlite')
+    for event_name, exclude in (('INSERT', ''), ('UPDATE', ' AND leaseid != OLD.leaseid'))
+]
+
+for trigger in LEASE_OVERLAP_TRIGGERS:
+    event.listen(Lease.__table__, 'after_create', trigger)
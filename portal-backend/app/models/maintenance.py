@@ -3,6 +3,11 @@ from datetime import date
 
 class Maintenance(db.Model):
     __tablename__ = 'maintenance'
+    __table_args__ = (
+        db.Index('idx_maintenance_property_scheduled', 'propertyid', 'scheduleddate', 'taskid'),
+        db.Index('idx_maintenance_maintenancestatusid', 'maintenancestatusid'),
+        db.Index('idx_maintenance_scheduleddate_id', 'scheduleddate', 'taskid'),
+    )
 
     taskid = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.Text, nullable=False)
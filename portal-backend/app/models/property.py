@@ -3,6 +3,12 @@ from datetime import date
 
 class Property(db.Model):
     __tablename__ = 'properties'
+    __table_args__ = (
+        db.Index('idx_properties_propertytypeid', 'propertytypeid'),
+        db.Index('idx_properties_propertystatusid', 'propertystatusid'),
+        db.Index('idx_properties_price_id', 'price', 'propertyid'),
+        db.Index('idx_properties_purchasedate_id', 'purchasedate', 'propertyid'),
+    )
 
     propertyid = db.Column(db.Integer, primary_key=True)
     address = db.Column(db.String(255), nullable=False)
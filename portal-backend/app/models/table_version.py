@@ -0,0 +1,10 @@
+from ..db import db
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    tablename = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion {self.tablename}={self.version}>"
@@ -1,7 +1,11 @@
+from sqlalchemy import DDL, event
 from ..db import db
 
 class Tenant(db.Model):
     __tablename__ = 'tenants'
+    __table_args__ = (
+        db.Index('idx_tenants_name_id', 'name', 'tenantid'),
+    )
 
     tenantid = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -10,4 +14,25 @@ class Tenant(db.Model):
     leases = db.relationship('Lease', backref='tenant', lazy=True)
 
     def __repr__(self):
-        return f"<Tenant {self.name}>"
\ No newline at end of file
+        return f"<Tenant {self.name}>"
+
+# SQLite counterpart of the pg_trgm GIN indexes of migrations/0005_tenant_search.sql: a
+# contentless FTS5 trigram index kept in sync by triggers. Words are padded
+# with blanks, as pg_trgm does, so word starts and ends are indexed too.
+_padded = "' ' || replace({row}.name, ' ', '  ') || ' ', ' ' || {row}.contactinfo || ' '"
+
+for statement in (
+    "CREATE VIRTUAL TABLE tenants_fts USING fts5(name, contactinfo, content='', tokenize='trigram')",
+    "CREATE TRIGGER tenants_fts_insert AFTER INSERT ON tenants BEGIN "
+    f"INSERT INTO tenants_fts(rowid, name, contactinfo) VALUES (new.tenantid, {_padded.format(row='new')}); END",
+    "CREATE TRIGGER tenants_fts_delete AFTER DELETE ON tenants BEGIN "
+    "INSERT INTO tenants_fts(tenants_fts, rowid, name, contactinfo) "
+    f"VALUES ('delete', old.tenantid, {_padded.format(row='old')}); END",
+    "CREATE TRIGGER tenants_fts_update AFTER UPDATE ON tenants BEGIN "
+    "INSERT INTO tenants_fts(tenants_fts, rowid, name, contactinfo) "
+    f"VALUES ('delete', old.tenantid, {_padded.format(row='old')}); "
+    f"INSERT INTO tenants_fts(rowid, name, contactinfo) VALUES (new.tenantid, {_padded.format(row='new')}); END",
+):
+    event.listen(Tenant.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+event.listen(Tenant.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS tenants_fts').execute_if(dialect='sqlite'))
@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+import numpy as np
+from sqlalchemy import case, func, literal, select, union_all
+from .db import db
+from .lookups import match_lookup_ids
+from .models import Lease, Property, PropertyType, PropertyStatus
+
+RESOLUTIONS = ('daily', 'weekly', 'monthly')
+MAX_DAYS = 366 * 30
+DEFAULT_DAYS = 365
+
+def parse_window(start, end, today=None):
+    """
+    Inclusive ``(first, last)`` dates of an occupancy window from the ``from``/``to`` parameters.
+
+    ``to`` defaults to today and ``from`` to a year before ``to``. Raises
+    ``ValueError`` on invalid input.
+    """
+    try:
+        last = date.fromisoformat(end) if end else today or date.today()
+        first = date.fromisoformat(start) if start else last - timedelta(days=DEFAULT_DAYS)
+    except ValueError:
+        raise ValueError('from and to must be in YYYY-MM-DD format')
+    if first > last:
+        raise ValueError('from must not be after to')
+    if (last - first).days >= MAX_DAYS:
+        raise ValueError(f'The window cannot exceed {MAX_DAYS} days')
+    return first, last
+
+def _day_counts(starts, ends, first, days):
+    """
+    Number of intervals covering each of the ``days`` days from ``first``.
+
+    ``starts`` and ``ends`` are ``(dates, counts)`` pairs: how many intervals
+    start, or end, on each date, bounds included. A sweep line: each start
+    adds +1 on its day and each end -1 on the day after, and the running sum
+    of these deltas is the count per day. Events outside the window are moved
+    to its edges, where those of intervals entirely before it cancel out and
+    those after it fall beyond the last day.
+    """
+    (start_dates, start_counts), (end_dates, end_counts) = starts, ends
+    start_days = np.clip((start_dates - first).astype(np.int64), 0, days)
+    end_days = np.clip((end_dates - first).astype(np.int64) + 1, 0, days)
+    deltas = np.bincount(start_days, start_counts, minlength=days + 1)
+    deltas -= np.bincount(end_days, end_counts, minlength=days + 1)
+    return np.cumsum(deltas[:days])
+
+def _bucket_starts(days, resolution):
+    """Index of the first day of each bucket of ``days``, which are consecutive."""
+    if resolution == 'daily':
+        return np.arange(len(days))
+    if resolution == 'weekly':
+        # Weeks start on Monday; 1970-01-01, day 0, was a Thursday
+        ordinals = days.astype(np.int64)
+        keys = ordinals - (ordinals + 3) % 7
+    else:
+        keys = days.astype('datetime64[M]')
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+def occupancy_series(lease_starts, lease_ends, purchases, first, last, resolution='daily'):
+    """
+    Occupancy of a portfolio per day, week or month between ``first`` and ``last`` inclusive.
+
+    Each argument is a ``(dates, counts)`` pair of ``datetime64[D]`` dates
+    and how many events fall on each: the leases starting and ending then
+    and the properties purchased then. Leases of a property never overlap (the
+    ``leases_no_overlap`` constraint), so the leases covering a day are its
+    occupied properties, and the properties purchased by then are the ones
+    owned. Lease starts must not precede their property's purchase, or
+    ``rate`` can exceed 1. Both counts are sweep lines over the window, so the cost grows
+    with the number of distinct dates plus the number of days, not their
+    product. Weeks and months report the average counts of their days
+    within the window.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f'resolution must be one of {", ".join(RESOLUTIONS)}')
+    first, last = np.datetime64(first, 'D'), np.datetime64(last, 'D')
+    days = int((last - first).astype(np.int64)) + 1
+    occupied = _day_counts(lease_starts, lease_ends, first, days)
+    # Properties stay owned once purchased: intervals with no end
+    owned = _day_counts(purchases, (np.empty(0, dtype='datetime64[D]'), np.empty(0)), first, days)
+
+    day_dates = first + np.arange(days).astype('timedelta64[D]')
+    starts = _bucket_starts(day_dates, resolution)
+    lengths = np.diff(np.r_[starts, days])
+    occupied_days, owned_days = np.add.reduceat(occupied, starts), np.add.reduceat(owned, starts)
+    rates = np.divide(occupied_days, owned_days, out=np.zeros(len(starts)), where=owned_days > 0)
+
+    return [
+        {'date': str(day), 'days': length, 'occupied': round(occupied_sum / length, 2),
+         'properties': round(owned_sum / length, 2), 'rate': round(rate, 4)}
+        for day, length, occupied_sum, owned_sum, rate in zip(
+            day_dates[starts].tolist(), lengths.tolist(), occupied_days.tolist(), owned_days.tolist(), rates.tolist())
+    ]
+
+def _property_filters(type_filter=None, status_filter=None):
+    filters = []
+    if type_filter:
+        filters.append(Property.propertytypeid.in_(match_lookup_ids(PropertyType, type_filter)))
+    if status_filter:
+        filters.append(Property.propertystatusid.in_(match_lookup_ids(PropertyStatus, status_filter)))
+    return filters
+
+def _events(rows, kind):
+    """``(dates, counts)`` arrays of the ``(kind, date, count)`` rows of one kind."""
+    rows = [(day, count) for row_kind, day, count in rows if row_kind == kind]
+    return (np.array([day for day, _ in rows], dtype='datetime64[D]'),
+            np.array([count for _, count in rows], dtype=np.float64))
+
+def portfolio_occupancy(first, last, resolution='daily', type_filter=None, status_filter=None):
+    """
+    ``occupancy_series`` of the properties matching the ``type``/``status`` filters, like ``/properties/``.
+
+    One query counts the leases overlapping the window per start date and
+    per end date, and the properties bought by its end per purchase date.
+    Leases are counted from their property's purchase date at the earliest,
+    so occupied days never exceed owned days and ``rate`` stays within 0..1.
+    The database aggregates the lease rows, so only a few thousand dated
+    counts reach Python however many leases there are.
+    """
+    filters = _property_filters(type_filter, status_filter)
+    # A property only counts from its purchase: the part of a lease before it is ignored
+    start = case((Lease.leasetermstart < Property.purchasedate, Property.purchasedate), else_=Lease.leasetermstart)
+    leases = select(start.label('leasetermstart'), Lease.leasetermend).join(Property) \
+        .where(Lease.leasetermend >= first, Lease.leasetermstart <= last,
+               Lease.leasetermend >= Property.purchasedate, *filters) \
+        .cte('window_leases')
+    rows = db.session.execute(union_all(
+        select(literal('start'), leases.c.leasetermstart, func.count()).group_by(leases.c.leasetermstart),
+        select(literal('end'), leases.c.leasetermend, func.count()).group_by(leases.c.leasetermend),
+        select(literal('purchase'), Property.purchasedate, func.count())
+        .where(Property.purchasedate <= last, *filters).group_by(Property.purchasedate)
+    )).all()
+    return occupancy_series(_events(rows, 'start'), _events(rows, 'end'), _events(rows, 'purchase'),
+                            first, last, resolution)
@@ -0,0 +1,88 @@
+import threading
+import time
+from flask import current_app, g, request
+from sqlalchemy import text
+from .db import REPLICA_BIND, db
+
+PRIMARY_COOKIE = 'primary_until'
+READ_METHODS = ('GET', 'HEAD')
+
+# Seconds the replica is behind the primary; zero when it has replayed everything it received,
+# so an idle primary does not look like lag
+LAG_STATEMENT = text(
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+)
+
+_lock = threading.Lock()
+_lag = {'checked_at': None, 'seconds': 0.0}
+
+def is_sticky(cookies, now=None):
+    """Whether the client wrote recently enough that its reads must still see the primary."""
+    try:
+        return float(cookies.get(PRIMARY_COOKIE, 0)) > (now or time.time())
+    except ValueError:
+        return False
+
+def cached_lag(check_interval):
+    """The last measured replica lag, or ``None`` when it is older than ``check_interval`` seconds."""
+    with _lock:
+        if _lag['checked_at'] is None or time.monotonic() - _lag['checked_at'] > check_interval:
+            return None
+        return _lag['seconds']
+
+def record_lag(seconds):
+    with _lock:
+        _lag['checked_at'] = time.monotonic()
+        _lag['seconds'] = seconds
+    return seconds
+
+def reset_lag():
+    with _lock:
+        _lag['checked_at'] = None
+        _lag['seconds'] = 0.0
+
+def replica_lag():
+    """
+    Replication lag of the read replica in seconds, measured at most once per ``REPLICA_LAG_CHECK_SECONDS``.
+
+    Only PostgreSQL replicas report lag; an unreachable replica counts as
+    infinitely behind so reads fall back to the primary.
+    """
+    lag = cached_lag(current_app.config['REPLICA_LAG_CHECK_SECONDS'])
+    if lag is not None:
+        return lag
+
+    engine = db.engines[REPLICA_BIND]
+    if engine.dialect.name != 'postgresql':
+        return record_lag(0.0)
+    try:
+        with engine.connect() as connection:
+            return record_lag(float(connection.execute(LAG_STATEMENT).scalar() or 0.0))
+    except Exception:
+        return record_lag(float('inf'))
+
+def init_replica_routing(app):
+    """
+    Route the reads of GET requests to the ``replica`` bind, when one is configured.
+
+    A request stays on the primary when the client wrote within the last
+    ``REPLICA_STICKY_SECONDS`` (tracked with the ``primary_until`` cookie set on
+    every successful write), so it always reads its own writes, or when the
+    replica lags more than ``REPLICA_MAX_LAG_SECONDS``.
+    """
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    @app.before_request
+    def choose_database():
+        g.read_replica = (request.method in READ_METHODS and not is_sticky(request.cookies)
+                          and replica_lag() <= current_app.config['REPLICA_MAX_LAG_SECONDS'])
+
+    @app.after_request
+    def stick_to_primary(response):
+        if request.method not in READ_METHODS + ('OPTIONS',) and response.status_code < 400:
+            sticky_seconds = current_app.config['REPLICA_STICKY_SECONDS']
+            response.set_cookie(PRIMARY_COOKIE, str(time.time() + sticky_seconds), max_age=sticky_seconds,
+                                httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,68 @@
+import re
+from sqlalchemy import func, text
+from .db import db
+from .models import Tenant
+
+SEARCH_THRESHOLD = 0.3
+MAX_SEARCH_LIMIT = 100
+SQLITE_CANDIDATE_FACTOR = 10
+
+def trigrams(value):
+    """Trigram set of ``value`` the way pg_trgm builds it: per lowercase word, padded with two leading and one trailing blank."""
+    result = set()
+    for word in re.findall(r'\w+', value.lower()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+def word_similarity(query, value):
+    """Share of the query's trigrams found in ``value``, close to pg_trgm's word_similarity()."""
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return 0.0
+    return len(query_trigrams & trigrams(value)) / len(query_trigrams)
+
+def search_tenants(query, limit, threshold=SEARCH_THRESHOLD):
+    """
+    Return up to ``limit`` ``(tenantid, name, contactinfo, score)`` tuples ranked by similarity to ``query``.
+
+    On PostgreSQL the ``%>`` word-similarity operator is answered by the pg_trgm
+    GIN indexes on name and contact info, so misspelt queries still match and
+    no row outside the index hits is read. On SQLite the FTS5 trigram index
+    supplies candidates sharing any trigram with the query, which are then
+    scored in Python with the same measure.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        score = func.greatest(func.word_similarity(query, Tenant.name), func.word_similarity(query, Tenant.contactinfo))
+        db.session.execute(text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+                           {'threshold': str(threshold)})
+        return db.session.query(Tenant.tenantid, Tenant.name, Tenant.contactinfo, score.label('score')) \
+            .filter(Tenant.name.op('%>')(query) | Tenant.contactinfo.op('%>')(query)) \
+            .order_by(score.desc(), Tenant.tenantid) \
+            .limit(limit).all()
+
+    candidates = _sqlite_candidates(query, limit * SQLITE_CANDIDATE_FACTOR)
+    if not candidates:
+        return []
+    rows = db.session.query(Tenant.tenantid, Tenant.name, Tenant.contactinfo) \
+        .filter(Tenant.tenantid.in_(candidates)).all()
+    scored = [
+        (row.tenantid, row.name, row.contactinfo, max(word_similarity(query, row.name), word_similarity(query, row.contactinfo)))
+        for row in rows
+    ]
+    scored = [row for row in scored if row[3] >= threshold]
+    scored.sort(key=lambda row: (-row[3], row[0]))
+    return scored[:limit]
+
+def _sqlite_candidates(query, limit):
+    # Pad the query the same way the tenants_fts triggers pad the indexed values
+    padded = ' ' + '  '.join(re.findall(r'\S+', query.lower())) + ' '
+    grams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    if not grams:
+        return []
+    expression = ' OR '.join('"{}"'.format(gram.replace('"', '""')) for gram in grams)
+    rows = db.session.execute(
+        text('SELECT rowid FROM tenants_fts WHERE tenants_fts MATCH :expression ORDER BY bm25(tenants_fts) LIMIT :limit'),
+        {'expression': expression, 'limit': limit}
+    )
+    return [row[0] for row in rows]
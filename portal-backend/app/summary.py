@@ -0,0 +1,141 @@
+import threading
+import time
+from datetime import date
+from sqlalchemy import and_, case, func, literal, null, select, text, union_all
+from .db import db, use_primary
+from .lookups import get_lookup
+from .models import (Lease, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance,
+                     MaintenanceStatus, TableVersion)
+
+SUMMARY_VIEW = 'portfolio_summary'
+SUMMARY_TABLES = ('properties', 'leases', 'maintenance')
+
+_lock = threading.Lock()
+_refresh = {'at': None, 'versions': None}
+
+def summary_statement(today):
+    """
+    One statement computing every dashboard aggregate as ``(kind, key1, key2, count, total)`` rows.
+
+    Properties are grouped by status and type with their value, leases by
+    payment status and whether they are active on ``today``, maintenance tasks
+    by status. ``migrations/0002_portfolio_summary.sql`` defines the
+    materialized view with the same query.
+    """
+    # Grouped through a subquery: PostgreSQL cannot match a bound date in the GROUP BY to the one in the SELECT
+    leases = select(Lease.paymentstatusid, case((and_(Lease.leasetermstart <= today, Lease.leasetermend >= today), 1),
+                                                else_=0).label('active')).subquery()
+    return union_all(
+        select(literal('properties').label('kind'), Property.propertystatusid.label('key1'),
+               Property.propertytypeid.label('key2'), func.count().label('count'), func.sum(Property.price).label('total'))
+        .group_by(Property.propertystatusid, Property.propertytypeid),
+        select(literal('leases'), leases.c.paymentstatusid, leases.c.active, func.count(), null())
+        .group_by(leases.c.paymentstatusid, leases.c.active),
+        select(literal('maintenance'), Maintenance.maintenancestatusid, literal(0), func.count(), null())
+        .group_by(Maintenance.maintenancestatusid)
+    )
+
+def _description(model, id):
+    return get_lookup(model).get(id, str(id))
+
+def _ids_named(model, description):
+    return {id for id, name in get_lookup(model).items() if name.casefold() == description}
+
+def summarize(rows, as_of):
+    """Dashboard counts from the rows of ``summary_statement`` or the materialized view."""
+    properties = {'total': 0, 'totalValue': 0.0, 'byStatus': {}, 'byType': {}, 'valueByType': {}}
+    leases = {'total': 0, 'active': 0, 'overdue': 0, 'activeOverdue': 0, 'byPaymentStatus': {}}
+    maintenance = {'total': 0, 'open': 0, 'byStatus': {}}
+    overdue = _ids_named(PaymentStatus, 'overdue')
+    completed = _ids_named(MaintenanceStatus, 'completed')
+
+    for kind, key1, key2, count, total in rows:
+        if kind == 'properties':
+            status, type_ = _description(PropertyStatus, key1), _description(PropertyType, key2)
+            value = float(total or 0)
+            properties['total'] += count
+            properties['totalValue'] += value
+            properties['byStatus'][status] = properties['byStatus'].get(status, 0) + count
+            properties['byType'][type_] = properties['byType'].get(type_, 0) + count
+            properties['valueByType'][type_] = properties['valueByType'].get(type_, 0.0) + value
+        elif kind == 'leases':
+            status = _description(PaymentStatus, key1)
+            leases['total'] += count
+            leases['active'] += count if key2 else 0
+            leases['overdue'] += count if key1 in overdue else 0
+            leases['activeOverdue'] += count if key2 and key1 in overdue else 0
+            leases['byPaymentStatus'][status] = leases['byPaymentStatus'].get(status, 0) + count
+        else:
+            maintenance['total'] += count
+            maintenance['open'] += 0 if key1 in completed else count
+            maintenance['byStatus'][_description(MaintenanceStatus, key1)] = count
+
+    properties['totalValue'] = round(properties['totalValue'], 2)
+    return {'asOf': as_of.isoformat(), 'properties': properties, 'leases': leases, 'maintenance': maintenance}
+
+def _table_versions():
+    return dict(db.session.execute(
+        select(TableVersion.tablename, TableVersion.version).where(TableVersion.tablename.in_(SUMMARY_TABLES))
+    ).all())
+
+def view_needs_refresh(as_of, today, recent, changed):
+    """
+    Whether a view computed on ``as_of`` must be refreshed on ``today``.
+
+    A view computed on an earlier day is always refreshed, since the active
+    lease count depends on the date. An empty view (``as_of`` is ``None``)
+    has no date, so it is treated like a current view. Otherwise the view is
+    refreshed when the summarized tables ``changed``, unless it was refreshed
+    ``recent``ly.
+    """
+    if as_of is not None and as_of != today:
+        return True
+    return changed and not recent
+
+def refresh_summary_view(min_interval):
+    """
+    Refresh the materialized view when it is out of date, at most once per ``min_interval`` seconds.
+
+    The view is out of date when it was computed on an earlier day by the
+    database's clock, or when one of the summarized tables changed since
+    this process last refreshed it (see ``view_needs_refresh``).
+    ``CONCURRENTLY`` keeps the view readable during the refresh, and
+    concurrent workers refreshing at once only repeat the work.
+    """
+    as_of, today = db.session.execute(text(f'SELECT (SELECT max(as_of) FROM {SUMMARY_VIEW}), CURRENT_DATE')).one()
+    versions = _table_versions()
+    with _lock:
+        recent = _refresh['at'] is not None and time.monotonic() - _refresh['at'] < min_interval
+        changed = versions != _refresh['versions']
+    if not view_needs_refresh(as_of, today, recent, changed):
+        return today
+
+    db.session.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {SUMMARY_VIEW}'))
+    db.session.commit()
+    with _lock:
+        _refresh['at'] = time.monotonic()
+        _refresh['versions'] = versions
+    return today
+
+def portfolio_summary(materialized=False, min_refresh_interval=60):
+    """
+    Dashboard summary of the whole portfolio.
+
+    Computed live with ``summary_statement``, or on PostgreSQL with
+    ``materialized`` read from the ``portfolio_summary`` view, refreshed by
+    ``refresh_summary_view`` first when needed.
+    """
+    if materialized and db.engine.dialect.name == 'postgresql':
+        # The refresh writes, so it runs on the primary; the view itself replicates like any table
+        with use_primary():
+            as_of = refresh_summary_view(min_refresh_interval)
+        rows = db.session.execute(text(f'SELECT kind, key1, key2, count, total FROM {SUMMARY_VIEW}')).all()
+        return dict(summarize(rows, as_of), source='materializedView')
+
+    today = date.today()
+    return dict(summarize(db.session.execute(summary_statement(today)).all(), today), source='live')
+
+def reset_summary_refresh():
+    with _lock:
+        _refresh['at'] = None
+        _refresh['versions'] = None
@@ -0,0 +1,203 @@
+import csv
+import io
+from datetime import date
+import numpy as np
+from sqlalchemy import func, insert, text
+from .db import db
+from .models import (Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus,
+                     Maintenance, MaintenanceStatus)
+from .versions import bump_version
+
+# The lookup rows of init-db.sql, created when missing so the generator also works on an empty schema
+LOOKUPS = {
+    PropertyStatus: ('Vacant', 'Occupied', 'Under Maintenance'),
+    MaintenanceStatus: ('Completed', 'In Progress', 'Pending'),
+    PaymentStatus: ('Paid', 'Pending', 'Overdue'),
+    PropertyType: ('Residential', 'Commercial', 'Other')
+}
+
+STREETS = np.array(['Rue des Lilas', 'Avenue Foch', 'Quai de Grenelle', 'Boulevard Haussmann', 'Rue de la Paix',
+                    'Avenue Jean Jaures', 'Rue Victor Hugo', 'Place Bellecour', 'Cours Mirabeau', 'Rue Sainte-Catherine'])
+CITIES = np.array(['Paris, 75015', 'Lyon, 69006', 'Marseille, 13002', 'Toulouse, 31000', 'Nice, 06000',
+                   'Nantes, 44000', 'Bordeaux, 33000', 'Lille, 59000', 'Strasbourg, 67000', 'Rennes, 35000'])
+FIRST_NAMES = np.array(['Jean', 'Marie', 'Claude', 'Camille', 'Louis', 'Chloe', 'Hugo', 'Lea', 'Lucas', 'Emma',
+                        'Gabriel', 'Manon', 'Arthur', 'Ines', 'Jules', 'Sarah'])
+LAST_NAMES = np.array(['Dupont', 'Curie', 'Monet', 'Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Richard',
+                       'Petit', 'Durand', 'Leroy', 'Moreau', 'Simon', 'Laurent', 'Lefebvre'])
+TASKS = np.array(['Fix leaking roof', 'Repaint exterior walls', 'Update security system', 'Service boiler',
+                  'Replace locks', 'Clean gutters', 'Inspect wiring', 'Repair windows'])
+
+FIRST_PURCHASE = np.datetime64('1990-01-01')
+
+def portfolio_sizes(leases, properties=None, tenants=None, maintenance=None):
+    """Row counts per table: by default 4 leases per property, 2 per tenant and 1 maintenance task per 2 leases."""
+    return {
+        'properties': properties or max(leases // 4, 1),
+        'tenants': tenants or max(leases // 2, 1),
+        'leases': leases,
+        'maintenance': maintenance if maintenance is not None else leases // 2
+    }
+
+def _concat(*parts):
+    """Element-wise string concatenation of arrays and scalars."""
+    result = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        result = np.char.add(result, np.asarray(part).astype(str))
+    return result
+
+def generate_portfolio(sizes, lookup_ids, ids, seed=None, today=None):
+    """
+    Sample the rows of every table as NumPy column arrays, keyed by table then column.
+
+    ``lookup_ids`` maps each lookup model to its ids in ``LOOKUPS`` order and
+    ``ids`` holds the primary keys to use per table, so leases and tasks
+    reference the generated properties and tenants. Prices are log-normal
+    around 330k, and the leases of a property follow each other with gaps
+    between them, so they never overlap. Lease chains are placed relative to
+    ``today`` (default: the current date).
+    """
+    rng = np.random.default_rng(seed)
+    n_properties, n_tenants, n_leases, n_tasks = (sizes[table] for table in ('properties', 'tenants', 'leases',
+                                                                              'maintenance'))
+    property_ids, tenant_ids = ids['properties'], ids['tenants']
+    property_type, property_status = lookup_ids[PropertyType], lookup_ids[PropertyStatus]
+    payment_status, maintenance_status = lookup_ids[PaymentStatus], lookup_ids[MaintenanceStatus]
+
+    types = rng.choice(property_type, n_properties, p=[0.7, 0.2, 0.1])
+    # Commercial premises cost about three times as much
+    prices = np.round(rng.lognormal(12.7, 0.45, n_properties) * np.where(types == property_type[1], 3.0, 1.0), 2)
+    properties = {
+        'propertyid': property_ids,
+        'address': _concat(rng.integers(1, 200, n_properties), ' ', rng.choice(STREETS, n_properties), ', ',
+                           rng.choice(CITIES, n_properties)),
+        'propertytypeid': types,
+        'propertystatusid': rng.choice(property_status, n_properties, p=[0.15, 0.8, 0.05]),
+        'purchasedate': FIRST_PURCHASE + rng.integers(0, 12000, n_properties).astype('timedelta64[D]'),
+        'price': prices
+    }
+
+    first, last = rng.choice(FIRST_NAMES, n_tenants), rng.choice(LAST_NAMES, n_tenants)
+    tenants = {
+        'tenantid': tenant_ids,
+        'name': _concat(first, ' ', last),
+        'contactinfo': _concat(np.char.lower(first), '.', np.char.lower(last), tenant_ids, '@example.com')
+    }
+
+    # Leases sorted by property; within a property each one starts after the previous one ends plus a gap.
+    # Each chain starts after its property's purchase and ends around today, unless a late purchase
+    # pushes it further, so there are both active and upcoming expiring leases.
+    lease_property = np.sort(rng.integers(0, n_properties, n_leases))
+    durations = rng.choice([182, 364, 729, 1094], n_leases, p=[0.1, 0.6, 0.2, 0.1])
+    gaps = rng.integers(1, 90, n_leases)
+    spans = np.cumsum(durations + gaps)
+    group_start = np.r_[0, np.flatnonzero(np.diff(lease_property)) + 1]
+    group_sizes = np.diff(np.r_[group_start, n_leases])
+    chain_origin = spans[group_start] - durations[group_start] - gaps[group_start]
+    offsets = spans - np.repeat(chain_origin, group_sizes) - durations
+    chain_lengths = spans[group_start + group_sizes - 1] - chain_origin
+    chain_ends = np.datetime64(today or date.today(), 'D') + rng.integers(-180, 730, len(group_start))
+    chain_starts = np.maximum(properties['purchasedate'][lease_property[group_start]],
+                              chain_ends - chain_lengths.astype('timedelta64[D]'))
+    starts = np.repeat(chain_starts, group_sizes) + offsets.astype('timedelta64[D]')
+    leases = {
+        'leaseid': ids['leases'],
+        'tenantid': rng.choice(tenant_ids, n_leases),
+        'propertyid': property_ids[lease_property],
+        'leasetermstart': starts,
+        'leasetermend': starts + durations.astype('timedelta64[D]'),
+        'paymentstatusid': rng.choice(payment_status, n_leases, p=[0.8, 0.12, 0.08])
+    }
+
+    maintenance = {
+        'taskid': ids['maintenance'],
+        'description': rng.choice(TASKS, n_tasks),
+        'maintenancestatusid': rng.choice(maintenance_status, n_tasks, p=[0.6, 0.15, 0.25]),
+        'scheduleddate': np.datetime64('2015-01-01') + rng.integers(0, 4000, n_tasks).astype('timedelta64[D]'),
+        'propertyid': rng.choice(property_ids, n_tasks)
+    }
+    return {Property: properties, Tenant: tenants, Lease: leases, Maintenance: maintenance}
+
+def ensure_lookups():
+    """Ids of the ``LOOKUPS`` rows per lookup model, inserting the missing ones and bumping their table versions."""
+    ids, seeded = {}, []
+    for model, descriptions in LOOKUPS.items():
+        id_column = model.__mapper__.primary_key[0]
+        existing = dict(db.session.query(model.description, id_column).filter(model.description.in_(descriptions)))
+        missing = [model(description=description) for description in descriptions if description not in existing]
+        if missing:
+            db.session.add_all(missing)
+            db.session.flush()
+            existing.update({row.description: getattr(row, id_column.key) for row in missing})
+            seeded.append(model)
+        ids[model] = np.array([existing[description] for description in descriptions])
+    bump_version(*seeded)
+    db.session.commit()
+    return ids
+
+def reserve_ids(model, count):
+    """
+    ``count`` new primary keys for ``model``.
+
+    On PostgreSQL they are drawn from the table's sequence, as in
+    ``bulk.bulk_insert``, so concurrent inserts keep working; elsewhere they
+    follow the current highest id.
+    """
+    table, id_column = model.__table__, model.__mapper__.primary_key[0]
+    if db.engine.dialect.name != 'postgresql':
+        return (db.session.query(func.max(id_column)).scalar() or 0) + 1 + np.arange(count)
+    return np.fromiter(db.session.execute(
+        text('SELECT nextval(pg_get_serial_sequence(:table, :column)) FROM generate_series(1, :count)'),
+        {'table': table.name, 'column': id_column.name, 'count': count}
+    ).scalars(), dtype=np.int64, count=count)
+
+def _column_values(values):
+    """Column array as Python values the database driver accepts: ``date`` objects for dates."""
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[D]').astype(object)
+    return values.tolist()
+
+def load_table(model, columns, batch_size):
+    """
+    Load generated ``columns`` into ``model``'s table, ``batch_size`` rows per round trip.
+
+    PostgreSQL reads each batch with ``COPY ... FROM STDIN``; other databases
+    get batched multi-row ``INSERT`` statements.
+    """
+    names = list(columns)
+    count = len(columns[names[0]])
+    postgres = db.engine.dialect.name == 'postgresql'
+    for start in range(0, count, batch_size):
+        batch = [_column_values(columns[name][start:start + batch_size]) for name in names]
+        if postgres:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(zip(*batch))
+            buffer.seek(0)
+            cursor = db.session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(f'COPY {model.__tablename__} ({", ".join(names)}) FROM STDIN WITH (FORMAT csv)',
+                                   buffer)
+            finally:
+                cursor.close()
+        else:
+            db.session.execute(insert(model.__table__), [dict(zip(names, row)) for row in zip(*batch)])
+        db.session.commit()
+
+def generate_data(sizes, seed=None, batch_size=100000, progress=None):
+    """
+    Generate and load a synthetic portfolio of ``sizes`` rows, appending to any existing data.
+
+    ``progress`` is called with each table name and its row count once the
+    table is loaded.
+    """
+    lookup_ids = ensure_lookups()
+    tables = {Property: 'properties', Tenant: 'tenants', Lease: 'leases', Maintenance: 'maintenance'}
+    ids = {name: reserve_ids(model, sizes[name]) for model, name in tables.items()}
+    db.session.commit()
+
+    for model, columns in generate_portfolio(sizes, lookup_ids, ids, seed).items():
+        load_table(model, columns, batch_size)
+        if progress:
+            progress(tables[model], sizes[tables[model]])
+
+    bump_version(*tables)
+    db.session.commit()
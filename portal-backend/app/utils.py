@@ -0,0 +1,162 @@
+import base64
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import select, tuple_
+from .db import db
+
+MAX_PAGE_LIMIT = 1000
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+
+def encode_cursor(values):
+    """Encode the sort key and primary key of the last row of a page into an opaque token."""
+    payload = [v.isoformat() if isinstance(v, date) else str(v) if isinstance(v, Decimal) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor token back into typed values matching ``columns``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise ValueError('Invalid cursor')
+
+    values = []
+    for value, column in zip(payload, columns):
+        python_type = column.type.python_type
+        try:
+            if python_type is date:
+                values.append(date.fromisoformat(value))
+            elif python_type is Decimal:
+                values.append(Decimal(value))
+            else:
+                values.append(python_type(value))
+        except (ValueError, TypeError, InvalidOperation):
+            raise ValueError('Invalid cursor')
+    return values
+
+def parse_limit(limit):
+    if limit is None:
+        return None
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        raise ValueError('Limit must be a positive integer')
+    if limit < 1:
+        raise ValueError('Limit must be a positive integer')
+    return min(limit, MAX_PAGE_LIMIT)
+
+def parse_fields(fields, field_map):
+    """Return the response keys requested in a comma-separated ``fields`` parameter, all of them when it names none."""
+    requested = list(dict.fromkeys(f.strip() for f in (fields or '').split(',') if f.strip()))
+    if not requested:
+        return list(field_map)
+    unknown = [f for f in requested if f not in field_map]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return requested
+
+def select_fields(field_map, fields, model):
+    """
+    Build a query on ``model`` selecting only ``fields``, each labelled with its response key.
+
+    Related tables are joined only when one of their columns is selected; the
+    foreign keys are non-nullable, so skipping a join never changes the rows.
+    """
+    query = db.session.query(*[field_map[f].label(f) for f in fields]).select_from(model)
+    for related in related_models(field_map, fields, model):
+        query = query.join(related)
+    return query
+
+def select_statement(field_map, fields, model):
+    """``select()`` counterpart of ``select_fields`` for sessions outside Flask, such as the async engine."""
+    statement = select(*[field_map[f].label(f) for f in fields]).select_from(model)
+    for related in related_models(field_map, fields, model):
+        statement = statement.join(related)
+    return statement
+
+def related_models(field_map, fields, model):
+    """Models other than ``model`` that own one of the selected ``fields``, in field order."""
+    return [related for related in dict.fromkeys(field_map[f].class_ for f in fields) if related is not model]
+
+def serialize_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def serialize_row(row, fields):
+    """``{field: value}`` of a row; dates and ``Decimal`` values are left to the app's JSON provider."""
+    return {f: getattr(row, f) for f in fields}
+
+def keyset_order(query, sort_column, id_column, order='asc', cursor=None):
+    """Order ``query`` by ``sort_column`` then ``id_column`` and resume after ``cursor`` if given."""
+    columns = [id_column] if sort_column is id_column else [sort_column, id_column]
+    descending = order == 'desc'
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key, bound = tuple_(*columns), tuple_(*values)
+        query = query.filter(key < bound if descending else key > bound)
+
+    return query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+def paginate(query, sort_column, id_column, order='asc', limit=None, cursor=None, row_keys=None):
+    """
+    Apply keyset pagination to ``query``.
+
+    Rows are ordered by ``sort_column`` with ``id_column`` as a tie-breaker, and
+    the cursor holds both values of the last row returned, so each page is an
+    index range scan that starts where the previous one ended instead of an
+    OFFSET that grows with the page depth. Without ``limit`` every row is
+    returned. Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on
+    the last page. ``row_keys`` names the row attributes holding the sort and
+    id values when the columns were selected under a label. Raises
+    ``ValueError`` on an invalid limit or cursor.
+    """
+    limit = parse_limit(limit)
+    if row_keys is None:
+        row_keys = [sort_column.key, id_column.key]
+    if sort_column is id_column:
+        row_keys = row_keys[-1:]
+
+    query = keyset_order(query, sort_column, id_column, order, cursor)
+
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], k) for k in row_keys])
+
+def wants_stream():
+    """Whether the client asked for a streamed NDJSON response, via ``?stream=1`` or the Accept header."""
+    return is_stream_request(request.args, request.accept_mimetypes)
+
+def is_stream_request(args, accept_mimetypes):
+    if args.get('stream', '').lower() in ('1', 'true'):
+        return True
+    return accept_mimetypes.best == NDJSON_MIMETYPE
+
+def stream_rows(query, fields):
+    """
+    Stream ``query`` as newline-delimited JSON, one object per row.
+
+    Rows are fetched in batches of ``STREAM_BATCH_SIZE`` through a server-side
+    cursor and written as they arrive, so memory use does not grow with the
+    result size and the first line is sent before the query is exhausted.
+    """
+    def generate():
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            yield current_app.json.dumps(serialize_row(row, fields)) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,63 @@
+import hashlib
+from functools import wraps
+from flask import g, has_request_context, make_response, request
+from sqlalchemy import select
+from .db import db
+from .models import TableVersion
+from .utils import wants_stream
+
+def bump_version(*models):
+    """
+    Increment the change version of each model's table in the current transaction.
+
+    Write routes call this before committing so the new version becomes
+    visible together with the data it describes, to every worker process.
+    The lookup versions the request already read are dropped, so the lookup
+    cache compares against the new ones.
+    """
+    if has_request_context():
+        g.pop('lookup_versions', None)
+    for model in models:
+        table = model.__tablename__
+        updated = TableVersion.query.filter(TableVersion.tablename == table) \
+            .update({TableVersion.version: TableVersion.version + 1}, synchronize_session=False)
+        if not updated:
+            db.session.add(TableVersion(tablename=table, version=1))
+
+def current_etag(models):
+    """Weak ETag for the current request from the tables' versions and the normalized query string."""
+    tables = sorted(model.__tablename__ for model in models)
+    versions = dict(db.session.execute(versions_statement(tables)).all())
+    return make_etag(request.path, wants_stream(), tables, versions, request.args.items(multi=True))
+
+def versions_statement(tables):
+    return select(TableVersion.tablename, TableVersion.version).where(TableVersion.tablename.in_(tables))
+
+def make_etag(path, stream, tables, versions, args):
+    key = [path, 'ndjson' if stream else 'json']
+    key += [f'{table}={versions.get(table, 0)}' for table in tables]
+    key += [f'{name}={value}' for name, value in sorted(args)]
+    return hashlib.sha1('&'.join(key).encode()).hexdigest()
+
+def conditional(*models):
+    """
+    Answer GET requests with ``304 Not Modified`` while ``models`` are unchanged.
+
+    The ETag is derived from the change versions of the tables the response
+    reads, so a matching ``If-None-Match`` is resolved with a single
+    primary-key lookup and the view itself never runs.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = current_etag(models)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            return response
+        return wrapper
+    return decorator
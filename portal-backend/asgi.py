@@ -0,0 +1,10 @@
+from app import create_app
+from app.asgi import create_asgi_app
+from app.db import wait_for_db
+import os
+
+# Entry point for the async serving mode, e.g. `uvicorn asgi:app --host 0.0.0.0 --port 5001 --workers 4`
+if os.getenv('WAIT_FOR_DB', 'true').lower() == 'true':
+    wait_for_db()
+
+app = create_asgi_app(create_app())
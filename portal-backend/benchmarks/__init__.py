@@ -0,0 +1,6 @@
+"""
+Latency and throughput benchmarks for the API.
+
+``python -m benchmarks.run`` seeds a synthetic portfolio and times every route of the
+resource and status blueprints; ``python -m benchmarks.compare`` diffs two result files.
+"""
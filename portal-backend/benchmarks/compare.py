@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+
+# Metrics checked for regressions, higher is worse for all of them; p99 is reported but too noisy to gate on
+METRICS = ('p50Ms', 'p95Ms', 'queries', 'peakMemoryKb')
+
+def compare_runs(baseline, current, threshold=0.2, min_ms=1.0):
+    """
+    Compare two ``benchmarks.run`` reports endpoint by endpoint.
+
+    A latency or memory metric regresses when it grows by more than
+    ``threshold`` (relative); latencies must also grow by at least
+    ``min_ms`` so that sub-millisecond noise is ignored. Any increase in
+    queries per request is a regression, since it usually means a new N+1.
+    Returns one entry per endpoint present in both runs.
+    """
+    rows = []
+    for name, after in current['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        regressions = []
+        for metric in METRICS:
+            old, new = before[metric], after[metric]
+            if metric == 'queries':
+                regressed = new > old + 0.5
+            else:
+                regressed = new > old * (1 + threshold) and (not metric.endswith('Ms') or new - old >= min_ms)
+            if regressed:
+                regressions.append(metric)
+        if after['errors'] > before['errors']:
+            regressions.append('errors')
+        rows.append({'endpoint': name, 'before': before, 'after': after, 'regressions': regressions})
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark reports and fail on regressions.')
+    parser.add_argument('baseline', help='Report of the reference run')
+    parser.add_argument('current', help='Report of the run to check')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative growth of latency or memory counted as a regression (default: 0.2)')
+    parser.add_argument('--min-ms', type=float, default=1.0,
+                        help='Smallest latency growth counted as a regression, in ms (default: 1.0)')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare_runs(baseline, current, args.threshold, args.min_ms)
+    print(f'{"endpoint":32} {"p95 before":>11} {"p95 after":>10} {"change":>8} {"queries":>16}  regressions')
+    for row in rows:
+        before, after = row['before'], row['after']
+        change = (after['p95Ms'] - before['p95Ms']) / before['p95Ms'] if before['p95Ms'] else 0.0
+        print(f'{row["endpoint"]:32} {before["p95Ms"]:9.2f}ms {after["p95Ms"]:8.2f}ms {change:+8.1%} '
+              f'{before["queries"]:6.1f} -> {after["queries"]:<6.1f}  {", ".join(row["regressions"])}')
+
+    regressed = [row['endpoint'] for row in rows if row['regressions']]
+    if regressed:
+        print(f'{len(regressed)} endpoint(s) regressed: {", ".join(regressed)}', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
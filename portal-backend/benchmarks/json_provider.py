@@ -0,0 +1,91 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import namedtuple
+from decimal import Decimal
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+from app.synthetic import LOOKUPS, generate_portfolio, portfolio_sizes
+from app.models import Lease, Property, PaymentStatus, Tenant
+from app.utils import serialize_row, serialize_value
+from app.blueprints.leases.routes import LEASE_FIELDS
+
+FIELDS = list(LEASE_FIELDS)
+# The /leases/ rows plus a Decimal column, as a property price would come from the database
+LeaseRow = namedtuple('LeaseRow', FIELDS + ['price'])
+
+def lease_rows(count, seed=0):
+    """``count`` rows shaped like the ``/leases/`` query results, with ``date`` and ``Decimal`` values."""
+    sizes = portfolio_sizes(count)
+    lookup_ids = {model: np.arange(1, len(descriptions) + 1) for model, descriptions in LOOKUPS.items()}
+    ids = {table: np.arange(1, size + 1) for table, size in sizes.items()}
+    portfolio = generate_portfolio(sizes, lookup_ids, ids, seed)
+    leases, tenants, properties = portfolio[Lease], portfolio[Tenant], portfolio[Property]
+    statuses = LOOKUPS[PaymentStatus]
+    tenant_names, addresses = tenants['name'].tolist(), properties['address'].tolist()
+    prices = [Decimal(f'{price:.2f}') for price in properties['price'].tolist()]
+    return [
+        LeaseRow(lease_id, tenant_id, tenant_names[tenant_id - 1], property_id, addresses[property_id - 1],
+                 start, end, statuses[status_id - 1], status_id, prices[property_id - 1])
+        for lease_id, tenant_id, property_id, start, end, status_id in zip(
+            leases['leaseid'].tolist(), leases['tenantid'].tolist(), leases['propertyid'].tolist(),
+            leases['leasetermstart'].astype(object), leases['leasetermend'].astype(object),
+            leases['paymentstatusid'].tolist())
+    ]
+
+def converted_row(row, fields):
+    """The former ``serialize_row``: every value converted in Python before encoding."""
+    return {f: serialize_value(getattr(row, f)) for f in fields}
+
+def variants(app):
+    """``(name, provider, row serializer)`` of each way to render the payload; the first one is the baseline."""
+    found = [('stdlib, converted rows', DefaultJSONProvider(app), converted_row),
+             ('stdlib', StdlibJSONProvider(app), serialize_row)]
+    if orjson is not None:
+        found.append(('orjson', OrjsonProvider(app), serialize_row))
+    return found
+
+def time_variant(app, provider, serialize, rows, fields, repeat):
+    """Median seconds to build the ``{'data': [...]}`` payload and its response, as a list route does, and the body."""
+    samples = []
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = provider.response({'data': [serialize(row, fields) for row in rows]}).get_data()
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples), body
+
+def run_json_benchmark(rows=100000, repeat=5, seed=0):
+    """Time each JSON provider on ``rows`` lease rows; every variant must produce the same document."""
+    app = Flask(__name__)
+    data, fields = lease_rows(rows, seed), FIELDS + ['price']
+    results, expected = {}, None
+    for name, provider, serialize in variants(app):
+        seconds, body = time_variant(app, provider, serialize, data, fields, repeat)
+        document = json.loads(body)
+        if expected is None:
+            expected = document
+        elif document != expected:
+            raise AssertionError(f'{name} encodes the payload differently')
+        results[name] = {'ms': seconds * 1000, 'bytes': len(body)}
+    baseline = next(iter(results.values()))['ms']
+    for result in results.values():
+        result['speedup'] = baseline / result['ms']
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the JSON providers on a /leases/ payload.')
+    parser.add_argument('--rows', type=int, default=100000, help='Lease rows in the payload (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per provider, the median is kept (default: 5)')
+    args = parser.parse_args(argv)
+
+    for name, result in run_json_benchmark(args.rows, args.repeat).items():
+        print(f'{name:24} {result["ms"]:9.1f} ms  {result["bytes"] / 1e6:6.1f} MB  x{result["speedup"]:.1f}',
+              file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
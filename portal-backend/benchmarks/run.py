@@ -0,0 +1,177 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from sqlalchemy import event
+from app import create_app
+from app.db import db
+from app.models import Lease, Maintenance, Property, Tenant
+from app.synthetic import generate_data, portfolio_sizes
+from .scenarios import request_args, scenarios
+
+TABLE_IDS = {'properties': Property.propertyid, 'tenants': Tenant.tenantid, 'leases': Lease.leaseid,
+             'maintenance': Maintenance.taskid}
+# Seeded values the scenarios pick from, e.g. names for the tenant search; the first SAMPLE_SIZE rows by id
+SAMPLED_VALUES = {'tenantNames': (Tenant.name, Tenant.tenantid)}
+SAMPLE_SIZE = 1000
+
+def table_sizes(app):
+    """Highest id per seeded table; the synthetic portfolio numbers its rows from 1."""
+    with app.app_context():
+        return {table: db.session.query(db.func.max(id_column)).scalar() or 0 for table, id_column in TABLE_IDS.items()}
+
+def sampled_values(app):
+    """Up to ``SAMPLE_SIZE`` seeded values per ``SAMPLED_VALUES`` key."""
+    with app.app_context():
+        return {key: db.session.scalars(db.select(column).order_by(order).limit(SAMPLE_SIZE)).all()
+                for key, (column, order) in SAMPLED_VALUES.items()}
+
+def percentile(samples, p):
+    """``p``-th percentile of ``samples`` with linear interpolation between the closest ranks."""
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+class QueryCounter:
+    """Counts the SQL statements sent through the app's engines."""
+
+    def __init__(self, app):
+        with app.app_context():
+            self.engines = list(db.engines.values())
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self.engines:
+            event.remove(engine, 'before_cursor_execute', self._count)
+
+def run_scenario(client, scenario, requests, warmup, ids, created, counter):
+    """Time ``requests`` requests of ``scenario`` after ``warmup`` untimed ones, then one more under ``tracemalloc``."""
+    def send(i):
+        method, path, body = request_args(scenario, i, ids, created)
+        response = client.open(path, method=method, json=body)
+        response.get_data()
+        if scenario.creates and response.status_code == 201:
+            created.setdefault(scenario.creates, []).append(response.get_json()['data']['id'])
+        return response.status_code
+
+    for i in range(warmup):
+        send(i)
+
+    latencies, errors = [], 0
+    counter.count = 0
+    started = time.perf_counter()
+    for i in range(warmup, warmup + requests):
+        start = time.perf_counter()
+        errors += send(i) >= 400
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    queries = counter.count / requests
+
+    # Memory is sampled on a separate request: tracemalloc slows down every allocation it traces
+    tracemalloc.start()
+    send(warmup + requests)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'method': scenario.method,
+        'requests': requests,
+        'errors': errors,
+        'p50Ms': percentile(latencies, 50) * 1000,
+        'p95Ms': percentile(latencies, 95) * 1000,
+        'p99Ms': percentile(latencies, 99) * 1000,
+        'meanMs': statistics.fmean(latencies) * 1000,
+        'throughput': requests / elapsed,
+        'queries': queries,
+        'peakMemoryKb': peak / 1024
+    }
+
+def run_benchmarks(app, requests=100, warmup=5, only=None, seed=0):
+    """
+    Benchmark every scenario (or those whose name starts with one of ``only``) against ``app``'s database.
+
+    Requests go through Flask's test client, so latencies measure the app
+    and database without network overhead. Returns the results keyed by
+    scenario name.
+    """
+    sizes, values = table_sizes(app), sampled_values(app)
+    rng = random.Random(seed)
+
+    def ids(table):
+        if table in values:
+            return rng.choice(values[table])
+        return rng.randint(1, sizes[table])
+
+    client = app.test_client()
+    created, results = {}, {}
+    with QueryCounter(app) as counter:
+        for scenario in scenarios():
+            if only and not scenario.name.startswith(tuple(only)):
+                continue
+            if scenario.uses and not created.get(scenario.uses):
+                continue
+            result = results[scenario.name] = run_scenario(client, scenario, requests, warmup, ids, created, counter)
+            print(f'{scenario.name:32} p50 {result["p50Ms"]:8.2f} ms  p95 {result["p95Ms"]:8.2f} ms  '
+                  f'{result["queries"]:5.1f} queries  {result["errors"]} errors', file=sys.stderr)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the API against a synthetic portfolio.')
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='Leases to seed with --seed-data, e.g. 10000, 100000 or 1000000 (default: 10000)')
+    parser.add_argument('--seed-data', action='store_true',
+                        help='Create the tables and load the portfolio first; the database must be empty')
+    parser.add_argument('--requests', type=int, default=100, help='Timed requests per endpoint (default: 100)')
+    parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per endpoint first (default: 5)')
+    parser.add_argument('--only', action='append', help='Only run endpoints whose name starts with this prefix')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for data and request ids (default: 0)')
+    parser.add_argument('--output', default='benchmark.json', help='Where to write the results (default: benchmark.json)')
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    if args.seed_data:
+        with app.app_context():
+            db.create_all()
+            if db.session.query(Lease.leaseid).first() is not None:
+                parser.error('--seed-data needs an empty database')
+            started = time.perf_counter()
+            generate_data(portfolio_sizes(args.rows), args.seed)
+            print(f'Seeded {portfolio_sizes(args.rows)} in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+    sizes = table_sizes(app)
+    endpoints = run_benchmarks(app, args.requests, args.warmup, args.only, args.seed)
+    with app.app_context():
+        database = db.engine.dialect.name
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'rows': sizes,
+            'database': database,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'python': platform.python_version(),
+            'machine': platform.machine()
+        },
+        'endpoints': endpoints
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {args.output}', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+from urllib.parse import quote
+
+STATUS_PREFIXES = ('/property-status', '/payment-status', '/maintenance-status', '/property-type')
+BULK_SIZE = 100
+# Item numbers of bulk requests start here so their lease terms never meet those of single creates
+BULK_OFFSET = 100000
+
+class Scenario:
+    """
+    One benchmarked route.
+
+    ``path`` and ``body`` are values or functions of ``(i, ids)``: the
+    iteration number and a random picker of seeded ids per table (and of
+    seeded values such as ``tenantNames``), so new leases and tasks only
+    reference seeded rows and searches find them. Scenarios
+    that create rows store the new ids under ``creates`` so the update and
+    delete scenarios of the same resource can use them.
+    """
+
+    def __init__(self, name, method, path, body=None, creates=None, uses=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.creates = creates
+        self.uses = uses
+
+def _resolve(value, i, ids):
+    return value(i, ids) if callable(value) else value
+
+def request_args(scenario, i, ids, created):
+    """Method, path and JSON body of the ``i``-th request of ``scenario``."""
+    if scenario.uses:
+        target = created[scenario.uses][i % len(created[scenario.uses])]
+        path = scenario.path.format(id=target)
+    else:
+        path = _resolve(scenario.path, i, ids)
+    return scenario.method, path, _resolve(scenario.body, i, ids)
+
+def _property(i, ids):
+    return {'address': f'{i} Bench Avenue', 'typeId': 1, 'statusId': 1, 'purchaseDate': '2021-03-01', 'price': 250000}
+
+def _tenant(i, ids):
+    return {'name': f'Bench Tenant {i}', 'contactinfo': f'bench{i}@example.com'}
+
+def _lease(i, ids):
+    # Far-future one-day terms with a day between them, so created leases never overlap the seeded ones or each other
+    start = date(2100, 1, 1) + timedelta(days=2 * i)
+    return {'tenantid': ids('tenants'), 'propertyid': ids('properties'), 'leasetermstart': start.isoformat(),
+            'leasetermend': (start + timedelta(days=1)).isoformat(), 'paymentstatusid': 1}
+
+def _maintenance(i, ids):
+    return {'description': f'Bench task {i}', 'maintenancestatusid': 3, 'scheduleddate': '2024-06-01',
+            'propertyid': ids('properties')}
+
+def _bulk(item):
+    return lambda i, ids: [item(BULK_OFFSET + i * BULK_SIZE + k, ids) for k in range(BULK_SIZE)]
+
+def _window(days):
+    """``from=...&to=...`` of the ``days`` days around today, where the synthetic leases and tasks are dense."""
+    today = date.today()
+    return f'from={(today - timedelta(days=days // 2)).isoformat()}&to={(today + timedelta(days=days // 2)).isoformat()}'
+
+def scenarios():
+    """Every route of the properties, tenants, leases, maintenance, dashboard and status blueprints, reads first."""
+    reads = [
+        Scenario('properties.list', 'GET', '/properties/?limit=50'),
+        Scenario('properties.list_filtered', 'GET', '/properties/?status=occupied&sort=price&order=desc&limit=50'),
+        Scenario('properties.list_all', 'GET', '/properties/'),
+        Scenario('properties.detail', 'GET', lambda i, ids: f'/properties/{ids("properties")}'),
+        Scenario('properties.export', 'GET', '/properties/export?fields=id,address,price'),
+        Scenario('tenants.list', 'GET', '/tenants/?limit=50'),
+        Scenario('tenants.list_all', 'GET', '/tenants/'),
+        Scenario('tenants.search', 'GET', lambda i, ids: f'/tenants/search?q={quote(ids("tenantNames"))}'),
+        Scenario('tenants.detail', 'GET', lambda i, ids: f'/tenants/{ids("tenants")}'),
+        Scenario('leases.list', 'GET', '/leases/?limit=50'),
+        Scenario('leases.list_filtered', 'GET', '/leases/?paymentStatus=overdue&sort=leaseEnd&limit=50'),
+        Scenario('leases.list_all', 'GET', '/leases/'),
+        Scenario('leases.detail', 'GET', lambda i, ids: f'/leases/{ids("leases")}'),
+        Scenario('leases.by_tenant', 'GET', lambda i, ids: f'/leases/tenant/{ids("tenants")}'),
+        Scenario('leases.by_property', 'GET', lambda i, ids: f'/leases/property/{ids("properties")}'),
+        Scenario('leases.export', 'GET', '/leases/export?fields=id,tenantName,propertyAddress,leaseEnd'),
+        # 120 days is not one of the cached windows (CACHED_EXPIRING_DAYS), so every request queries
+        Scenario('leases.expiring', 'GET', '/leases/expiring?days=120&limit=50'),
+        Scenario('maintenance.list', 'GET', '/maintenance/?limit=50'),
+        Scenario('maintenance.list_filtered', 'GET', '/maintenance/?status=pending&limit=50'),
+        Scenario('maintenance.list_all', 'GET', '/maintenance/'),
+        Scenario('maintenance.detail', 'GET', lambda i, ids: f'/maintenance/{ids("maintenance")}'),
+        Scenario('maintenance.export', 'GET', '/maintenance/export?fields=id,description,scheduledDate'),
+        Scenario('maintenance.calendar', 'GET', lambda i, ids: f'/maintenance/calendar?{_window(180)}'),
+        Scenario('maintenance.calendar_property', 'GET',
+                 lambda i, ids: f'/maintenance/calendar?{_window(360)}&propertyId={ids("properties")}'),
+        Scenario('dashboard.summary', 'GET', '/dashboard/summary'),
+        Scenario('dashboard.occupancy', 'GET', lambda i, ids: f'/dashboard/occupancy?{_window(730)}'),
+        Scenario('dashboard.occupancy_monthly', 'GET', '/dashboard/occupancy?resolution=monthly'),
+    ]
+    for prefix in STATUS_PREFIXES:
+        name = prefix.strip('/').replace('-', '_')
+        reads += [Scenario(f'{name}.list', 'GET', f'{prefix}/'), Scenario(f'{name}.detail', 'GET', f'{prefix}/1')]
+
+    writes = []
+    updates = {
+        'properties': lambda i, ids: {'price': 260000 + i, 'statusId': 2},
+        'tenants': lambda i, ids: {'name': f'Renamed Tenant {i}'},
+        'leases': lambda i, ids: {'paymentstatusid': 2},
+        'maintenance': lambda i, ids: {'description': f'Renamed task {i}', 'maintenancestatusid': 2}
+    }
+    for resource, item in (('properties', _property), ('tenants', _tenant), ('leases', _lease),
+                           ('maintenance', _maintenance)):
+        writes += [
+            Scenario(f'{resource}.create', 'POST', f'/{resource}/', item, creates=resource),
+            Scenario(f'{resource}.bulk', 'POST', f'/{resource}/bulk', _bulk(item)),
+            Scenario(f'{resource}.update', 'PUT', f'/{resource}/{{id}}', updates[resource], uses=resource),
+            Scenario(f'{resource}.delete', 'DELETE', f'/{resource}/{{id}}', uses=resource)
+        ]
+    for prefix in STATUS_PREFIXES:
+        name = prefix.strip('/').replace('-', '_')
+        description = lambda i, ids, name=name: {'description': f'Bench {name} {i}'}
+        writes += [
+            Scenario(f'{name}.create', 'POST', f'{prefix}/', description, creates=name),
+            Scenario(f'{name}.update', 'PUT', f'{prefix}/{{id}}', lambda i, ids: {'description': f'Renamed {i}'},
+                     uses=name),
+            Scenario(f'{name}.delete', 'DELETE', f'{prefix}/{{id}}', uses=name)
+        ]
+    return reads + writes
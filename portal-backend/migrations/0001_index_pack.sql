@@ -0,0 +1,33 @@
+-- Index pack for the list, sort and nested-list queries of the blueprints.
+-- Built CONCURRENTLY so writes continue during the build. An interrupted build
+-- leaves an INVALID index that IF NOT EXISTS would skip: the migration runner
+-- drops such an index before the statement runs again, so an interrupted run
+-- can be repeated.
+
+-- Keyset pagination orders by the sort column with the id as tie-breaker and
+-- resumes with (column, id) > cursor: one index per sort option serves both
+-- the ORDER BY and the range, in either direction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_price_id ON properties (Price, PropertyID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_purchasedate_id ON properties (PurchaseDate, PropertyID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tenants_name_id ON tenants (Name, TenantID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leases_start_id ON leases (LeaseTermStart, LeaseID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leases_end_id ON leases (LeaseTermEnd, LeaseID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_maintenance_scheduleddate_id ON maintenance (ScheduledDate, TaskID);
+
+-- Foreign keys used by /leases/tenant/<id>, /leases/property/<id> and the status
+-- filters, for databases created before init-db.sql defined them.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leases_tenantid ON leases (TenantID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leases_property_term ON leases (PropertyID, LeaseTermStart, LeaseTermEnd);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leases_paymentstatusid ON leases (PaymentStatusID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_maintenance_propertyid ON maintenance (PropertyID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_maintenance_maintenancestatusid ON maintenance (MaintenanceStatusID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_propertytypeid ON properties (PropertyTypeID);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_propertystatusid ON properties (PropertyStatusID);
+
+-- PropertyID leads idx_leases_property_term, which answers the same lookups
+DROP INDEX CONCURRENTLY IF EXISTS idx_leases_propertyid;
+
+ANALYZE properties;
+ANALYZE tenants;
+ANALYZE leases;
+ANALYZE maintenance;
@@ -0,0 +1,21 @@
+-- Materialized dashboard summary, read by /dashboard/summary when
+-- DASHBOARD_MATERIALIZED_VIEW is set. Same rows as summary.summary_statement:
+-- (kind, key1, key2, count, total), computed as of the refresh date.
+CREATE MATERIALIZED VIEW IF NOT EXISTS portfolio_summary AS
+SELECT 'properties' AS kind, PropertyStatusID AS key1, PropertyTypeID AS key2, count(*) AS count,
+       sum(Price) AS total, CURRENT_DATE AS as_of
+FROM properties
+GROUP BY PropertyStatusID, PropertyTypeID
+UNION ALL
+SELECT 'leases', PaymentStatusID,
+       CASE WHEN LeaseTermStart <= CURRENT_DATE AND LeaseTermEnd >= CURRENT_DATE THEN 1 ELSE 0 END,
+       count(*), NULL, CURRENT_DATE
+FROM leases
+GROUP BY 2, 3
+UNION ALL
+SELECT 'maintenance', MaintenanceStatusID, 0, count(*), NULL, CURRENT_DATE
+FROM maintenance
+GROUP BY MaintenanceStatusID;
+
+-- REFRESH ... CONCURRENTLY needs a unique index over plain columns
+CREATE UNIQUE INDEX IF NOT EXISTS idx_portfolio_summary_key ON portfolio_summary (kind, key1, key2);
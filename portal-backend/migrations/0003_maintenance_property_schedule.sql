@@ -0,0 +1,12 @@
+-- Maintenance calendar of a property: /maintenance/?propertyId=...&from=...&to=...
+-- reads one range of this index in (ScheduledDate, TaskID) order, which is also
+-- the keyset order of sort=scheduledDate. Built CONCURRENTLY like the index pack:
+-- the migration runner drops an INVALID index left by an interrupted build before
+-- the statement runs again.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_maintenance_property_scheduled
+    ON maintenance (PropertyID, ScheduledDate, TaskID);
+
+-- PropertyID leads idx_maintenance_property_scheduled, which answers the same lookups
+DROP INDEX CONCURRENTLY IF EXISTS idx_maintenance_propertyid;
+
+ANALYZE maintenance;
@@ -0,0 +1,18 @@
+-- Change versions behind the ETags of versions.conditional and the lookup cache,
+-- for databases created before init-db.sql defined the table. Writes bump the
+-- version of each table they change in the same transaction.
+CREATE TABLE IF NOT EXISTS table_versions (
+    TableName VARCHAR(50) PRIMARY KEY,
+    Version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO table_versions (TableName) VALUES
+('property_statuses'),
+('maintenance_statuses'),
+('payment_statuses'),
+('property_types'),
+('properties'),
+('tenants'),
+('leases'),
+('maintenance')
+ON CONFLICT (TableName) DO NOTHING;
@@ -0,0 +1,11 @@
+-- Trigram indexes behind tenant search: /tenants/search ranks with the %> word
+-- similarity operator and /tenants/?search= filters with ILIKE '%...%', both of
+-- which pg_trgm answers from these GIN indexes instead of a sequential scan.
+-- Built CONCURRENTLY like the index pack: the migration runner drops an INVALID
+-- index left by an interrupted build before the statement runs again.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tenants_name_trgm ON tenants USING gin (Name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tenants_contactinfo_trgm ON tenants USING gin (ContactInfo gin_trgm_ops);
+
+ANALYZE tenants;
@@ -0,0 +1,33 @@
+-- Server-side guard against overlapping leases of a property, for databases
+-- created before init-db.sql defined it: bulk loads and COPY skip the
+-- application's overlap check. Lease terms include both bounds.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- The constraint cannot be added while overlaps exist: they are reported
+-- instead (the first 20 pairs), and the migration is rerun once resolved.
+DO $$
+DECLARE
+    overlaps BIGINT;
+    examples TEXT;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'leases_no_overlap') THEN
+        SELECT count(*), string_agg(pair, '; ' ORDER BY n) FILTER (WHERE n <= 20)
+        INTO overlaps, examples
+        FROM (
+            SELECT concat('leases ', a.LeaseID, ' and ', b.LeaseID, ' of property ', a.PropertyID) AS pair,
+                   row_number() OVER (ORDER BY a.LeaseID, b.LeaseID) AS n
+            FROM leases a
+            JOIN leases b ON b.PropertyID = a.PropertyID AND b.LeaseID > a.LeaseID
+                AND b.LeaseTermStart <= a.LeaseTermEnd AND b.LeaseTermEnd >= a.LeaseTermStart
+        ) pairs;
+        IF overlaps > 0 THEN
+            RAISE EXCEPTION USING MESSAGE = concat('leases_no_overlap: ', overlaps,
+                ' pair(s) of overlapping leases, resolve them and rerun the migration: ', examples);
+        END IF;
+        ALTER TABLE leases ADD CONSTRAINT leases_no_overlap EXCLUDE USING gist (
+            PropertyID WITH =,
+            daterange(LeaseTermStart, LeaseTermEnd, '[]') WITH &&
+        );
+    END IF;
+END
+$$;
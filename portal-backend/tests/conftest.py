@@ -1,12 +1,14 @@
 import pytest
 import sys
 import os
+from sqlalchemy import event
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app
 from app.db import db as _db
+from app.lookups import clear_lookups
 
 @pytest.fixture(scope='session')
 def app():
@@ -32,4 +34,28 @@ def db(app):
         _db.session.begin_nested()
         yield _db
         _db.session.rollback()
+        # Tests commit through the API, so clear every table to keep them independent
+        for table in reversed(_db.metadata.sorted_tables):
+            _db.session.execute(table.delete())
+        _db.session.commit()
         _db.session.remove()
+        clear_lookups()
+
+@pytest.fixture(scope='function')
+def query_counter(app):
+    """Record every SQL statement executed while the fixture is active."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = _db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+@pytest.fixture(scope='function')
+def admin_headers(app, monkeypatch):
+    """Configure an admin token and return the headers presenting it."""
+    monkeypatch.setitem(app.config, 'ADMIN_TOKEN', 'test-admin-token')
+    return {'Authorization': 'Bearer test-admin-token'}
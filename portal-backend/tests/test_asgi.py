@@ -0,0 +1,88 @@
+import pytest
+import json
+from datetime import date
+from starlette.testclient import TestClient
+from app import create_app
+from app.asgi import create_asgi_app
+from app.config import Config
+from app.db import db
+from app.lookups import clear_lookups
+from app.models import (Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus,
+                        Maintenance, MaintenanceStatus)
+
+READ_PATHS = [
+    '/properties/', '/properties/?status=occ&sort=price&order=desc', '/properties/?limit=2',
+    '/properties/?fields=id,type', '/properties/1', '/properties/99',
+    '/tenants/', '/tenants/?search=example&sort=name', '/tenants/1',
+    '/leases/', '/leases/?paymentStatus=paid', '/leases/1', '/leases/tenant/1', '/leases/property/2',
+    '/maintenance/', '/maintenance/1', '/maintenance/?propertyId=2&from=2024-05-01&to=2024-05-31',
+    '/maintenance/?statusId=2', '/maintenance/?from=2024-13-01',
+    '/property-status/', '/property-status/1', '/payment-status/7',
+    '/properties/?fields=nope', '/leases/?limit=1&cursor=bad'
+]
+
+@pytest.fixture(scope='module')
+def apps(tmp_path_factory):
+    """Flask and ASGI apps sharing one SQLite file, with test data"""
+    class FileConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path_factory.mktemp('asgi')}/portal.db"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    flask_app = create_app(FileConfig)
+    with flask_app.app_context():
+        db.create_all()
+        db.session.add_all([PropertyType(description='Residential'), PropertyStatus(description='Occupied'),
+                            PropertyStatus(description='Vacant'), PaymentStatus(description='Paid'),
+                            MaintenanceStatus(description='Pending')])
+        db.session.add_all([Tenant(name=f'Tenant {i}', contactinfo=f't{i}@example.com') for i in (1, 2)])
+        db.session.commit()
+        db.session.add_all([
+            Property(address=f'{i} Async St', propertytypeid=1, propertystatusid=1 + i % 2,
+                     purchasedate=date(2020, 1, i), price=1000 * i)
+            for i in (1, 2, 3)
+        ])
+        db.session.commit()
+        db.session.add_all([
+            Lease(tenantid=1, propertyid=2, leasetermstart=date(2024, 1, 1), leasetermend=date(2024, 12, 31),
+                  paymentstatusid=1),
+            Maintenance(description='Fix roof', maintenancestatusid=1, scheduleddate=date(2024, 5, 1), propertyid=2)
+        ])
+        db.session.commit()
+    clear_lookups()
+
+    with TestClient(create_asgi_app(flask_app)) as asgi_client:
+        yield flask_app.test_client(), asgi_client
+    clear_lookups()
+
+class TestAsgiReadPath:
+    """Test suite for the async read path"""
+
+    @pytest.mark.parametrize('path', READ_PATHS)
+    def test_same_responses_as_flask(self, apps, path):
+        """Test the async endpoints return the same status, JSON and ETag as the Flask views"""
+        flask_client, asgi_client = apps
+        expected, response = flask_client.get(path), asgi_client.get(path)
+        assert response.status_code == expected.status_code
+        assert response.json() == json.loads(expected.data)
+        assert response.headers.get('etag') == expected.headers.get('ETag')
+
+    def test_not_modified(self, apps):
+        """Test a matching If-None-Match is answered with 304"""
+        _, asgi_client = apps
+        etag = asgi_client.get('/leases/').headers['etag']
+        assert asgi_client.get('/leases/', headers={'If-None-Match': etag}).status_code == 304
+
+    def test_ndjson_stream(self, apps):
+        """Test list endpoints stream NDJSON on request"""
+        _, asgi_client = apps
+        response = asgi_client.get('/properties/?stream=1&fields=id')
+        assert response.headers['content-type'].startswith('application/x-ndjson')
+        assert [json.loads(line) for line in response.text.splitlines()] == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+    def test_writes_fall_through_to_flask(self, apps):
+        """Test non-GET requests are served by the Flask app and seen by later async reads"""
+        _, asgi_client = apps
+        response = asgi_client.post('/tenants/', json={'name': 'Async Tenant', 'contactinfo': 'async@example.com'})
+        assert response.status_code == 201
+        tenant_id = response.json()['data']['id']
+        assert asgi_client.get(f'/tenants/{tenant_id}').json()['data']['name'] == 'Async Tenant'
@@ -0,0 +1,63 @@
+from benchmarks.compare import compare_runs
+from benchmarks.json_provider import run_json_benchmark
+from benchmarks.run import percentile, run_benchmarks, sampled_values
+from benchmarks.scenarios import request_args, scenarios
+from app.synthetic import generate_data, portfolio_sizes
+
+class TestBenchmarks:
+    """Test suite for the benchmark suite"""
+
+    def result(self, **metrics):
+        return dict({'p50Ms': 10.0, 'p95Ms': 20.0, 'p99Ms': 30.0, 'queries': 2.0, 'peakMemoryKb': 100.0,
+                     'errors': 0}, **metrics)
+
+    def test_every_scenario_succeeds(self, app, db):
+        """Test every benchmarked route answers without errors on a small seeded portfolio"""
+        generate_data(portfolio_sizes(40), seed=0)
+        results = run_benchmarks(app, requests=2, warmup=1)
+        assert set(results) == {scenario.name for scenario in scenarios()}
+        assert {name: result['errors'] for name, result in results.items() if result['errors']} == {}
+        for result in results.values():
+            assert 0 < result['p50Ms'] <= result['p95Ms'] <= result['p99Ms']
+            assert result['queries'] >= 1
+            assert result['throughput'] > 0
+
+    def test_search_scenario_uses_seeded_names(self, app, client, db):
+        """Test the tenant search scenario searches for seeded names, so it measures real matches"""
+        generate_data(portfolio_sizes(40), seed=0)
+        names = sampled_values(app)['tenantNames']
+        assert len(names) == 20
+        search = next(scenario for scenario in scenarios() if scenario.name == 'tenants.search')
+        _, path, _ = request_args(search, 0, lambda table: names[0], {})
+        assert names[0] in [tenant['name'] for tenant in client.get(path).get_json()['data']]
+
+    def test_json_benchmark(self):
+        """Test the JSON microbenchmark times every provider on the same document"""
+        results = run_json_benchmark(rows=200, repeat=1)
+        assert list(results) == ['stdlib, converted rows', 'stdlib', 'orjson']
+        assert all(result['ms'] > 0 and result['bytes'] > 0 for result in results.values())
+        assert results['stdlib, converted rows']['speedup'] == 1
+
+    def test_percentile(self):
+        """Test percentiles interpolate between the closest ranks"""
+        assert percentile([4, 1, 3, 2], 50) == 2.5
+        assert percentile(range(101), 95) == 95
+        assert percentile([7], 99) == 7
+
+    def test_compare_flags_regressions(self):
+        """Test latency, query and error growth are flagged and small latency noise is ignored"""
+        baseline = {'endpoints': {'a': self.result(), 'b': self.result(), 'c': self.result(), 'gone': self.result()}}
+        current = {'endpoints': {
+            'a': self.result(p95Ms=30.0),
+            'b': self.result(queries=12.0, errors=1),
+            'c': self.result(p50Ms=10.5, p99Ms=90.0),
+            'new': self.result()
+        }}
+        rows = {row['endpoint']: row['regressions'] for row in compare_runs(baseline, current, threshold=0.2)}
+        assert rows == {'a': ['p95Ms'], 'b': ['queries', 'errors'], 'c': []}
+
+    def test_compare_ignores_growth_below_min_ms(self):
+        """Test a large relative latency change smaller than min_ms is not a regression"""
+        baseline = {'endpoints': {'a': self.result(p50Ms=0.2, p95Ms=0.3)}}
+        current = {'endpoints': {'a': self.result(p50Ms=0.6, p95Ms=0.9)}}
+        assert compare_runs(baseline, current, min_ms=1.0)[0]['regressions'] == []
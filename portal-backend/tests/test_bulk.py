@@ -0,0 +1,102 @@
+import pytest
+import json
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance, MaintenanceStatus
+from app.intervals import find_overlaps
+
+class TestBulkCreate:
+    """Test suite for the bulk create endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        payment_status = PaymentStatus(description='Paid')
+        maintenance_status = MaintenanceStatus(description='Pending')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([property_type, property_status, payment_status, maintenance_status, tenant])
+        db.session.commit()
+
+        db.session.add_all([
+            Property(address=f'{i} Test St', propertytypeid=property_type.propertytypeid,
+                     propertystatusid=property_status.propertystatusid, purchasedate=date(2020, 1, 1), price=100000)
+            for i in (1, 2)
+        ])
+        db.session.commit()
+
+        db.session.add(Lease(tenantid=1, propertyid=1, leasetermstart=date(2024, 1, 1),
+                             leasetermend=date(2024, 12, 31), paymentstatusid=1))
+        db.session.commit()
+
+    def post(self, client, path, items):
+        response = client.post(path, data=json.dumps(items), content_type='application/json')
+        return response.status_code, json.loads(response.data)
+
+    def lease(self, property_id, start, end, **overrides):
+        return dict({'tenantid': 1, 'propertyid': property_id, 'leasetermstart': start,
+                     'leasetermend': end, 'paymentstatusid': 1}, **overrides)
+
+    def test_create_tenants(self, client, db):
+        """Test every valid item is created and its id returned in request order"""
+        code, body = self.post(client, '/tenants/bulk', [
+            {'name': f'Tenant {i}', 'contactinfo': f'tenant{i}@example.com'} for i in range(5)
+        ])
+        assert code == 201
+        assert body['data']['created'] == 5
+        ids = [result['id'] for result in body['data']['results']]
+        assert [db.session.get(Tenant, id).name for id in ids] == [f'Tenant {i}' for i in range(5)]
+
+    def test_partial_batch_reports_errors(self, client):
+        """Test invalid items are reported with the single-create error while valid ones are created"""
+        code, body = self.post(client, '/properties/bulk', [
+            {'address': '3 Test St', 'typeId': 1, 'statusId': 1, 'purchaseDate': '2024-01-15', 'price': 1000},
+            {'address': '4 Test St', 'typeId': 1, 'statusId': 1, 'purchaseDate': '2024-01-15', 'price': -1},
+            {'address': '5 Test St', 'typeId': 99, 'statusId': 1, 'purchaseDate': '2024-01-15', 'price': 1000},
+            'not an object'
+        ])
+        assert code == 207
+        results = body['data']['results']
+        assert 'id' in results[0]
+        assert results[1]['error'] == 'Price cannot be negative'
+        assert results[2]['error'] == 'Property type 99 does not exist'
+        assert results[3]['error'] == 'No data provided'
+        assert body['data']['created'] == 1 and body['data']['failed'] == 3
+
+    def test_all_invalid_batch(self, client):
+        """Test a batch with no valid item returns 400 and creates nothing"""
+        code, body = self.post(client, '/maintenance/bulk', [
+            {'description': 'Fix roof', 'maintenancestatusid': 1, 'scheduleddate': '2024-13-01', 'propertyid': 1}
+        ])
+        assert code == 400
+        assert body['data']['created'] == 0
+        assert Maintenance.query.count() == 0
+
+    def test_rejects_non_array(self, client):
+        """Test the body must be a non-empty array"""
+        assert self.post(client, '/tenants/bulk', {'name': 'x'})[0] == 400
+        assert self.post(client, '/tenants/bulk', [])[0] == 400
+
+    def test_lease_overlaps_with_database_and_batch(self, client):
+        """Test leases overlapping a stored lease or an earlier one in the batch are rejected"""
+        code, body = self.post(client, '/leases/bulk', [
+            self.lease(1, '2024-06-01', '2025-06-01'),
+            self.lease(2, '2024-03-01', '2024-08-31'),
+            self.lease(2, '2024-08-31', '2024-12-31'),
+            self.lease(2, '2024-09-01', '2024-12-31'),
+            self.lease(1, '2025-01-01', '2025-12-31', tenantid=42)
+        ])
+        assert code == 207
+        results = body['data']['results']
+        assert 'overlapping lease' in results[0]['error']
+        assert 'id' in results[1]
+        assert 'overlapping lease' in results[2]['error']
+        assert 'id' in results[3]
+        assert results[4]['error'] == 'Tenant 42 does not exist'
+        assert Lease.query.filter_by(propertyid=2).count() == 2
+
+    def test_find_overlaps(self):
+        """Test the sweep rejects candidates overlapping stored or earlier-starting candidates only"""
+        existing = [('a', 10, 20), ('a', 30, 40)]
+        candidates = [('a', 21, 29), ('a', 25, 35), ('b', 15, 16), ('a', 0, 9), ('a', 5, 12)]
+        assert find_overlaps(existing, candidates) == {1, 4}
@@ -0,0 +1,23 @@
+import time
+from app.cache import TTLCache
+
+class TestTTLCache:
+    """Test suite for the process-local TTL cache"""
+
+    def test_entries_expire(self):
+        """Test an entry is returned until its time to live has passed"""
+        cache = TTLCache()
+        cache.set('key', 'value', ttl=0.05)
+        assert cache.get('key') == 'value'
+        time.sleep(0.06)
+        assert cache.get('key') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_is_evicted(self):
+        """Test storing past max_entries evicts the entry read least recently"""
+        cache = TTLCache(max_entries=2)
+        cache.set('a', 1, ttl=60)
+        cache.set('b', 2, ttl=60)
+        cache.get('a')
+        cache.set('c', 3, ttl=60)
+        assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
@@ -0,0 +1,86 @@
+import gzip
+import json
+import pytest
+from datetime import date
+from app.compression import reset_compression_stats
+from app.models import Property, PropertyType, PropertyStatus
+
+class TestCompression:
+    """Test suite for negotiated response compression"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Forty properties, enough for a list response above the size threshold"""
+        reset_compression_stats()
+        property_type, property_status = PropertyType(description='Residential'), PropertyStatus(description='Occupied')
+        db.session.add_all([property_type, property_status])
+        db.session.flush()
+        db.session.add_all([
+            Property(address=f'{number} Rue des Lilas, Paris', propertytypeid=property_type.propertytypeid,
+                     propertystatusid=property_status.propertystatusid, purchasedate=date(2020, 1, 1), price=250000)
+            for number in range(40)
+        ])
+        db.session.commit()
+        yield
+        reset_compression_stats()
+
+    def get(self, client, path, encoding):
+        return client.get(path, headers={'Accept-Encoding': encoding})
+
+    def test_gzip(self, client):
+        """Test a large JSON response is gzipped when accepted and decodes to the plain body"""
+        plain = client.get('/properties/')
+        assert 'Content-Encoding' not in plain.headers
+
+        response = self.get(client, '/properties/', 'gzip')
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert int(response.headers['Content-Length']) == len(response.data) < len(plain.data)
+        assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+
+    def test_brotli_negotiation(self, client):
+        """Test brotli is preferred unless the client ranks gzip higher"""
+        brotli = pytest.importorskip('brotli')
+        response = self.get(client, '/properties/', 'gzip, deflate, br')
+        assert response.headers['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(response.data)) == client.get('/properties/').get_json()
+        assert self.get(client, '/properties/', 'br;q=0.5, gzip').headers['Content-Encoding'] == 'gzip'
+
+    def test_skipped_responses(self, client, app, monkeypatch):
+        """Test small, streamed and unaccepted responses are sent as is, and COMPRESSION turns it off"""
+        assert 'Content-Encoding' not in self.get(client, '/properties/1', 'gzip').headers
+        assert 'Content-Encoding' not in self.get(client, '/properties/?stream=true', 'gzip').headers
+        assert 'Content-Encoding' not in self.get(client, '/properties/', 'identity').headers
+        monkeypatch.setitem(app.config, 'COMPRESSION', False)
+        assert 'Content-Encoding' not in self.get(client, '/properties/', 'gzip').headers
+
+    def test_unchanged_responses_reuse_compressed_body(self, client, admin_headers):
+        """Test a response with an unchanged ETag is not compressed again, and a write invalidates it"""
+        first = self.get(client, '/properties/', 'gzip')
+        second = self.get(client, '/properties/', 'gzip')
+        assert second.data == first.data
+        stats = client.get('/admin/compression', headers=admin_headers).get_json()['data']
+        assert stats['encodings']['gzip']['responses'] == 2
+        assert stats['encodings']['gzip']['cacheHits'] == 1
+
+        assert client.put('/properties/1', json={'address': '1 Avenue Foch, Paris'}).status_code == 200
+        third = self.get(client, '/properties/', 'gzip')
+        assert b'Avenue Foch' in gzip.decompress(third.data)
+        stats = client.get('/admin/compression', headers=admin_headers).get_json()['data']
+        assert stats['encodings']['gzip']['cacheHits'] == 1
+
+    def test_metrics(self, client, admin_headers):
+        """Test the compression ratio and CPU time are reported, and in the Server-Timing header"""
+        response = self.get(client, '/properties/', 'gzip')
+        assert 'compress;dur=' in response.headers['Server-Timing']
+        client.get('/properties/1')
+
+        stats = client.get('/admin/compression', headers=admin_headers).get_json()['data']
+        gzip_stats = stats['encodings']['gzip']
+        assert gzip_stats['bytesIn'] > gzip_stats['bytesOut'] == len(response.data)
+        assert gzip_stats['ratio'] == gzip_stats['bytesIn'] / gzip_stats['bytesOut'] > 3
+        assert gzip_stats['cpuSeconds'] >= 0
+        assert stats['uncompressed']['responses'] >= 1
+
+        assert client.delete('/admin/compression', headers=admin_headers).status_code == 200
+        assert client.get('/admin/compression', headers=admin_headers).get_json()['data']['encodings'] == {}
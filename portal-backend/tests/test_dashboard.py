@@ -0,0 +1,90 @@
+import pytest
+from datetime import date, timedelta
+from app.models import (Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance,
+                        MaintenanceStatus)
+from app.summary import summary_statement, summarize, view_needs_refresh
+
+class TestDashboardSummary:
+    """Test suite for the dashboard summary"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Two properties, three leases of which two are active today, and two maintenance tasks"""
+        vacant, occupied = PropertyStatus(description='Vacant'), PropertyStatus(description='Occupied')
+        residential, commercial = PropertyType(description='Residential'), PropertyType(description='Commercial')
+        paid, overdue = PaymentStatus(description='Paid'), PaymentStatus(description='Overdue')
+        completed, pending = MaintenanceStatus(description='Completed'), MaintenanceStatus(description='Pending')
+        tenant = Tenant(name='Jean Dupont', contactinfo='jean@example.com')
+        db.session.add_all([vacant, occupied, residential, commercial, paid, overdue, completed, pending, tenant])
+        db.session.flush()
+
+        house = Property(address='1 Rue des Lilas', propertytypeid=residential.propertytypeid,
+                         propertystatusid=occupied.propertystatusid, purchasedate=date(2010, 1, 1), price=300000)
+        shop = Property(address='2 Avenue Foch', propertytypeid=commercial.propertytypeid,
+                        propertystatusid=vacant.propertystatusid, purchasedate=date(2012, 1, 1), price=900000.5)
+        db.session.add_all([house, shop])
+        db.session.flush()
+
+        today = date.today()
+        db.session.add_all([
+            Lease(tenantid=tenant.tenantid, propertyid=house.propertyid, leasetermstart=today - timedelta(days=30),
+                  leasetermend=today + timedelta(days=30), paymentstatusid=overdue.paymentstatusid),
+            Lease(tenantid=tenant.tenantid, propertyid=shop.propertyid, leasetermstart=today,
+                  leasetermend=today + timedelta(days=365), paymentstatusid=paid.paymentstatusid),
+            Lease(tenantid=tenant.tenantid, propertyid=house.propertyid, leasetermstart=date(2015, 1, 1),
+                  leasetermend=date(2015, 12, 31), paymentstatusid=overdue.paymentstatusid),
+            Maintenance(description='Fix leaking roof', maintenancestatusid=completed.maintenancestatusid,
+                        scheduleddate=date(2020, 5, 1), propertyid=house.propertyid),
+            Maintenance(description='Replace locks', maintenancestatusid=pending.maintenancestatusid,
+                        scheduleddate=date(2021, 5, 1), propertyid=shop.propertyid)
+        ])
+        db.session.commit()
+
+    def test_summary(self, client):
+        """Test the summary counts properties, leases and maintenance tasks by status"""
+        response = client.get('/dashboard/summary')
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert data['asOf'] == date.today().isoformat()
+        assert data['source'] == 'live'
+        assert data['properties'] == {
+            'total': 2, 'totalValue': 1200000.5, 'byStatus': {'Occupied': 1, 'Vacant': 1},
+            'byType': {'Residential': 1, 'Commercial': 1}, 'valueByType': {'Residential': 300000.0, 'Commercial': 900000.5}
+        }
+        assert data['leases'] == {'total': 3, 'active': 2, 'overdue': 2, 'activeOverdue': 1,
+                                  'byPaymentStatus': {'Overdue': 2, 'Paid': 1}}
+        assert data['maintenance'] == {'total': 2, 'open': 1, 'byStatus': {'Completed': 1, 'Pending': 1}}
+
+    def test_summary_is_one_query(self, client, query_counter):
+        """Test the aggregates come from a single statement once the lookups are cached"""
+        client.get('/dashboard/summary')
+        query_counter.clear()
+        client.get('/dashboard/summary')
+        assert len([q for q in query_counter if 'table_versions' not in q]) == 1
+
+    def test_active_leases_follow_the_date(self, db):
+        """Test a lease only counts as active between its start and end dates"""
+        today = date.today()
+        rows = db.session.execute(summary_statement(today + timedelta(days=60))).all()
+        assert summarize(rows, today + timedelta(days=60))['leases']['active'] == 1
+        rows = db.session.execute(summary_statement(date(2015, 6, 1))).all()
+        assert summarize(rows, date(2015, 6, 1))['leases']['active'] == 1
+
+    def test_empty_portfolio(self, db):
+        """Test an empty portfolio gives zero totals"""
+        for model in (Maintenance, Lease, Property):
+            model.query.delete()
+        db.session.commit()
+        data = summarize(db.session.execute(summary_statement(date.today())).all(), date.today())
+        assert data['properties']['total'] == data['leases']['active'] == data['maintenance']['open'] == 0
+        assert data['properties']['totalValue'] == 0
+
+    def test_view_refresh_decision(self):
+        """Test the view is refreshed on a new day or after changes, and an empty view only after changes"""
+        today = date(2026, 3, 2)
+        assert view_needs_refresh(today - timedelta(days=1), today, recent=True, changed=False)
+        assert not view_needs_refresh(today, today, recent=False, changed=False)
+        assert view_needs_refresh(today, today, recent=False, changed=True)
+        assert not view_needs_refresh(today, today, recent=True, changed=True)
+        assert not view_needs_refresh(None, today, recent=False, changed=False)
+        assert view_needs_refresh(None, today, recent=False, changed=True)
@@ -0,0 +1,82 @@
+import pytest
+import json
+from datetime import date
+from app.models import Tenant, Property, PropertyType, PropertyStatus
+
+class TestConditionalRequests:
+    """Test suite for ETag / If-None-Match handling"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Vacant')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([property_type, property_status, tenant])
+        db.session.commit()
+
+        db.session.add(Property(
+            address='123 Test St',
+            propertytypeid=property_type.propertytypeid,
+            propertystatusid=property_status.propertystatusid,
+            purchasedate=date(2024, 1, 15),
+            price=500000
+        ))
+        db.session.commit()
+
+    def revalidate(self, client, url, etag):
+        return client.get(url, headers={'If-None-Match': etag})
+
+    def test_list_returns_weak_etag(self, client):
+        """Test list responses carry a weak ETag"""
+        response = client.get('/properties/')
+        assert response.status_code == 200
+        assert response.headers['ETag'].startswith('W/"')
+
+    def test_matching_etag_returns_304_without_query(self, client, query_counter):
+        """Test an unchanged list is answered with 304 and only the version lookup"""
+        etag = client.get('/tenants/').headers['ETag']
+        del query_counter[:]
+        response = self.revalidate(client, '/tenants/', etag)
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        assert len(query_counter) == 1
+        assert 'table_versions' in query_counter[0]
+
+    def test_query_string_is_part_of_etag(self, client):
+        """Test different query strings get different tags, independent of parameter order"""
+        etag = client.get('/properties/?sort=price&order=desc').headers['ETag']
+        assert client.get('/properties/?order=desc&sort=price').headers['ETag'] == etag
+        assert client.get('/properties/?sort=price').headers['ETag'] != etag
+        assert client.get('/properties/?sort=price&order=desc&stream=1').headers['ETag'] != etag
+
+    def test_write_changes_etag(self, client):
+        """Test a create through the API invalidates the previous tag"""
+        etag = client.get('/tenants/').headers['ETag']
+        response = client.post('/tenants/', data=json.dumps({'name': 'Jane Smith', 'contactinfo': 'jane@example.com'}),
+                               content_type='application/json')
+        assert response.status_code == 201
+        response = self.revalidate(client, '/tenants/', etag)
+        assert response.status_code == 200
+        assert len(json.loads(response.data)['data']) == 2
+
+    def test_related_table_write_changes_etag(self, client):
+        """Test renaming a property status changes the tag of the property list"""
+        etag = client.get('/properties/').headers['ETag']
+        client.put('/property-status/1', data=json.dumps({'description': 'Available'}),
+                   content_type='application/json')
+        response = self.revalidate(client, '/properties/', etag)
+        assert response.status_code == 200
+        assert json.loads(response.data)['data'][0]['status'] == 'Available'
+
+    def test_status_list_revalidation(self, client):
+        """Test status lookup lists support conditional requests"""
+        etag = client.get('/property-type/').headers['ETag']
+        assert self.revalidate(client, '/property-type/', etag).status_code == 304
+
+    def test_not_found_has_no_etag(self, client):
+        """Test error responses are not tagged"""
+        response = client.get('/properties/9999')
+        assert response.status_code == 404
+        assert 'ETag' not in response.headers
@@ -0,0 +1,73 @@
+import pytest
+from datetime import date, timedelta
+from app.blueprints.leases.routes import expiring_cache
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+
+class TestExpiringLeases:
+    """Test suite for the expiring-lease calendar"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Five properties with one lease each, ending on 2024-03-04 (a Monday) plus 0, 3, 7, 8 and 40 days"""
+        expiring_cache.clear()
+        status, type_ = PropertyStatus(description='Occupied'), PropertyType(description='Residential')
+        paid = PaymentStatus(description='Paid')
+        tenant = Tenant(name='Jean Dupont', contactinfo='jean@example.com')
+        db.session.add_all([status, type_, paid, tenant])
+        db.session.flush()
+        self.ends = [date(2024, 3, 4) + timedelta(days=offset) for offset in (0, 3, 7, 8, 40)]
+        for number, end in enumerate(self.ends):
+            house = Property(address=f'{number} Rue des Lilas', propertytypeid=type_.propertytypeid,
+                             propertystatusid=status.propertystatusid, purchasedate=date(2010, 1, 1), price=300000)
+            db.session.add(house)
+            db.session.flush()
+            db.session.add(Lease(tenantid=tenant.tenantid, propertyid=house.propertyid, leasetermstart=date(2023, 1, 1),
+                                 leasetermend=end, paymentstatusid=paid.paymentstatusid))
+        db.session.commit()
+        yield
+        expiring_cache.clear()
+
+    def test_grouped_by_week(self, client):
+        """Test the leases ending in the window come by end date in Monday-based weeks, with tenant and property"""
+        response = client.get('/leases/expiring?from=2024-03-04&days=30')
+        assert response.status_code == 200
+        body = response.get_json()
+        assert (body['from'], body['to']) == ('2024-03-04', '2024-04-02')
+        assert [(week['week'], [lease['leaseEnd'] for lease in week['leases']]) for week in body['data']] == [
+            ('2024-03-04', ['2024-03-04', '2024-03-07']),
+            ('2024-03-11', ['2024-03-11', '2024-03-12'])
+        ]
+        lease = body['data'][0]['leases'][0]
+        assert (lease['tenantName'], lease['propertyAddress'], lease['paymentStatus']) == \
+            ('Jean Dupont', '0 Rue des Lilas', 'Paid')
+
+    def test_keyset_pages(self, client):
+        """Test pages follow each other on the end date without gaps or repeats"""
+        ends, path = [], '/leases/expiring?from=2024-03-01&days=60&limit=2'
+        cursor = None
+        while True:
+            body = client.get(path + (f'&cursor={cursor}' if cursor else '')).get_json()
+            ends += [lease['leaseEnd'] for week in body['data'] for lease in week['leases']]
+            cursor = body['nextCursor']
+            if not cursor:
+                break
+        assert ends == [end.isoformat() for end in self.ends]
+
+    def test_common_windows_are_cached(self, client, db):
+        """Test a 30-day window is served from the cache until it expires, other windows are not cached"""
+        path = '/leases/expiring?from=2024-03-04&days=30'
+        assert len(client.get(path).get_json()['data']) == 2
+        Lease.query.delete()
+        db.session.commit()
+        assert len(client.get(path).get_json()['data']) == 2
+        assert client.get('/leases/expiring?from=2024-03-04&days=31').get_json()['data'] == []
+
+        expiring_cache.clear()
+        assert client.get(path).get_json()['data'] == []
+
+    def test_invalid_parameters(self, client):
+        """Test an invalid window or cursor is rejected"""
+        for query in ('days=0', 'days=367', 'days=soon', 'from=2024-02-30', 'cursor=bad&limit=2'):
+            response = client.get(f'/leases/expiring?{query}')
+            assert response.status_code == 400, query
+            assert response.get_json()['error']
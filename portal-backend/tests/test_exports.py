@@ -0,0 +1,76 @@
+import pytest
+import csv
+import io
+import zipfile
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+from app.exports import csv_chunks
+from app.utils import STREAM_BATCH_SIZE
+
+class TestExports:
+    """Test suite for the CSV/XLSX export endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        paid, overdue = PaymentStatus(description='Paid'), PaymentStatus(description='Overdue')
+        tenant = Tenant(name='Jane & Co', contactinfo='jane@example.com')
+        db.session.add_all([property_type, property_status, paid, overdue, tenant])
+        db.session.commit()
+
+        db.session.add_all([
+            Property(address=f'{i} Export St', propertytypeid=property_type.propertytypeid,
+                     propertystatusid=property_status.propertystatusid, purchasedate=date(2020, 1, 1), price=1000 + i)
+            for i in range(1, 4)
+        ])
+        db.session.commit()
+
+        db.session.add_all([
+            Lease(tenantid=tenant.tenantid, propertyid=i, leasetermstart=date(2024, 1, i),
+                  leasetermend=date(2024, 12, 31), paymentstatusid=paid.paymentstatusid if i < 3 else overdue.paymentstatusid)
+            for i in range(1, 4)
+        ])
+        db.session.commit()
+
+    def read_csv(self, response):
+        return list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+    def test_csv_export_includes_joined_columns(self, client):
+        """Test the export has a header row and the joined tenant, address and status text"""
+        response = client.get('/leases/export?fields=id,tenantName,propertyAddress,paymentStatus,leaseStart')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert response.headers['Content-Disposition'] == 'attachment; filename=leases.csv'
+        rows = self.read_csv(response)
+        assert rows[0] == ['id', 'tenantName', 'propertyAddress', 'paymentStatus', 'leaseStart']
+        assert rows[1] == ['1', 'Jane & Co', '1 Export St', 'Paid', '2024-01-01']
+        assert len(rows) == 4
+
+    def test_export_applies_list_filters_and_sort(self, client):
+        """Test the export accepts the same filters and sort as the list endpoint"""
+        rows = self.read_csv(client.get('/leases/export?paymentStatus=paid&sort=leaseStart&order=desc&fields=id'))
+        assert rows == [['id'], ['2'], ['1']]
+        rows = self.read_csv(client.get('/properties/export?sort=price&order=desc&fields=address,status'))
+        assert rows[1] == ['3 Export St', 'Occupied']
+
+    def test_csv_chunks_flush_per_batch(self):
+        """Test CSV output is yielded once per batch of rows instead of at the end"""
+        chunks = list(csv_chunks(['id'], ([i] for i in range(STREAM_BATCH_SIZE * 2 + 1))))
+        assert len(chunks) == 3
+        assert chunks[0].startswith('id\r\n0\r\n')
+
+    def test_xlsx_export(self, client):
+        """Test the XLSX export is a workbook whose sheet holds the rows"""
+        response = client.get('/properties/export?format=xlsx&fields=address,price')
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert 'xl/workbook.xml' in archive.namelist()
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        assert sheet.count('<row>') == 4
+        assert '<c t="inlineStr"><is><t>1 Export St</t></is></c><c><v>1001.0</v></c>' in sheet
+
+    def test_invalid_format(self, client):
+        """Test an unknown format is rejected"""
+        assert client.get('/maintenance/export?format=pdf').status_code == 400
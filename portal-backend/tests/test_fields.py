@@ -0,0 +1,98 @@
+import pytest
+import json
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance, MaintenanceStatus
+
+class TestSparseFieldsets:
+    """Test suite for the fields= parameter on list endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        payment_status = PaymentStatus(description='Paid')
+        maintenance_status = MaintenanceStatus(description='Pending')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([property_type, property_status, payment_status, maintenance_status, tenant])
+        db.session.commit()
+
+        test_property = Property(
+            address='123 Test St',
+            propertytypeid=property_type.propertytypeid,
+            propertystatusid=property_status.propertystatusid,
+            purchasedate=date(2024, 1, 15),
+            price=500000
+        )
+        db.session.add(test_property)
+        db.session.commit()
+
+        db.session.add_all([
+            Lease(
+                tenantid=tenant.tenantid,
+                propertyid=test_property.propertyid,
+                leasetermstart=date(2024, 1, 1),
+                leasetermend=date(2025, 1, 1),
+                paymentstatusid=payment_status.paymentstatusid
+            ),
+            Maintenance(
+                description='Fix broken window',
+                maintenancestatusid=maintenance_status.maintenancestatusid,
+                scheduleddate=date(2024, 3, 15),
+                propertyid=test_property.propertyid
+            )
+        ])
+        db.session.commit()
+
+    def test_properties_fields(self, client, query_counter):
+        """Test only the requested property columns are selected and returned"""
+        response = client.get('/properties/?fields=id,status')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['data'] == [{'id': 1, 'status': 'Occupied'}]
+        assert 'address' not in query_counter[-1]
+        assert 'price' not in query_counter[-1]
+
+    def test_fields_with_sort_and_limit(self, client):
+        """Test the sort key is fetched for the cursor even when it is not returned"""
+        data = json.loads(client.get('/properties/?fields=address&sort=price&limit=1').data)
+        assert data['data'] == [{'address': '123 Test St'}]
+        assert data['nextCursor'] is None
+
+    def test_leases_fields(self, client):
+        """Test sparse fieldsets on joined lease columns"""
+        data = json.loads(client.get('/leases/?fields=tenantName,leaseEnd').data)
+        assert data['data'] == [{'tenantName': 'John Doe', 'leaseEnd': '2025-01-01'}]
+
+    def test_tenants_and_maintenance_fields(self, client):
+        """Test sparse fieldsets on tenants and maintenance"""
+        data = json.loads(client.get('/tenants/?fields=name').data)
+        assert data['data'] == [{'name': 'John Doe'}]
+        data = json.loads(client.get('/maintenance/?fields=id,propertyAddress').data)
+        assert data['data'] == [{'id': 1, 'propertyAddress': '123 Test St'}]
+
+    def test_default_fields_unchanged(self, client):
+        """Test omitting fields returns every field"""
+        data = json.loads(client.get('/properties/').data)
+        assert data['data'] == [{
+            'id': 1,
+            'address': '123 Test St',
+            'type': 'Residential',
+            'status': 'Occupied',
+            'purchaseDate': '2024-01-15',
+            'price': 500000.0
+        }]
+
+    def test_blank_fields_return_every_field(self, client):
+        """Test a fields parameter naming no field is treated as omitted"""
+        expected = json.loads(client.get('/properties/').data)['data']
+        for fields in (',,', '%20', ''):
+            assert json.loads(client.get(f'/properties/?fields={fields}').data)['data'] == expected
+        data = json.loads(client.get('/tenants/?fields=%20,').data)['data']
+        assert data == [{'id': 1, 'name': 'John Doe', 'contactInfo': 'john@example.com'}]
+
+    def test_unknown_field(self, client):
+        """Test an unknown field is rejected"""
+        response = client.get('/leases/?fields=id,rent')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'Unknown fields: rent'
@@ -0,0 +1,122 @@
+import pytest
+import io
+import json
+import os
+import time
+from datetime import date
+from sqlalchemy.exc import OperationalError
+from app import imports
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+
+class TestCsvImport:
+    """Test suite for the streaming CSV import"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db, app, monkeypatch, tmp_path):
+        """Set up test data before each test"""
+        monkeypatch.setitem(app.config, 'IMPORT_DIR', str(tmp_path))
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        payment_status = PaymentStatus(description='Paid')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([property_type, property_status, payment_status, tenant])
+        db.session.commit()
+
+        db.session.add(Property(address='1 Test St', propertytypeid=property_type.propertytypeid,
+                                propertystatusid=property_status.propertystatusid, purchasedate=date(2020, 1, 1),
+                                price=100000))
+        db.session.commit()
+
+    def upload(self, client, resource, content, query=''):
+        response = client.post(f'/imports/{resource}{query}', data={'file': (io.BytesIO(content.encode()), 'data.csv')},
+                               content_type='multipart/form-data')
+        return response, [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    def test_import_resolves_descriptions_and_reports_progress(self, client):
+        """Test rows are imported in batches with one progress line per batch"""
+        rows = ''.join(f'{i} Import St,residential,Occupied,2024-01-15,{1000 + i}\n' for i in range(5))
+        response, lines = self.upload(client, 'properties', 'address,type,status,purchaseDate,price\n' + rows,
+                                      '?batchSize=2')
+        assert response.status_code == 200
+        assert [line['processed'] for line in lines] == [2, 4, 5, 5]
+        assert lines[-1] == {'processed': 5, 'imported': 5, 'rejected': 0, 'done': True, 'rejectedFile': None}
+        assert Property.query.count() == 6
+
+    def test_rejected_rows_file(self, client):
+        """Test invalid rows are skipped and written to a downloadable rejected-rows file"""
+        content = ('name,contactinfo\n'
+                   'Jane Roe,jane@example.com\n'
+                   'Bad Contact,not-a-contact\n'
+                   ',empty@example.com\n')
+        response, lines = self.upload(client, 'tenants', content)
+        assert lines[-1]['imported'] == 1 and lines[-1]['rejected'] == 2
+
+        rejected = client.get(lines[-1]['rejectedFile'])
+        assert rejected.status_code == 200
+        assert rejected.get_data(as_text=True).splitlines() == [
+            'line,error,name,contactinfo',
+            '3,Contact info must be a valid email or phone number,Bad Contact,not-a-contact',
+            '4,Missing required fields: name,,empty@example.com'
+        ]
+        assert Tenant.query.count() == 2
+
+    def test_lease_import_checks_overlaps_and_lookups(self, client):
+        """Test lease rows use the bulk overlap check and payment status descriptions"""
+        content = ('tenantid,propertyid,leasetermstart,leasetermend,paymentstatus\n'
+                   '1,1,2024-01-01,2024-12-31,Paid\n'
+                   '1,1,2024-06-01,2025-05-31,Paid\n'
+                   '1,1,2025-01-01,2025-12-31,Overdue\n')
+        response, lines = self.upload(client, 'leases', content)
+        assert lines[-1]['imported'] == 1
+        rejected = client.get(lines[-1]['rejectedFile']).get_data(as_text=True)
+        assert 'overlapping lease' in rejected
+        assert 'Unknown paymentstatus: Overdue' in rejected
+        assert Lease.query.count() == 1
+
+    def test_raw_csv_body(self, client):
+        """Test a text/csv request body is imported without a multipart upload"""
+        response = client.post('/imports/tenants', data='name,contactinfo\nJane Roe,jane@example.com\n',
+                               content_type='text/csv')
+        assert json.loads(response.get_data(as_text=True).splitlines()[-1])['imported'] == 1
+
+    def test_invalid_requests(self, client):
+        """Test unknown resources, missing files and bad batch sizes are rejected"""
+        assert client.post('/imports/owners', data='a\n', content_type='text/csv').status_code == 404
+        assert client.post('/imports/tenants', json={}).status_code == 400
+        assert client.post('/imports/tenants?batchSize=0', data='a\n', content_type='text/csv').status_code == 400
+        assert client.get('/imports/../config/rejected').status_code == 404
+
+    def test_failed_batch_rows_are_rejected(self, client, monkeypatch):
+        """Test a batch the database refuses is rolled back and its rows rejected, later batches still import"""
+        bulk_insert, calls = imports.bulk_insert, []
+
+        def failing_bulk_insert(model, rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise OperationalError('INSERT INTO tenants', {}, Exception('canceling statement due to statement timeout'))
+            return bulk_insert(model, rows)
+
+        monkeypatch.setattr(imports, 'bulk_insert', failing_bulk_insert)
+        content = 'name,contactinfo\n' + ''.join(f'Tenant {i},tenant{i}@example.com\n' for i in range(4))
+        response, lines = self.upload(client, 'tenants', content, '?batchSize=2')
+        assert lines[-1]['imported'] == 2 and lines[-1]['rejected'] == 2
+        assert 'error' not in lines[-1]
+        rejected = client.get(lines[-1]['rejectedFile']).get_data(as_text=True).splitlines()
+        assert [row.split(',')[0] for row in rejected[1:]] == ['2', '3']
+        assert 'statement timeout' in rejected[1]
+        assert Tenant.query.count() == 3
+
+    def test_expired_rejected_files_are_removed(self, app, client, tmp_path):
+        """Test rejected-row files older than IMPORT_REJECTED_SECONDS are deleted, newer ones kept"""
+        expired, recent, other = (tmp_path / f'{"a" * 32}-rejected.csv', tmp_path / f'{"b" * 32}-rejected.csv',
+                                  tmp_path / 'notes.txt')
+        for path in (expired, recent, other):
+            path.write_text('line,error\n')
+        old = time.time() - app.config['IMPORT_REJECTED_SECONDS'] - 60
+        os.utime(expired, (old, old))
+        os.utime(other, (old, old))
+
+        assert client.get(f'/imports/{"a" * 32}/rejected').status_code == 404
+        assert not expired.exists()
+        assert client.get(f'/imports/{"b" * 32}/rejected').status_code == 200
+        assert recent.exists() and other.exists()
@@ -0,0 +1,84 @@
+import pytest
+import re
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.instrumentation import reset_route_summary
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+
+class TestInstrumentation:
+    """Test suite for per-request SQL instrumentation"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        reset_route_summary()
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        paid = PaymentStatus(description='Paid')
+        tenant = Tenant(name='Jane Doe', contactinfo='jane@example.com')
+        db.session.add_all([property_type, property_status, paid, tenant])
+        db.session.commit()
+        db.session.add(Property(address='1 Timing St', propertytypeid=property_type.propertytypeid,
+                                propertystatusid=property_status.propertystatusid, purchasedate=date(2020, 1, 1),
+                                price=1000))
+        db.session.commit()
+        db.session.add(Lease(tenantid=tenant.tenantid, propertyid=1, leasetermstart=date(2024, 1, 1),
+                             leasetermend=date(2024, 12, 31), paymentstatusid=paid.paymentstatusid))
+        db.session.commit()
+        yield
+        reset_route_summary()
+
+    def parse_server_timing(self, header):
+        metrics = {}
+        for name, params in re.findall(r'(\w+)((?:;\w+=(?:"[^"]*"|[^,;]*))*)', header):
+            metrics[name] = dict(param.split('=', 1) for param in re.findall(r';(\w+=(?:"[^"]*"|[^,;]*))', params))
+        return metrics
+
+    def test_server_timing_header(self, client, query_counter):
+        """Test responses report the queries made, SQL time, serialization time and total time"""
+        response = client.get('/leases/')
+        assert response.status_code == 200
+        metrics = self.parse_server_timing(response.headers['Server-Timing'])
+        assert set(metrics) == {'db', 'serialize', 'total'}
+        assert metrics['db']['desc'].startswith(f'"{len(query_counter)} queries')
+        assert 0 <= float(metrics['db']['dur']) <= float(metrics['total']['dur'])
+        assert float(metrics['serialize']['dur']) > 0
+
+    def test_failed_statement_leaves_no_start_time(self, app, db):
+        """Test a statement that raises does not leave its start time behind for the next one"""
+        with db.engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text('SELECT * FROM missing_table'))
+            assert connection.info.get('query_start') == []
+            connection.execute(text('SELECT 1'))
+            assert connection.info['query_start'] == []
+
+    def test_server_timing_can_be_disabled(self, client, app, monkeypatch):
+        """Test SERVER_TIMING turns the header off"""
+        monkeypatch.setitem(app.config, 'SERVER_TIMING', False)
+        assert 'Server-Timing' not in client.get('/leases/').headers
+
+    def test_route_summary(self, client, admin_headers):
+        """Test requests are aggregated per route rule and method"""
+        client.get('/leases/1')
+        client.get('/leases/1')
+        client.get('/tenants/')
+        client.put('/tenants/1', json={'name': 'Jane Roe', 'contactinfo': 'jane@example.com'})
+
+        summaries = client.get('/admin/routes', headers=admin_headers).get_json()['data']
+        routes = {summary['route']: summary for summary in summaries}
+        lease = routes['GET /leases/<int:id>']
+        assert lease['requests'] == 2
+        assert lease['queries'] > 0
+        assert lease['avgQueries'] == lease['queries'] / 2
+        assert routes['PUT /tenants/<int:id>']['rows'] >= 1
+        assert 'GET /tenants/' in routes
+
+    def test_reset_route_summary(self, client, admin_headers):
+        """Test the summary can be cleared"""
+        client.get('/tenants/')
+        assert client.delete('/admin/routes', headers=admin_headers).status_code == 200
+        summaries = client.get('/admin/routes', headers=admin_headers).get_json()['data']
+        routes = [summary['route'] for summary in summaries]
+        assert 'GET /tenants/' not in routes
@@ -0,0 +1,48 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask
+import app.json_provider as json_provider
+from app.instrumentation import TimedJSONProvider
+from app.json_provider import OrjsonProvider, StdlibJSONProvider, init_json
+
+PAYLOAD = {'data': [{'id': 1, 'leaseStart': date(2024, 1, 31), 'price': Decimal('250000.50'), 'name': 'Léa Curie',
+                     'updated': datetime(2024, 2, 1, 8, 30)}]}
+EXPECTED = {'data': [{'id': 1, 'leaseStart': '2024-01-31', 'price': 250000.5, 'name': 'Léa Curie',
+                      'updated': '2024-02-01T08:30:00'}]}
+
+class TestJSONProvider:
+    """Test suite for the JSON providers"""
+
+    def test_providers_encode_the_same(self):
+        """Test both providers write dates in ISO 8601 and Decimals as numbers, with the same sorted keys"""
+        flask_app = Flask(__name__)
+        stdlib, fast = StdlibJSONProvider(flask_app), OrjsonProvider(flask_app)
+        for provider in (stdlib, fast):
+            assert json.loads(provider.dumps(PAYLOAD)) == EXPECTED
+            assert provider.loads(provider.dumps(PAYLOAD)) == EXPECTED
+        assert list(json.loads(fast.dumps(PAYLOAD))['data'][0]) == sorted(EXPECTED['data'][0])
+
+        with flask_app.app_context():
+            response = fast.response(PAYLOAD)
+        assert response.mimetype == 'application/json'
+        assert response.get_data().endswith(b'\n')
+        assert json.loads(response.get_data()) == EXPECTED
+
+    def test_app_uses_orjson(self, app, client):
+        """Test create_app installs the orjson provider under the instrumentation wrapper"""
+        assert isinstance(app.json, TimedJSONProvider)
+        assert isinstance(app.json.provider, OrjsonProvider)
+        assert client.get('/property-status/').get_json() == {'data': []}
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        """Test the stdlib provider is used when orjson is missing or JSON_PROVIDER asks for it"""
+        flask_app = Flask(__name__)
+        flask_app.config['JSON_PROVIDER'] = 'stdlib'
+        init_json(flask_app)
+        assert type(flask_app.json) is StdlibJSONProvider
+
+        flask_app.config['JSON_PROVIDER'] = 'orjson'
+        monkeypatch.setattr(json_provider, 'orjson', None)
+        init_json(flask_app)
+        assert type(flask_app.json) is StdlibJSONProvider
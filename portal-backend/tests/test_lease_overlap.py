@@ -0,0 +1,76 @@
+import pytest
+import json
+from datetime import date
+from sqlalchemy.exc import IntegrityError
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+
+class TestLeaseOverlap:
+    """Test suite for database-enforced lease overlap detection"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        payment_status = PaymentStatus(description='Paid')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([property_type, property_status, payment_status, tenant])
+        db.session.commit()
+
+        db.session.add_all([
+            Property(address=f'{i} Test St', propertytypeid=property_type.propertytypeid,
+                     propertystatusid=property_status.propertystatusid, purchasedate=date(2020, 1, 1), price=100000)
+            for i in (1, 2)
+        ])
+        db.session.commit()
+
+        db.session.add(Lease(tenantid=1, propertyid=1, leasetermstart=date(2024, 1, 1),
+                             leasetermend=date(2024, 12, 31), paymentstatusid=1))
+        db.session.commit()
+
+    def post_lease(self, client, property_id, start, end):
+        return client.post('/leases/', data=json.dumps({
+            'tenantid': 1,
+            'propertyid': property_id,
+            'leasetermstart': start,
+            'leasetermend': end,
+            'paymentstatusid': 1
+        }), content_type='application/json')
+
+    def test_overlapping_create_conflicts(self, client):
+        """Test creating an overlapping lease returns 409"""
+        response = self.post_lease(client, 1, '2024-06-01', '2025-06-01')
+        assert response.status_code == 409
+        assert 'overlapping lease' in json.loads(response.data)['error']
+
+    def test_shared_boundary_day_conflicts(self, client):
+        """Test lease terms are inclusive of their end date"""
+        assert self.post_lease(client, 1, '2024-12-31', '2025-06-01').status_code == 409
+
+    def test_adjacent_and_other_property_leases_allowed(self, client):
+        """Test back-to-back leases and leases on other properties are accepted"""
+        assert self.post_lease(client, 1, '2025-01-01', '2025-12-31').status_code == 201
+        assert self.post_lease(client, 2, '2024-06-01', '2025-06-01').status_code == 201
+
+    def test_update_into_overlap_conflicts(self, client):
+        """Test moving a lease onto another one's term returns 409"""
+        lease_id = json.loads(self.post_lease(client, 1, '2025-01-01', '2025-12-31').data)['data']['id']
+        response = client.put(f'/leases/{lease_id}', data=json.dumps({'leasetermstart': '2024-11-01'}),
+                              content_type='application/json')
+        assert response.status_code == 409
+        assert json.loads(client.get(f'/leases/{lease_id}').data)['data']['leaseStart'] == '2025-01-01'
+
+    def test_update_own_term_allowed(self, client):
+        """Test a lease may be extended without conflicting with itself"""
+        response = client.put('/leases/1', data=json.dumps({'leasetermend': '2025-03-31'}),
+                              content_type='application/json')
+        assert response.status_code == 200
+        assert json.loads(client.get('/leases/1').data)['data']['leaseEnd'] == '2025-03-31'
+
+    def test_constraint_enforced_outside_routes(self, db):
+        """Test the database itself rejects overlapping terms"""
+        db.session.add(Lease(tenantid=1, propertyid=1, leasetermstart=date(2024, 3, 1),
+                             leasetermend=date(2024, 4, 1), paymentstatusid=1))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
@@ -0,0 +1,109 @@
+import pytest
+import json
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+from app.versions import bump_version
+
+class TestLookupCache:
+    """Test suite for the process-local lookup table cache"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        residential = PropertyType(description='Residential')
+        commercial = PropertyType(description='Commercial')
+        vacant = PropertyStatus(description='Vacant')
+        occupied = PropertyStatus(description='Occupied')
+        paid = PaymentStatus(description='Paid')
+        overdue = PaymentStatus(description='Overdue')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([residential, commercial, vacant, occupied, paid, overdue, tenant])
+        db.session.commit()
+
+        properties = [
+            Property(address='1 Test St', propertytypeid=residential.propertytypeid,
+                     propertystatusid=vacant.propertystatusid, purchasedate=date(2020, 1, 1), price=100000),
+            Property(address='2 Test St', propertytypeid=commercial.propertytypeid,
+                     propertystatusid=occupied.propertystatusid, purchasedate=date(2020, 1, 1), price=200000)
+        ]
+        db.session.add_all(properties)
+        db.session.commit()
+
+        db.session.add_all([
+            Lease(tenantid=tenant.tenantid, propertyid=properties[0].propertyid, leasetermstart=date(2024, 1, 1),
+                  leasetermend=date(2025, 1, 1), paymentstatusid=paid.paymentstatusid),
+            Lease(tenantid=tenant.tenantid, propertyid=properties[1].propertyid, leasetermstart=date(2024, 1, 1),
+                  leasetermend=date(2025, 1, 1), paymentstatusid=overdue.paymentstatusid)
+        ])
+        db.session.commit()
+
+    def test_status_list_served_from_cache(self, client, query_counter):
+        """Test repeated lookup GETs do not query the database"""
+        first = json.loads(client.get('/property-status/').data)['data']
+        assert [s['description'] for s in first] == ['Vacant', 'Occupied']
+        del query_counter[:]
+        assert json.loads(client.get('/property-status/').data)['data'] == first
+        assert client.get('/property-status/2').status_code == 200
+        assert client.get('/property-status/99').status_code == 404
+        assert all('table_versions' in q for q in query_counter)
+
+    def test_create_invalidates_cache(self, client):
+        """Test POST makes the new row visible to cached GETs"""
+        client.get('/payment-status/')
+        response = client.post('/payment-status/', data=json.dumps({'description': 'Pending'}),
+                               content_type='application/json')
+        assert response.status_code == 201
+        new_id = json.loads(response.data)['data']['id']
+        data = json.loads(client.get('/payment-status/').data)['data']
+        assert [s['description'] for s in data] == ['Paid', 'Overdue', 'Pending']
+        assert json.loads(client.get(f'/payment-status/{new_id}').data)['data']['description'] == 'Pending'
+
+    def test_update_and_delete_invalidate_cache(self, client):
+        """Test PUT and DELETE are reflected in cached GETs"""
+        client.get('/property-type/')
+        response = client.post('/property-type/', data=json.dumps({'description': 'Other'}),
+                               content_type='application/json')
+        new_id = json.loads(response.data)['data']['id']
+        client.put(f'/property-type/{new_id}', data=json.dumps({'description': 'Land'}),
+                   content_type='application/json')
+        assert json.loads(client.get(f'/property-type/{new_id}').data)['data']['description'] == 'Land'
+        assert client.delete(f'/property-type/{new_id}').status_code == 200
+        assert client.get(f'/property-type/{new_id}').status_code == 404
+
+    def test_list_filters_use_cached_ids(self, client, query_counter):
+        """Test description filters resolve to ids without touching the lookup tables"""
+        client.get('/properties/?status=x')
+        del query_counter[:]
+        data = json.loads(client.get('/properties/?status=vac&fields=address').data)['data']
+        assert data == [{'address': '1 Test St'}]
+        data_queries = [q for q in query_counter if 'table_versions' not in q]
+        assert len(data_queries) == 1
+        assert 'ILIKE' not in data_queries[0].upper()
+        assert 'property_statuses' not in data_queries[0]
+
+        data = json.loads(client.get('/properties/?type=COMM&fields=address').data)['data']
+        assert data == [{'address': '2 Test St'}]
+
+    def test_list_filter_without_match(self, client):
+        """Test a filter matching no description returns an empty list"""
+        data = json.loads(client.get('/leases/?paymentStatus=pending').data)['data']
+        assert data == []
+        data = json.loads(client.get('/leases/?paymentStatus=over').data)['data']
+        assert [l['propertyAddress'] for l in data] == ['2 Test St']
+
+    def test_write_from_another_process_reloads_cache(self, client, db):
+        """Test a lookup row added outside this process is seen once its table version changes"""
+        assert client.get('/properties/?status=archived').get_json()['data'] == []
+        # Another worker's write: the row and its version bump, without this process invalidating its entry
+        archived = PropertyStatus(description='Archived')
+        db.session.add(archived)
+        bump_version(PropertyStatus)
+        db.session.commit()
+        db.session.execute(db.text('UPDATE properties SET propertystatusid = :id WHERE address = :address'),
+                           {'id': archived.propertystatusid, 'address': '1 Test St'})
+        db.session.commit()
+
+        data = client.get('/properties/?status=archived&fields=address').get_json()['data']
+        assert data == [{'address': '1 Test St'}]
+        statuses = client.get('/property-status/').get_json()['data']
+        assert [s['description'] for s in statuses] == ['Vacant', 'Occupied', 'Archived']
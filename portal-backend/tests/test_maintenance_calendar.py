@@ -0,0 +1,63 @@
+import pytest
+from datetime import date
+from app.models import Property, PropertyType, PropertyStatus, Maintenance, MaintenanceStatus
+
+class TestMaintenanceCalendar:
+    """Test suite for the maintenance date-range filters and per-day counts"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Two properties with tasks in March and April 2024"""
+        status, type_ = PropertyStatus(description='Occupied'), PropertyType(description='Residential')
+        self.pending, self.completed = MaintenanceStatus(description='Pending'), MaintenanceStatus(description='Completed')
+        db.session.add_all([status, type_, self.pending, self.completed])
+        db.session.flush()
+        self.house, self.shop = (Property(address=address, propertytypeid=type_.propertytypeid,
+                                          propertystatusid=status.propertystatusid, purchasedate=date(2010, 1, 1),
+                                          price=300000) for address in ('1 Rue des Lilas', '2 Avenue Foch'))
+        db.session.add_all([self.house, self.shop])
+        db.session.flush()
+        for property_, status_, day in ((self.house, self.pending, date(2024, 3, 5)),
+                                        (self.house, self.completed, date(2024, 3, 5)),
+                                        (self.shop, self.pending, date(2024, 3, 5)),
+                                        (self.house, self.pending, date(2024, 3, 20)),
+                                        (self.house, self.pending, date(2024, 4, 2))):
+            db.session.add(Maintenance(description='Service boiler', maintenancestatusid=status_.maintenancestatusid,
+                                       scheduleddate=day, propertyid=property_.propertyid))
+        db.session.commit()
+
+    def scheduled_dates(self, client, query):
+        response = client.get(f'/maintenance/?sort=scheduledDate&{query}')
+        assert response.status_code == 200
+        return [task['scheduledDate'] for task in response.get_json()['data']]
+
+    def test_list_filters(self, client):
+        """Test the date window, property and exact status filters of the list"""
+        assert self.scheduled_dates(client, 'from=2024-03-06&to=2024-04-01') == ['2024-03-20']
+        assert self.scheduled_dates(client, 'from=2024-03-20') == ['2024-03-20', '2024-04-02']
+        assert self.scheduled_dates(client, f'propertyId={self.shop.propertyid}') == ['2024-03-05']
+        assert self.scheduled_dates(client, f'statusId={self.completed.maintenancestatusid}') == ['2024-03-05']
+        assert self.scheduled_dates(client, f'propertyId={self.house.propertyid}&to=2024-03-31'
+                                            f'&statusId={self.pending.maintenancestatusid}') == ['2024-03-05', '2024-03-20']
+
+    def test_calendar_counts(self, client):
+        """Test the calendar counts the tasks of each day with at least one, by status"""
+        response = client.get('/maintenance/calendar?from=2024-03-01&to=2024-03-31')
+        assert response.status_code == 200
+        assert response.get_json()['data'] == [
+            {'date': '2024-03-05', 'count': 3, 'byStatus': {'Pending': 2, 'Completed': 1}},
+            {'date': '2024-03-20', 'count': 1, 'byStatus': {'Pending': 1}}
+        ]
+
+        data = client.get(f'/maintenance/calendar?from=2024-03-01&to=2024-04-30&propertyId={self.house.propertyid}'
+                          f'&status=pend').get_json()['data']
+        assert [(day['date'], day['count']) for day in data] == [('2024-03-05', 1), ('2024-03-20', 1), ('2024-04-02', 1)]
+
+    def test_invalid_parameters(self, client):
+        """Test invalid filters are rejected and the calendar needs a bounded window"""
+        for path in ('/maintenance/?from=2024-02-30', '/maintenance/?propertyId=one',
+                     '/maintenance/?from=2024-04-01&to=2024-03-01', '/maintenance/export?statusId=x',
+                     '/maintenance/calendar?from=2024-03-01', '/maintenance/calendar?from=2024-01-01&to=2025-01-01'):
+            response = client.get(path)
+            assert response.status_code == 400, path
+            assert response.get_json()['error']
@@ -0,0 +1,138 @@
+import pytest
+import time
+import numpy as np
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus
+from app.occupancy import occupancy_series, parse_window
+from app.synthetic import LOOKUPS, generate_portfolio, portfolio_sizes
+
+def events(dates):
+    """``(dates, counts)`` pair counting every date of ``dates`` once."""
+    dates, counts = np.unique(np.asarray(dates, dtype='datetime64[D]'), return_counts=True)
+    return dates, counts
+
+def synthetic_terms(leases):
+    sizes = portfolio_sizes(leases)
+    lookup_ids = {model: np.arange(1, len(descriptions) + 1) for model, descriptions in LOOKUPS.items()}
+    ids = {table: np.arange(1, count + 1) for table, count in sizes.items()}
+    portfolio = generate_portfolio(sizes, lookup_ids, ids, seed=2)
+    return portfolio[Lease], portfolio[Property]
+
+class TestOccupancySeries:
+    """Test suite for the occupancy sweep line"""
+
+    def test_matches_day_by_day_count(self):
+        """Test the sweep line agrees with counting the leases and properties of every day"""
+        leases, properties = synthetic_terms(2000)
+        first, last = date(2008, 1, 1), date(2010, 12, 31)
+        starts, ends = leases['leasetermstart'], leases['leasetermend']
+        inside = (ends >= np.datetime64(first)) & (starts <= np.datetime64(last))
+        purchases = properties['purchasedate'][properties['purchasedate'] <= np.datetime64(last)]
+        series = occupancy_series(events(starts[inside]), events(ends[inside]), events(purchases), first, last)
+
+        assert len(series) == (last - first).days + 1
+        for point in series[::97]:
+            day = np.datetime64(point['date'])
+            assert point['occupied'] == ((starts <= day) & (ends >= day)).sum()
+            assert point['properties'] == (purchases <= day).sum()
+
+    def test_weekly_and_monthly_buckets(self):
+        """Test weeks start on Monday, buckets are cut by the window and report daily averages"""
+        # One property, leased from Wednesday 2024-01-03 to Tuesday 2024-01-09
+        lease = (events(['2024-01-03']), events(['2024-01-09']))
+        purchases = events(['2020-01-01'])
+        weekly = occupancy_series(*lease, purchases, date(2023, 12, 30), date(2024, 1, 14), 'weekly')
+        assert [(p['date'], p['days'], p['occupied']) for p in weekly] == \
+            [('2023-12-30', 2, 0), ('2024-01-01', 7, round(5 / 7, 2)), ('2024-01-08', 7, round(2 / 7, 2))]
+        assert weekly[1]['rate'] == round(5 / 7, 4)
+
+        monthly = occupancy_series(*lease, purchases, date(2023, 12, 15), date(2024, 2, 10), 'monthly')
+        assert [(p['date'], p['days']) for p in monthly] == [('2023-12-15', 17), ('2024-01-01', 31), ('2024-02-01', 10)]
+        assert monthly[1]['occupied'] == round(7 / 31, 2)
+
+    def test_no_properties(self):
+        """Test an empty portfolio gives a zero rate rather than dividing by zero"""
+        empty = events([])
+        series = occupancy_series(empty, empty, empty, date(2024, 1, 1), date(2024, 1, 3))
+        assert [p['rate'] for p in series] == [0, 0, 0]
+
+    def test_hundred_thousand_leases_over_years(self):
+        """Test a 20-year daily series of 100k leases stays well under a second"""
+        leases, properties = synthetic_terms(100000)
+        started = time.perf_counter()
+        series = occupancy_series(events(leases['leasetermstart']), events(leases['leasetermend']),
+                                  events(properties['purchasedate']), date(2005, 1, 1), date(2024, 12, 31))
+        assert time.perf_counter() - started < 0.5
+        assert len(series) == 7305
+
+    def test_parse_window(self):
+        """Test the window defaults to the year before today and rejects invalid bounds"""
+        assert parse_window(None, None, today=date(2024, 6, 30)) == (date(2023, 7, 1), date(2024, 6, 30))
+        assert parse_window('2024-01-01', '2024-01-01') == (date(2024, 1, 1), date(2024, 1, 1))
+        for start, end in (('2024-02-01', '2024-01-01'), ('bad', None), ('1900-01-01', '2024-01-01')):
+            with pytest.raises(ValueError):
+                parse_window(start, end)
+
+class TestOccupancyEndpoint:
+    """Test suite for the occupancy endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """A leased house and a vacant shop, both bought before 2024"""
+        occupied, vacant = PropertyStatus(description='Occupied'), PropertyStatus(description='Vacant')
+        residential, commercial = PropertyType(description='Residential'), PropertyType(description='Commercial')
+        paid = PaymentStatus(description='Paid')
+        tenant = Tenant(name='Jean Dupont', contactinfo='jean@example.com')
+        db.session.add_all([occupied, vacant, residential, commercial, paid, tenant])
+        db.session.flush()
+        house = Property(address='1 Rue des Lilas', propertytypeid=residential.propertytypeid,
+                         propertystatusid=occupied.propertystatusid, purchasedate=date(2010, 1, 1), price=300000)
+        shop = Property(address='2 Avenue Foch', propertytypeid=commercial.propertytypeid,
+                        propertystatusid=vacant.propertystatusid, purchasedate=date(2012, 1, 1), price=900000)
+        db.session.add_all([house, shop])
+        db.session.flush()
+        db.session.add(Lease(tenantid=tenant.tenantid, propertyid=house.propertyid, leasetermstart=date(2024, 1, 10),
+                             leasetermend=date(2024, 2, 9), paymentstatusid=paid.paymentstatusid))
+        db.session.commit()
+
+    def test_monthly_occupancy(self, client):
+        """Test the occupancy of the whole portfolio per month"""
+        response = client.get('/dashboard/occupancy?from=2024-01-01&to=2024-03-31&resolution=monthly')
+        assert response.status_code == 200
+        assert [(p['date'], p['occupied'], p['properties'], p['rate']) for p in response.get_json()['data']] == [
+            ('2024-01-01', round(22 / 31, 2), 2, round(22 / 62, 4)),
+            ('2024-02-01', round(9 / 29, 2), 2, round(9 / 58, 4)),
+            ('2024-03-01', 0, 2, 0)
+        ]
+
+    def test_property_filters(self, client):
+        """Test the type and status filters restrict both the leases and the properties counted"""
+        data = client.get('/dashboard/occupancy?from=2024-01-15&to=2024-01-15&type=resid').get_json()['data']
+        assert (data[0]['occupied'], data[0]['properties'], data[0]['rate']) == (1, 1, 1)
+        data = client.get('/dashboard/occupancy?from=2024-01-15&to=2024-01-15&status=vacant').get_json()['data']
+        assert (data[0]['occupied'], data[0]['properties'], data[0]['rate']) == (0, 1, 0)
+
+    def test_lease_before_purchase_counts_from_purchase(self, client, db):
+        """Test the days a lease runs before its property was bought are not counted as occupied"""
+        shop = Property.query.filter_by(address='2 Avenue Foch').one()
+        lease = Lease.query.one()
+        db.session.add(Lease(tenantid=lease.tenantid, propertyid=shop.propertyid, leasetermstart=date(2011, 11, 1),
+                             leasetermend=date(2012, 1, 10), paymentstatusid=lease.paymentstatusid))
+        db.session.add(Lease(tenantid=lease.tenantid, propertyid=shop.propertyid, leasetermstart=date(2011, 6, 1),
+                             leasetermend=date(2011, 9, 30), paymentstatusid=lease.paymentstatusid))
+        db.session.commit()
+
+        data = client.get('/dashboard/occupancy?from=2011-06-01&to=2012-01-31').get_json()['data']
+        by_date = {p['date']: (p['occupied'], p['properties'], p['rate']) for p in data}
+        assert by_date['2011-07-01'] == (0, 1, 0)
+        assert by_date['2011-12-15'] == (0, 1, 0)
+        assert by_date['2012-01-05'] == (1, 2, 0.5)
+        assert by_date['2012-01-11'] == (0, 2, 0)
+        assert all(p['rate'] <= 1 for p in data)
+
+    def test_invalid_parameters(self, client):
+        """Test an invalid window or resolution is rejected"""
+        for query in ('from=2024-02-01&to=2024-01-01', 'to=2024-13-01', 'resolution=hourly'):
+            response = client.get(f'/dashboard/occupancy?{query}')
+            assert response.status_code == 400
+            assert response.get_json()['error']
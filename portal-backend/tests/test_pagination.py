@@ -0,0 +1,131 @@
+import pytest
+import json
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance, MaintenanceStatus
+
+class TestPagination:
+    """Test suite for cursor pagination on list endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        payment_status = PaymentStatus(description='Paid')
+        maintenance_status = MaintenanceStatus(description='Pending')
+        db.session.add_all([property_type, property_status, payment_status, maintenance_status])
+        db.session.commit()
+
+        # Prices repeat so that pages have to break ties on the primary key
+        prices = [300000, 100000, 200000, 100000, 300000, 200000, 100000]
+        properties = [
+            Property(
+                address=f'{i} Test St',
+                propertytypeid=property_type.propertytypeid,
+                propertystatusid=property_status.propertystatusid,
+                purchasedate=date(2020, 1, 1 + i),
+                price=price
+            ) for i, price in enumerate(prices)
+        ]
+        tenants = [Tenant(name=f'Tenant {i}', contactinfo=f'tenant{i}@example.com') for i in range(5)]
+        db.session.add_all(properties + tenants)
+        db.session.commit()
+
+        db.session.add_all([
+            Lease(
+                tenantid=tenants[i % len(tenants)].tenantid,
+                propertyid=p.propertyid,
+                leasetermstart=date(2024, 1, 1),
+                leasetermend=date(2025, 1, 1),
+                paymentstatusid=payment_status.paymentstatusid
+            ) for i, p in enumerate(properties)
+        ] + [
+            Maintenance(
+                description=f'Task {i}',
+                maintenancestatusid=maintenance_status.maintenancestatusid,
+                scheduleddate=date(2024, 3, 1 + i % 3),
+                propertyid=p.propertyid
+            ) for i, p in enumerate(properties)
+        ])
+        db.session.commit()
+
+    def fetch_all_pages(self, client, url, limit):
+        """Follow nextCursor until the last page and return every row"""
+        rows, cursor, pages = [], None, 0
+        while True:
+            query = f'{url}&limit={limit}' if '?' in url else f'{url}?limit={limit}'
+            if cursor:
+                query += f'&cursor={cursor}'
+            response = client.get(query)
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert len(data['data']) <= limit
+            rows.extend(data['data'])
+            pages += 1
+            cursor = data['nextCursor']
+            if cursor is None:
+                return rows, pages
+
+    def test_list_without_limit_has_no_cursor(self, client):
+        """Test GET /properties/ without limit keeps returning the full list"""
+        response = client.get('/properties/')
+        data = json.loads(response.data)
+        assert len(data['data']) == 7
+        assert 'nextCursor' not in data
+
+    def test_properties_pages_match_full_sort(self, client):
+        """Test paging by price returns the same rows as the unpaged sort, ties broken by id"""
+        for order in ('asc', 'desc'):
+            url = f'/properties/?sort=price&order={order}'
+            full = json.loads(client.get(url).data)['data']
+            paged, pages = self.fetch_all_pages(client, url, 3)
+            assert pages == 3
+            assert [p['id'] for p in paged] == [p['id'] for p in full]
+            prices = [p['price'] for p in paged]
+            assert prices == sorted(prices, reverse=order == 'desc')
+
+    def test_properties_pages_by_purchase_date(self, client):
+        """Test paging by purchaseDate visits every property once"""
+        paged, _ = self.fetch_all_pages(client, '/properties/?sort=purchaseDate&order=desc', 2)
+        dates = [p['purchaseDate'] for p in paged]
+        assert dates == sorted(dates, reverse=True)
+        assert len({p['id'] for p in paged}) == 7
+
+    def test_tenants_pages_by_name(self, client):
+        """Test paging tenants by name"""
+        paged, pages = self.fetch_all_pages(client, '/tenants/?sort=name', 2)
+        assert pages == 3
+        assert [t['name'] for t in paged] == [f'Tenant {i}' for i in range(5)]
+
+    def test_leases_pages_by_lease_end(self, client):
+        """Test paging leases whose sort key is identical on every row"""
+        paged, _ = self.fetch_all_pages(client, '/leases/?sort=leaseEnd', 3)
+        ids = [l['id'] for l in paged]
+        assert ids == sorted(ids)
+        assert len(ids) == 7
+
+    def test_maintenance_pages_by_scheduled_date(self, client):
+        """Test paging maintenance tasks by scheduledDate"""
+        paged, _ = self.fetch_all_pages(client, '/maintenance/?sort=scheduledDate&order=desc', 4)
+        keys = [(m['scheduledDate'], m['id']) for m in paged]
+        assert keys == sorted(keys, reverse=True)
+        assert len(keys) == 7
+
+    def test_last_page_has_null_cursor(self, client):
+        """Test a limit larger than the result set returns a null nextCursor"""
+        data = json.loads(client.get('/leases/?limit=50').data)
+        assert len(data['data']) == 7
+        assert data['nextCursor'] is None
+
+    def test_invalid_limit(self, client):
+        """Test a non-positive limit is rejected"""
+        response = client.get('/properties/?limit=0')
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
+    def test_invalid_cursor(self, client):
+        """Test a malformed cursor is rejected"""
+        response = client.get('/properties/?sort=purchaseDate&limit=2&cursor=not-a-cursor')
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['error'] == 'Invalid cursor'
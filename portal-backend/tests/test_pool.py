@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+from app.config import engine_options
+from app.pool import InstrumentedQueuePool, pool_stats
+
+class TestConnectionPool:
+    """Test suite for the connection pool settings and statistics"""
+
+    def test_engine_options_from_environment(self, monkeypatch):
+        """Test pool settings and the statement timeout are read from the environment"""
+        monkeypatch.setenv('DB_POOL_SIZE', '20')
+        monkeypatch.setenv('DB_MAX_OVERFLOW', '5')
+        monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+        monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+        options = engine_options('postgresql://user:password@db:5432/property_management')
+        assert options['poolclass'] is InstrumentedQueuePool
+        assert (options['pool_size'], options['max_overflow'], options['pool_pre_ping']) == (20, 5, False)
+        assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+        assert engine_options('sqlite:///:memory:') == {}
+
+    def test_stats_track_checkouts_overflow_and_timeouts(self, tmp_path):
+        """Test the pool reports connections in use, overflow and timed-out waits"""
+        engine = create_engine(f'sqlite:///{tmp_path}/pool.db', poolclass=InstrumentedQueuePool,
+                               pool_size=1, max_overflow=1, pool_timeout=0.05)
+        first, second = engine.connect(), engine.connect()
+        stats = pool_stats(engine.pool)
+        assert (stats['checkedOut'], stats['idle'], stats['overflow']) == (2, 0, 1)
+
+        with pytest.raises(TimeoutError):
+            engine.connect()
+        stats = pool_stats(engine.pool)
+        assert stats['timeouts'] == 1
+        assert stats['waitSeconds'] >= 0.05
+
+        first.close()
+        second.close()
+        assert pool_stats(engine.pool)['idle'] == 1
+        engine.dispose()
+
+    def test_admin_pool_endpoint(self, client, app, monkeypatch):
+        """Test the admin endpoint reports the pool and honours the admin token"""
+        monkeypatch.setitem(app.config, 'ADMIN_TOKEN', 'secret')
+        response = client.get('/admin/pool', headers={'Authorization': 'Bearer secret'})
+        assert response.status_code == 200
+        assert 'poolClass' in response.get_json()['data']
+        assert client.get('/admin/pool').status_code == 401
+        assert client.get('/admin/pool', headers={'Authorization': 'Bearer other'}).status_code == 401
+
+    def test_admin_endpoints_disabled_without_token(self, client, app, monkeypatch):
+        """Test every admin endpoint is unavailable while no admin token is configured"""
+        monkeypatch.setitem(app.config, 'ADMIN_TOKEN', None)
+        for method, path in (('GET', '/admin/pool'), ('GET', '/admin/routes'), ('DELETE', '/admin/routes'),
+                             ('GET', '/admin/compression'), ('DELETE', '/admin/compression')):
+            response = client.open(path, method=method, headers={'Authorization': 'Bearer None'})
+            assert response.status_code == 404, path
+            assert response.get_json()['data'] is None
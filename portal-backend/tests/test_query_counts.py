@@ -0,0 +1,98 @@
+import pytest
+import json
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance, MaintenanceStatus
+
+class TestQueryCounts:
+    """Test that list endpoints run a fixed number of queries regardless of row count"""
+
+    def seed(self, db, count):
+        """Create ``count`` properties, tenants, leases and tasks, each with its own related rows"""
+        types = [PropertyType(description=f'Type {i}') for i in range(count)]
+        statuses = [PropertyStatus(description=f'Status {i}') for i in range(count)]
+        payment_statuses = [PaymentStatus(description=f'Payment {i}') for i in range(count)]
+        maintenance_statuses = [MaintenanceStatus(description=f'Maintenance {i}') for i in range(count)]
+        tenants = [Tenant(name=f'Tenant {i}', contactinfo=f'tenant{i}@example.com') for i in range(count)]
+        db.session.add_all(types + statuses + payment_statuses + maintenance_statuses + tenants)
+        db.session.commit()
+
+        properties = [
+            Property(
+                address=f'{i} Test St',
+                propertytypeid=types[i].propertytypeid,
+                propertystatusid=statuses[i].propertystatusid,
+                purchasedate=date(2020, 1, 1),
+                price=100000 + i
+            ) for i in range(count)
+        ]
+        db.session.add_all(properties)
+        db.session.commit()
+
+        db.session.add_all([
+            Lease(
+                tenantid=tenants[i].tenantid,
+                propertyid=properties[i].propertyid,
+                leasetermstart=date(2024, 1, 1),
+                leasetermend=date(2025, 1, 1),
+                paymentstatusid=payment_statuses[i].paymentstatusid
+            ) for i in range(count)
+        ] + [
+            Maintenance(
+                description=f'Task {i}',
+                maintenancestatusid=maintenance_statuses[i].maintenancestatusid,
+                scheduleddate=date(2024, 3, 1),
+                propertyid=properties[i].propertyid
+            ) for i in range(count)
+        ])
+        db.session.commit()
+        ids = tenants[0].tenantid, properties[0].propertyid
+        # Empty the identity map so lazy loads cannot be satisfied without SQL
+        db.session.expunge_all()
+        return ids
+
+    def count_queries(self, client, query_counter, url):
+        del query_counter[:]
+        response = client.get(url)
+        assert response.status_code == 200
+        # The ETag version lookup is one primary-key read per request and does not scale with rows
+        data_queries = [q for q in query_counter if 'table_versions' not in q]
+        return len(data_queries), json.loads(response.data)['data']
+
+    @pytest.mark.parametrize('url', ['/properties/', '/tenants/', '/leases/', '/maintenance/'])
+    def test_list_query_count_is_constant(self, client, db, query_counter, url):
+        """Test one query serves a list of any size"""
+        self.seed(db, 12)
+        queries, rows = self.count_queries(client, query_counter, url)
+        assert len(rows) == 12
+        assert queries == 1
+
+    @pytest.mark.parametrize('url', ['/properties/?limit=5', '/leases/?limit=5&sort=leaseEnd'])
+    def test_paginated_list_query_count(self, client, db, query_counter, url):
+        """Test a page is served by a single query"""
+        self.seed(db, 12)
+        queries, rows = self.count_queries(client, query_counter, url)
+        assert len(rows) == 5
+        assert queries == 1
+
+    def test_leases_by_tenant_and_property_query_count(self, client, db, query_counter):
+        """Test the nested lease lists run a single query"""
+        tenant_id, property_id = self.seed(db, 6)
+        queries, rows = self.count_queries(client, query_counter, f'/leases/tenant/{tenant_id}')
+        assert rows[0]['propertyAddress'] == '0 Test St'
+        assert queries == 1
+        queries, rows = self.count_queries(client, query_counter, f'/leases/property/{property_id}')
+        assert rows[0]['tenantName'] == 'Tenant 0'
+        assert queries == 1
+
+    def test_detail_query_count(self, client, db, query_counter):
+        """Test the detail endpoints load related descriptions in the same query"""
+        self.seed(db, 3)
+        queries, prop = self.count_queries(client, query_counter, '/properties/1')
+        assert prop['type'] == 'Type 0' and prop['status'] == 'Status 0'
+        assert queries == 1
+        queries, lease = self.count_queries(client, query_counter, '/leases/1')
+        assert lease['paymentStatus'] == 'Payment 0'
+        assert queries == 1
+        queries, task = self.count_queries(client, query_counter, '/maintenance/1')
+        assert task['propertyAddress'] == '0 Test St'
+        assert queries == 1
@@ -0,0 +1,150 @@
+import pytest
+import json
+import re
+from sqlalchemy import event, text
+from app.db import db as _db
+from app.lookups import clear_lookups
+from app.migrations import migrate
+from app.synthetic import generate_data, portfolio_sizes
+
+PLAN_ROWS = 20000
+LARGE_TABLES = ('properties', 'tenants', 'leases', 'maintenance')
+PRIMARY_KEY = 'pkey'
+
+# Blueprint reads whose queries must stay on an index, with the accepted access path per large table
+# (tables not listed, e.g. joined rows, must be reached through their primary key). Paginated
+# requests are checked on their first page and on the page after the returned cursor.
+PLAN_CASES = [
+    ('/properties/?limit=20', {}),
+    ('/properties/?limit=20&sort=price', {'properties': {'idx_properties_price_id'}}),
+    ('/properties/?limit=20&sort=price&order=desc', {'properties': {'idx_properties_price_id'}}),
+    ('/properties/?limit=20&sort=purchaseDate', {'properties': {'idx_properties_purchasedate_id'}}),
+    ('/properties/?limit=20&status=vacant',
+     {'properties': {PRIMARY_KEY, 'idx_properties_propertystatusid'}}),
+    ('/properties/?limit=20&type=commercial&sort=price',
+     {'properties': {'idx_properties_price_id', 'idx_properties_propertytypeid'}}),
+    ('/properties/5', {}),
+    ('/tenants/?limit=20', {}),
+    ('/tenants/?limit=20&sort=name&order=desc', {'tenants': {'idx_tenants_name_id'}}),
+    ('/tenants/5', {}),
+    ('/leases/?limit=20', {}),
+    ('/leases/?limit=20&sort=leaseStart', {'leases': {'idx_leases_start_id'}}),
+    ('/leases/?limit=20&sort=leaseEnd&order=desc', {'leases': {'idx_leases_end_id'}}),
+    ('/leases/?limit=20&paymentStatus=overdue', {'leases': {PRIMARY_KEY, 'idx_leases_paymentstatusid'}}),
+    ('/leases/expiring?from=2012-01-01&days=90&limit=20', {'leases': {'idx_leases_end_id'}}),
+    ('/leases/5', {}),
+    ('/leases/tenant/5', {'leases': {'idx_leases_tenantid'}}),
+    ('/leases/property/5', {'leases': {'idx_leases_property_term'}}),
+    ('/maintenance/?limit=20', {}),
+    ('/maintenance/?limit=20&sort=scheduledDate', {'maintenance': {'idx_maintenance_scheduleddate_id'}}),
+    ('/maintenance/?limit=20&status=pending',
+     {'maintenance': {PRIMARY_KEY, 'idx_maintenance_maintenancestatusid'}}),
+    ('/maintenance/?limit=20&propertyId=5&sort=scheduledDate',
+     {'maintenance': {'idx_maintenance_property_scheduled'}}),
+    ('/maintenance/?limit=20&propertyId=5&from=2016-01-01&to=2018-12-31&sort=scheduledDate',
+     {'maintenance': {'idx_maintenance_property_scheduled'}}),
+    ('/maintenance/?limit=20&from=2016-01-01&to=2016-03-31&sort=scheduledDate',
+     {'maintenance': {'idx_maintenance_scheduleddate_id'}}),
+    ('/maintenance/5', {}),
+]
+
+# Ranked tenant search: the trigram indexes of 0005_tenant_search on PostgreSQL, the FTS5 index and then the
+# primary key on SQLite. The ranking sorts the matches, so only the access paths are checked.
+SEARCH_PATH = '/tenants/search?q=bernard&limit=20'
+SEARCH_ACCESSES = {PRIMARY_KEY, 'idx_tenants_name_trgm', 'idx_tenants_contactinfo_trgm'}
+
+def explain(connection, statement, parameters):
+    """
+    Summarize the plan of a captured statement as ``(accesses, sorts)``.
+
+    ``accesses`` maps each large table read to the index used, ``PRIMARY_KEY``
+    or ``None`` for a full scan; ``sorts`` counts explicit sort steps.
+    """
+    accesses, sorts = {}, 0
+    if connection.dialect.name == 'postgresql':
+        plan = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+        nodes = [(plan if isinstance(plan, list) else json.loads(plan))[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('Plans', []))
+            sorts += node['Node Type'] in ('Sort', 'Incremental Sort')
+            if node['Node Type'] == 'Seq Scan' and node['Relation Name'] in LARGE_TABLES:
+                accesses[node['Relation Name']] = None
+            elif 'Index Name' in node:
+                index = node['Index Name']
+                table = next((t for t in LARGE_TABLES if index == f'{t}_pkey' or index.startswith(f'idx_{t}_')), None)
+                if table:
+                    accesses[table] = PRIMARY_KEY if index == f'{table}_pkey' else index
+        return accesses, sorts
+
+    for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters):
+        detail = row[-1]
+        sorts += 'USE TEMP B-TREE FOR ORDER BY' in detail
+        match = re.match(r'(SCAN|SEARCH) (\w+)(?: USING (?:COVERING )?INDEX (\w+)| USING INTEGER PRIMARY KEY)?', detail)
+        if match and match.group(2) in LARGE_TABLES:
+            # A bare SCAN of a rowid table walks it in primary key order
+            accesses[match.group(2)] = match.group(3) or PRIMARY_KEY
+    return accesses, sorts
+
+@pytest.fixture(scope='module')
+def portfolio(app):
+    """Large synthetic portfolio on a migrated schema, with fresh planner statistics"""
+    with app.app_context():
+        # Reapply every migration, as on a database upgraded by flask migrate, not only the model schema
+        _db.session.execute(text('DROP TABLE IF EXISTS schema_migrations'))
+        _db.session.commit()
+        migrate()
+        generate_data(portfolio_sizes(PLAN_ROWS), seed=1)
+        _db.session.execute(text('ANALYZE'))
+        _db.session.commit()
+        yield
+        for table in reversed(_db.metadata.sorted_tables):
+            _db.session.execute(table.delete())
+        _db.session.commit()
+        _db.session.remove()
+    clear_lookups()
+
+class TestQueryPlans:
+    """Test suite guarding the query plans of the blueprint reads"""
+
+    def captured_plans(self, client, path):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(_db.engine, 'before_cursor_execute', capture)
+        try:
+            response = client.get(path)
+        finally:
+            event.remove(_db.engine, 'before_cursor_execute', capture)
+        assert response.status_code == 200, response.data
+
+        with _db.engine.connect() as connection:
+            plans = [(statement, explain(connection, statement, parameters)) for statement, parameters in statements]
+        return response.get_json(), plans
+
+    @pytest.mark.parametrize('path, expected', PLAN_CASES)
+    def test_reads_use_indexes(self, client, portfolio, path, expected):
+        """Test the queries behind a read neither scan a large table outside its index nor sort explicitly"""
+        body, plans = self.captured_plans(client, path)
+        if body.get('nextCursor'):
+            plans += self.captured_plans(client, f'{path}&cursor={body["nextCursor"]}')[1]
+
+        checked = 0
+        for statement, (accesses, sorts) in plans:
+            if not accesses:
+                continue
+            checked += 1
+            assert sorts == 0, f'explicit sort in {statement}'
+            for table, access in accesses.items():
+                allowed = expected.get(table, {PRIMARY_KEY})
+                assert access in allowed, f'{table} read via {access or "a full scan"} in {statement}'
+        assert checked, 'no query on a large table was captured'
+
+    def test_tenant_search_uses_trigram_indexes(self, client, portfolio):
+        """Test ranked tenant search reads tenants through an index, never a full scan"""
+        _, plans = self.captured_plans(client, SEARCH_PATH)
+        accesses = [accesses['tenants'] for _, (accesses, _) in plans if 'tenants' in accesses]
+        assert accesses, 'no query on tenants was captured'
+        assert all(access in SEARCH_ACCESSES for access in accesses), accesses
@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy.orm import Session
+from starlette.testclient import TestClient
+from app import create_app
+from app.asgi import create_asgi_app
+from app.config import Config
+from app.db import REPLICA_BIND, db, use_primary
+from app.lookups import clear_lookups
+from app.models import Tenant
+from app.replicas import PRIMARY_COOKIE, is_sticky, record_lag, reset_lag
+
+@pytest.fixture(scope='module')
+def replica_app(tmp_path_factory):
+    """App with a primary and a replica SQLite file holding different tenants, so reads show where they went"""
+    directory = tmp_path_factory.mktemp('replicas')
+
+    class ReplicaConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{directory}/primary.db'
+        SQLALCHEMY_BINDS = {REPLICA_BIND: {'url': f'sqlite:///{directory}/replica.db'}}
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+        db.session.add(Tenant(name='Primary Tenant', contactinfo='primary@example.com'))
+        db.session.commit()
+        with Session(db.engines[REPLICA_BIND]) as session:
+            session.add(Tenant(name='Replica Tenant', contactinfo='replica@example.com'))
+            session.commit()
+    clear_lookups()
+    yield app
+    clear_lookups()
+    # init_app registered a metadata for the replica bind on the shared extension; the session app has no such bind
+    db.metadatas.pop(REPLICA_BIND, None)
+
+class TestReadReplicas:
+    """Test suite for routing reads to the read replica"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Start each test with no measured replica lag"""
+        reset_lag()
+        yield
+        reset_lag()
+
+    def tenant_names(self, response):
+        return [tenant['name'] for tenant in response.get_json()['data']]
+
+    def test_get_reads_replica(self, replica_app):
+        """Test GET requests are answered from the replica"""
+        assert self.tenant_names(replica_app.test_client().get('/tenants/')) == ['Replica Tenant']
+
+    def test_write_sticks_client_to_primary(self, replica_app):
+        """Test a write goes to the primary and the client's following reads see it"""
+        client = replica_app.test_client()
+        response = client.put('/tenants/1', json={'name': 'Renamed Tenant', 'contactinfo': 'primary@example.com'})
+        assert response.status_code == 200
+        assert client.get_cookie(PRIMARY_COOKIE) is not None
+        assert self.tenant_names(client.get('/tenants/')) == ['Renamed Tenant']
+
+        # Other clients keep reading the replica
+        assert self.tenant_names(replica_app.test_client().get('/tenants/')) == ['Replica Tenant']
+
+    def test_lagging_replica_falls_back_to_primary(self, replica_app):
+        """Test reads go to the primary while the replica lags more than the configured maximum"""
+        record_lag(replica_app.config['REPLICA_MAX_LAG_SECONDS'] + 1)
+        assert self.tenant_names(replica_app.test_client().get('/tenants/')) != ['Replica Tenant']
+
+    def test_use_primary(self, replica_app):
+        """Test use_primary sends the reads of a GET request to the primary"""
+        with replica_app.test_request_context('/tenants/'):
+            replica_app.preprocess_request()
+            assert db.session.scalar(db.select(Tenant.name)) == 'Replica Tenant'
+            with use_primary():
+                assert db.session.scalar(db.select(Tenant.name)) != 'Replica Tenant'
+            db.session.remove()
+
+    def test_is_sticky(self):
+        """Test the sticky cookie only holds until its timestamp"""
+        assert is_sticky({PRIMARY_COOKIE: '200'}, now=100)
+        assert not is_sticky({PRIMARY_COOKIE: '50'}, now=100)
+        assert not is_sticky({PRIMARY_COOKIE: 'bad'}, now=100)
+        assert not is_sticky({}, now=100)
+
+    def test_async_read_path(self, replica_app):
+        """Test the async read path follows the same replica and sticky rules"""
+        with TestClient(create_asgi_app(replica_app)) as client:
+            assert [t['name'] for t in client.get('/tenants/').json()['data']] == ['Replica Tenant']
+            client.cookies.set(PRIMARY_COOKIE, '9999999999')
+            assert [t['name'] for t in client.get('/tenants/').json()['data']] != ['Replica Tenant']
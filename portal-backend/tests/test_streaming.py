@@ -0,0 +1,79 @@
+import pytest
+import json
+from datetime import date
+from app.models import Lease, Tenant, Property, PropertyType, PropertyStatus, PaymentStatus, Maintenance, MaintenanceStatus
+
+class TestStreaming:
+    """Test suite for NDJSON streaming on list endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        property_type = PropertyType(description='Residential')
+        property_status = PropertyStatus(description='Occupied')
+        payment_status = PaymentStatus(description='Paid')
+        maintenance_status = MaintenanceStatus(description='Pending')
+        tenant = Tenant(name='John Doe', contactinfo='john@example.com')
+        db.session.add_all([property_type, property_status, payment_status, maintenance_status, tenant])
+        db.session.commit()
+
+        properties = [
+            Property(
+                address=f'{i} Test St',
+                propertytypeid=property_type.propertytypeid,
+                propertystatusid=property_status.propertystatusid,
+                purchasedate=date(2020, 1, 1),
+                price=100000 + i
+            ) for i in range(5)
+        ]
+        db.session.add_all(properties)
+        db.session.commit()
+
+        db.session.add_all([
+            Lease(
+                tenantid=tenant.tenantid,
+                propertyid=p.propertyid,
+                leasetermstart=date(2024, 1, 1 + i),
+                leasetermend=date(2025, 1, 1),
+                paymentstatusid=payment_status.paymentstatusid
+            ) for i, p in enumerate(properties)
+        ] + [
+            Maintenance(
+                description=f'Task {i}',
+                maintenancestatusid=maintenance_status.maintenancestatusid,
+                scheduleddate=date(2024, 3, 1),
+                propertyid=p.propertyid
+            ) for i, p in enumerate(properties)
+        ])
+        db.session.commit()
+
+    def read_ndjson(self, response):
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    @pytest.mark.parametrize('url', ['/properties/', '/tenants/', '/leases/', '/maintenance/'])
+    def test_stream_matches_json_list(self, client, url):
+        """Test ?stream=1 yields the same rows as the JSON list, one per line"""
+        expected = json.loads(client.get(url).data)['data']
+        assert self.read_ndjson(client.get(f'{url}?stream=1')) == expected
+
+    def test_stream_via_accept_header(self, client):
+        """Test the NDJSON Accept header selects streaming"""
+        rows = self.read_ndjson(client.get('/leases/', headers={'Accept': 'application/x-ndjson'}))
+        assert len(rows) == 5
+
+    def test_stream_honours_sort_fields_and_cursor(self, client):
+        """Test streaming applies sort, fields and a starting cursor"""
+        page = json.loads(client.get('/leases/?sort=leaseStart&order=desc&limit=2').data)
+        rows = self.read_ndjson(client.get(
+            f'/leases/?sort=leaseStart&order=desc&fields=id,leaseStart&stream=1&cursor={page["nextCursor"]}'
+        ))
+        assert [r['leaseStart'] for r in rows] == ['2024-01-03', '2024-01-02', '2024-01-01']
+        assert set(rows[0]) == {'id', 'leaseStart'}
+
+    def test_json_remains_default(self, client):
+        """Test a generic Accept header still gets the JSON envelope"""
+        response = client.get('/maintenance/', headers={'Accept': '*/*'})
+        assert response.mimetype == 'application/json'
+        assert len(json.loads(response.data)['data']) == 5
@@ -0,0 +1,77 @@
+import numpy as np
+from datetime import date
+from app.lookups import get_lookup
+from app.models import Lease, Tenant, Property, PropertyStatus, PropertyType, Maintenance, TableVersion
+from app.synthetic import LOOKUPS, ensure_lookups, generate_data, generate_portfolio, portfolio_sizes
+
+class TestSyntheticData:
+    """Test suite for the synthetic data generator"""
+
+    def sample(self, leases, seed):
+        sizes = portfolio_sizes(leases)
+        lookup_ids = {model: np.arange(1, len(descriptions) + 1) for model, descriptions in LOOKUPS.items()}
+        ids = {table: np.arange(1, count + 1) for table, count in sizes.items()}
+        return generate_portfolio(sizes, lookup_ids, ids, seed)
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed samples the same portfolio and another seed a different one"""
+        first, second, other = self.sample(400, 7), self.sample(400, 7), self.sample(400, 8)
+        for model, columns in first.items():
+            for name, values in columns.items():
+                assert np.array_equal(values, second[model][name])
+        assert not np.array_equal(first[Property]['price'], other[Property]['price'])
+
+    def test_leases_never_overlap(self):
+        """Test the leases of a property follow each other without overlapping"""
+        leases = self.sample(5000, 1)[Lease]
+        order = np.lexsort((leases['leasetermstart'], leases['propertyid']))
+        property_ids = leases['propertyid'][order]
+        starts, ends = leases['leasetermstart'][order], leases['leasetermend'][order]
+        assert (ends > starts).all()
+        same_property = property_ids[1:] == property_ids[:-1]
+        assert (starts[1:][same_property] > ends[:-1][same_property]).all()
+
+    def test_leases_follow_purchase_and_reach_today(self):
+        """Test leases start after their property was bought and some of them are active today"""
+        portfolio = self.sample(5000, 1)
+        leases, properties = portfolio[Lease], portfolio[Property]
+        assert (leases['leasetermstart'] >= properties['purchasedate'][leases['propertyid'] - 1]).all()
+        today = np.datetime64(date.today())
+        active = (leases['leasetermstart'] <= today) & (leases['leasetermend'] >= today)
+        assert active.sum() > len(properties['propertyid']) // 2
+        assert ((leases['leasetermend'] >= today) & (leases['leasetermend'] < today + 90)).any()
+
+    def test_generate_data_loads_consistent_rows(self, db):
+        """Test every table gets its rows, referencing generated properties and tenants, and appends on rerun"""
+        db.session.add(PropertyStatus(description='Vacant'))
+        db.session.commit()
+        generate_data(portfolio_sizes(80, maintenance=10), seed=3, batch_size=25)
+        assert (Property.query.count(), Tenant.query.count(), Lease.query.count(), Maintenance.query.count()) == \
+            (20, 40, 80, 10)
+        assert PropertyStatus.query.filter_by(description='Vacant').count() == 1
+        assert Lease.query.join(Property).join(Tenant).count() == 80
+
+        generate_data(portfolio_sizes(8), seed=3)
+        assert Lease.query.count() == 88
+
+    def test_seeded_lookups_bump_versions(self, db):
+        """Test inserting missing lookup rows bumps their table versions, so cached lookups reload"""
+        for description in LOOKUPS[PropertyType]:
+            db.session.add(PropertyType(description=description))
+        db.session.commit()
+        assert get_lookup(PropertyStatus) == {}
+
+        ensure_lookups()
+        versions = dict(db.session.query(TableVersion.tablename, TableVersion.version))
+        assert versions['property_statuses'] == 1 and 'property_types' not in versions
+        assert list(get_lookup(PropertyStatus).values()) == list(LOOKUPS[PropertyStatus])
+
+        ensure_lookups()
+        assert db.session.get(TableVersion, 'property_statuses').version == 1
+
+    def test_cli(self, app, db):
+        """Test the generate-data command"""
+        result = app.test_cli_runner().invoke(args=['generate-data', '--leases', '12', '--seed', '1'])
+        assert result.exit_code == 0, result.output
+        assert 'leases: 12 rows' in result.output
+        assert Lease.query.count() == 12
@@ -0,0 +1,68 @@
+import pytest
+import json
+from app.models import Tenant
+from app.search import trigrams, word_similarity
+
+class TestTenantSearch:
+    """Test suite for ranked tenant search"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, db):
+        """Set up test data before each test"""
+        db.session.add_all([
+            Tenant(name='John Doe', contactinfo='john@example.com'),
+            Tenant(name='Jane Smith', contactinfo='+33123456789'),
+            Tenant(name='Johnny Cash', contactinfo='cash@example.com'),
+            Tenant(name='Marie Curie', contactinfo='+33456789012')
+        ])
+        db.session.commit()
+
+    def search(self, client, q, **params):
+        query = '&'.join([f'q={q}'] + [f'{k}={v}' for k, v in params.items()])
+        return client.get(f'/tenants/search?{query}')
+
+    def test_trigrams_match_pg_trgm(self):
+        """Test trigram extraction pads words like pg_trgm"""
+        assert trigrams('Cat') == {'  c', ' ca', 'cat', 'at '}
+        assert word_similarity('cat', 'the cat sat') == 1.0
+
+    def test_exact_match_ranks_first(self, client):
+        """Test an exact word ranks above partial matches"""
+        data = json.loads(self.search(client, 'john').data)['data']
+        assert [t['name'] for t in data][:2] == ['John Doe', 'Johnny Cash']
+        assert data[0]['score'] >= data[1]['score']
+
+    def test_typo_tolerant(self, client):
+        """Test misspelt queries still find the tenant"""
+        data = json.loads(self.search(client, 'Smiht').data)['data']
+        assert data[0]['name'] == 'Jane Smith'
+        data = json.loads(self.search(client, 'Curei').data)['data']
+        assert data[0]['name'] == 'Marie Curie'
+
+    def test_searches_contact_info(self, client):
+        """Test contact info is searched too"""
+        data = json.loads(self.search(client, '456789012').data)['data']
+        assert data[0]['name'] == 'Marie Curie'
+
+    def test_limit(self, client):
+        """Test the result limit"""
+        data = json.loads(self.search(client, 'john', limit=1).data)['data']
+        assert len(data) == 1
+
+    def test_index_follows_updates_and_deletes(self, client):
+        """Test the trigram index stays in sync with writes"""
+        client.put('/tenants/1', data=json.dumps({'name': 'Claude Monet'}), content_type='application/json')
+        client.delete('/tenants/3')
+        data = json.loads(self.search(client, 'john').data)['data']
+        assert [t['id'] for t in data] == [1]
+        assert json.loads(self.search(client, 'monet').data)['data'][0]['id'] == 1
+
+    def test_no_match(self, client):
+        """Test an unrelated query returns no tenants"""
+        assert json.loads(self.search(client, 'xyzzy').data)['data'] == []
+
+    def test_short_query_rejected(self, client):
+        """Test queries under three characters are rejected"""
+        response = self.search(client, 'jo')
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
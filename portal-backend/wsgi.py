@@ -0,0 +1,9 @@
+from app import create_app
+from app.db import wait_for_db
+import os
+
+# Entry point for production servers, e.g. `gunicorn -c gunicorn.conf.py wsgi:app`
+if os.getenv('WAIT_FOR_DB', 'true').lower() == 'true':
+    wait_for_db()
+
+app = create_app()